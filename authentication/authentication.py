@@ -0,0 +1,48 @@
+import time
+
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from .utils import get_request_token
+
+CACHE_ALIAS = 'auth'
+# All that authenticating and the permissions use; the password hash and the rest stay in the database
+CACHED_USER_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def get_cache():
+    # Shared by the workers (AUTH_CACHE_BACKEND), so a changed user is dropped everywhere at once
+    return caches[CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reuses the token validated by the middlewares for this request
+    and caches the token's user until the token expires (dropped when the user changes).
+    Only CACHED_USER_FIELDS are cached; a cached user is rebuilt from them, unsaved.
+    """
+
+    def authenticate(self, request):
+        try:
+            validated_token = get_request_token(request._request)
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+        if validated_token is None:
+            return None
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        key = user_cache_key(validated_token.get(api_settings.USER_ID_CLAIM))
+        fields = get_cache().get(key)
+        if fields is not None:
+            return self.user_model(**fields)
+        user = super().get_user(validated_token)
+        fields = {field: getattr(user, field) for field in CACHED_USER_FIELDS}
+        get_cache().set(key, fields, timeout=max(validated_token['exp'] - int(time.time()), 1))
+        return user
@@ -0,0 +1,75 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import BlacklistedAccessToken
+
+
+class AccessTokenBlacklist:
+    """
+    In-process set of revoked access token ids (jti -> exp timestamp). The unexpired rows of
+    BlacklistedAccessToken are re-read at most every ``refresh_interval`` seconds and logouts
+    in this process are added directly, so checking a token normally doesn't hit the database.
+    Rows aren't read by id, since ids don't commit in order: a row committed late with a lower
+    id would be skipped for good. Entries are dropped once the token has expired, since an
+    expired token is rejected anyway, and expired rows are deleted on logout, so the re-read
+    stays small.
+    """
+
+    def __init__(self, refresh_interval):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._tokens = {}
+        self._refreshed_at = None
+
+    def is_revoked(self, jti):
+        self.refresh()
+        return jti in self._tokens
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._tokens[jti] = exp
+
+    def refresh(self, force=False):
+        if not force and not self._is_stale():
+            return
+        with self._lock:
+            if not force and not self._is_stale():
+                return
+            rows = (
+                BlacklistedAccessToken.objects
+                .filter(jti__isnull=False)
+                .filter(Q(expires_at__gt=datetime.now(tz=timezone.utc)) | Q(expires_at__isnull=True))
+                .values_list('jti', 'expires_at')
+            )
+            for jti, expires_at in rows:
+                self._tokens[jti] = expires_at.timestamp() if expires_at else float('inf')
+            self._prune()
+            self._refreshed_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._refreshed_at = None
+
+    def _is_stale(self):
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at >= self.refresh_interval
+
+    def _prune(self):
+        now = time.time()
+        for jti in [jti for jti, exp in self._tokens.items() if exp <= now]:
+            del self._tokens[jti]
+
+
+access_token_blacklist = AccessTokenBlacklist(settings.ACCESS_TOKEN_BLACKLIST_REFRESH_INTERVAL)
+
+
+def blacklist_access_token(token):
+    """Revoke a validated AccessToken and delete the rows of tokens that have expired since."""
+    expires_at = datetime.fromtimestamp(token['exp'], tz=timezone.utc)
+    BlacklistedAccessToken.objects.create(token=str(token), jti=token['jti'], expires_at=expires_at)
+    BlacklistedAccessToken.objects.filter(expires_at__lte=datetime.now(tz=timezone.utc)).delete()
+    access_token_blacklist.add(token['jti'], token['exp'])
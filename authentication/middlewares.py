@@ -1,22 +1,21 @@
-import jwt
-from django.conf import settings
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
-from .models import BlacklistedAccessToken
+from rest_framework_simplejwt.exceptions import TokenError
+from .blacklist import access_token_blacklist
+from .utils import get_request_token
 
 
 class BlacklistAccessTokenMiddleware(MiddlewareMixin):
     def process_request(self, request):
-        auth_header = request.headers.get('Authorization')
-        if auth_header and auth_header.startswith('Bearer '):
-            access_token = auth_header.split(' ')[1]
-            if BlacklistedAccessToken.objects.filter(token=access_token).exists():
-                return JsonResponse(
-                    data={'detail': 'Access token in blacklist, re-login'},
-                    status=401
-                )
-        else:
-            access_token = None
+        try:
+            access_token = get_request_token(request)
+        except TokenError:
+            return None
+        if access_token is not None and access_token_blacklist.is_revoked(access_token['jti']):
+            return JsonResponse(
+                data={'detail': 'Access token in blacklist, re-login'},
+                status=401
+            )
 
 
 class CheckAuthenticationMiddleware(MiddlewareMixin):
@@ -24,14 +23,15 @@ class CheckAuthenticationMiddleware(MiddlewareMixin):
         if request.path.startswith('/rosetta/') or request.path.startswith('/admin/'):
             return None
 
-        token = request.headers.get('Authorization')
-
         path = request.path
         if path.startswith('/api/v1/dashboard'):
-            if token is None or len(token.split()) != 2 or token.split()[0] != 'Bearer':
+            try:
+                access_token = get_request_token(request)
+            except TokenError:
+                return JsonResponse(data={'error': 'Token is invalid or expired'}, status=401)
+            if access_token is None:
                 return JsonResponse(data={'error': 'unauthorized'}, status=401)
-            payload = jwt.decode(token.split()[1], settings.SECRET_KEY, algorithms=['HS256'])
-            if payload.get('role') != 'admin':
+            if access_token.get('role') != 'admin':
                 return JsonResponse(data={'error': 'Permission denied'}, status=403)
 
 from django.utils import translation
@@ -45,5 +45,7 @@ class ForceDefaultLanguageMiddleware:
         translation.activate(settings.LANGUAGE_CODE)
         request.LANGUAGE_CODE = settings.LANGUAGE_CODE
         response = self.get_response(request)
-        response.set_cookie(settings.LANGUAGE_COOKIE_NAME, settings.LANGUAGE_CODE)
+        # A cookie would keep shared caches from storing public responses such as media files
+        if 'public' not in response.get('Cache-Control', ''):
+            response.set_cookie(settings.LANGUAGE_COOKIE_NAME, settings.LANGUAGE_CODE)
         return response
\ No newline at end of file
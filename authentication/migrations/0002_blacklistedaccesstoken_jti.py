@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:13
+
+from datetime import datetime, timezone
+
+import jwt
+from django.db import migrations, models
+
+
+def backfill_jti(apps, schema_editor):
+    BlacklistedAccessToken = apps.get_model('authentication', 'BlacklistedAccessToken')
+    for obj in BlacklistedAccessToken.objects.filter(jti__isnull=True).iterator():
+        try:
+            payload = jwt.decode(obj.token, options={'verify_signature': False})
+        except jwt.InvalidTokenError:
+            continue
+        obj.jti = payload.get('jti')
+        if payload.get('exp'):
+            obj.expires_at = datetime.fromtimestamp(payload['exp'], tz=timezone.utc)
+        obj.save(update_fields=['jti', 'expires_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blacklistedaccesstoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='blacklistedaccesstoken',
+            name='jti',
+            field=models.CharField(max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_jti, migrations.RunPython.noop),
+    ]
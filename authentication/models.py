@@ -8,6 +8,8 @@ class User(AbstractUser):
 
 class BlacklistedAccessToken(models.Model):
     token = models.CharField(max_length=500, unique=True)
+    jti = models.CharField(max_length=255, unique=True, null=True)
+    expires_at = models.DateTimeField(null=True, db_index=True)
     blacklisted_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
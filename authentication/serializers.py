@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.tokens import AccessToken
 from .utils import is_valid_tokens
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
 from .models import BlacklistedAccessToken
@@ -14,7 +15,7 @@ class LogoutSerializer(serializers.Serializer):
         if not is_valid_tokens(refresh_token, access_token):
             raise serializers.ValidationError('Access token or Refresh token is invalid or expired')
         refresh_blacklisted = BlacklistedToken.objects.filter(token__token=refresh_token).exists()
-        access_blacklisted = BlacklistedAccessToken.objects.filter(token=access_token).exists()
+        access_blacklisted = BlacklistedAccessToken.objects.filter(jti=AccessToken(access_token)['jti']).exists()
 
         if refresh_blacklisted or access_blacklisted:
             raise serializers.ValidationError('Tokens are already in blacklist')
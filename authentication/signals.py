@@ -0,0 +1,17 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .authentication import get_cache, user_cache_key
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    key = user_cache_key(instance.pk)
+    get_cache().delete(key)
+    # Again once committed: until then a concurrent request may cache the old row again
+    transaction.on_commit(partial(get_cache().delete, key))
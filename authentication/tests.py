@@ -1,3 +1,108 @@
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
 
-# Create your tests here.
+from .authentication import CACHE_ALIAS, get_cache, user_cache_key
+from .blacklist import access_token_blacklist
+from .models import User, BlacklistedAccessToken
+
+
+class BlacklistAccessTokenTest(TestCase):
+    def setUp(self):
+        access_token_blacklist.clear()
+        get_cache().clear()
+        self.user = User.objects.create_user(username='admin', password='Admin12345')
+        self.refresh_token = RefreshToken.for_user(self.user)
+        self.access_token = self.refresh_token.access_token
+        self.access_token['role'] = 'admin'
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {self.access_token}'}
+
+    def logout(self):
+        return self.client.post(reverse('logout'), data={
+            'refresh_token': str(self.refresh_token),
+            'access_token': str(self.access_token),
+        })
+
+    def test_logout_revokes_access_token(self):
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **self.headers).status_code, 200)
+        self.assertEqual(self.logout().status_code, 205)
+        self.assertEqual(BlacklistedAccessToken.objects.get().jti, self.access_token['jti'])
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **self.headers).status_code, 401)
+        self.assertEqual(self.logout().status_code, 400)
+
+    def test_blacklist_check_does_not_query_database_between_refreshes(self):
+        access_token_blacklist.refresh(force=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_main_page'), **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'blacklistedaccesstoken' in q['sql']])
+
+    def test_refresh_loads_tokens_revoked_by_other_processes(self):
+        BlacklistedAccessToken.objects.create(
+            token=str(self.access_token), jti=self.access_token['jti'],
+            expires_at=self.access_token.current_time + self.access_token.lifetime,
+        )
+        access_token_blacklist.refresh(force=True)
+        self.assertTrue(access_token_blacklist.is_revoked(self.access_token['jti']))
+
+    def test_refresh_loads_tokens_committed_out_of_id_order(self):
+        expires_at = self.access_token.current_time + self.access_token.lifetime
+        BlacklistedAccessToken.objects.create(id=10, token='later', jti='later', expires_at=expires_at)
+        access_token_blacklist.refresh(force=True)
+        BlacklistedAccessToken.objects.create(id=5, token='earlier', jti='earlier', expires_at=expires_at)
+        access_token_blacklist.refresh(force=True)
+        self.assertTrue(access_token_blacklist.is_revoked('later'))
+        self.assertTrue(access_token_blacklist.is_revoked('earlier'))
+
+    def test_expired_tokens_are_pruned(self):
+        access_token_blacklist.add('expired', 0)
+        access_token_blacklist.refresh(force=True)
+        self.assertFalse(access_token_blacklist.is_revoked('expired'))
+
+
+class RequestAuthenticationTest(TestCase):
+    def setUp(self):
+        access_token_blacklist.clear()
+        get_cache().clear()
+        self.user = User.objects.create_user(username='admin', password='Admin12345')
+        access_token = RefreshToken.for_user(self.user).access_token
+        access_token['role'] = 'admin'
+        self.headers = {'HTTP_AUTHORIZATION': f'Bearer {access_token}'}
+
+    def test_dashboard_requests_do_not_query_auth_tables_after_warm_up(self):
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **self.headers).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_all_prices'), **self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'authentication_' in q['sql']])
+
+    def test_cached_user_is_dropped_when_user_changes(self):
+        self.client.get(reverse('get_all_prices'), **self.headers)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **self.headers).status_code, 401)
+
+    def test_cached_user_holds_no_password_hash(self):
+        self.client.get(reverse('get_all_prices'), **self.headers)
+        cached = get_cache().get(user_cache_key(self.user.pk))
+        self.assertEqual(cached, {'id': self.user.pk, 'username': 'admin', 'is_active': True,
+                                  'is_staff': False, 'is_superuser': False})
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **self.headers).status_code, 200)
+
+    def test_changed_user_is_dropped_from_the_cache_of_other_workers(self):
+        self.client.get(reverse('get_all_prices'), **self.headers)
+        # A cache connection of its own, like another worker process has
+        other_worker = caches.create_connection(CACHE_ALIAS)
+        self.assertIsNotNone(other_worker.get(user_cache_key(self.user.pk)))
+        self.user.set_password('Changed12345')
+        self.user.save()
+        self.assertIsNone(other_worker.get(user_cache_key(self.user.pk)))
+
+    def test_invalid_token_is_rejected_with_401(self):
+        headers = {'HTTP_AUTHORIZATION': 'Bearer not-a-token'}
+        self.assertEqual(self.client.get(reverse('get_all_prices'), **headers).status_code, 401)
+        self.assertEqual(self.client.get(reverse('get_main_page'), **headers).status_code, 401)
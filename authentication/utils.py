@@ -8,4 +8,24 @@ def is_valid_tokens(refresh_token, access_token):
         AccessToken(access_token)
         return True
     except TokenError:
-        return False
\ No newline at end of file
+        return False
+
+
+def get_request_token(request):
+    """
+    Return the validated AccessToken from the request's Bearer header, or None if there is none.
+    The token is validated once and memoized on the request, so the middlewares and DRF
+    authentication share the same result. Raises TokenError for an invalid or expired token.
+    """
+    if not hasattr(request, '_access_token'):
+        request._access_token = None, None
+        parts = request.headers.get('Authorization', '').split()
+        if len(parts) == 2 and parts[0] == 'Bearer':
+            try:
+                request._access_token = AccessToken(parts[1]), None
+            except TokenError as e:
+                request._access_token = None, e
+    token, error = request._access_token
+    if error is not None:
+        raise error
+    return token
@@ -10,8 +10,8 @@ def validate_uz_phone_number(phone_number: str):
         raise serializers.ValidationError(_("Telefon raqamining uzuznligi 13 bo`lishi kerak!"))
     if not phone_number.startswith('+998'):
         raise serializers.ValidationError(_("Telefon raqami +998 bilan boshlanishi kerak!"))
-    if not phone_number[3:5] in number_codes:
-        return serializers.ValidationError(_("Telefon nomer kodi uzbek kodi emas"))
+    if not phone_number[4:6] in number_codes:
+        raise serializers.ValidationError(_("Telefon nomer kodi uzbek kodi emas"))
     if not phone_number[1:].isdigit():
         raise serializers.ValidationError(_("Telefon raqami faqat butun sonlar(0,1,2,3,4,5,6,7,8,9) iborat bo`lishi kerak!"))
     return phone_number
@@ -23,8 +23,8 @@ def validate_uz_phone_number_for_model(phone_number: str):
         raise ValidationError(_("Telefon raqamining uzuznligi 13 bo`lishi kerak!"))
     if not phone_number.startswith('+998'):
         raise ValidationError(_("Telefon raqami +998 bilan boshlanishi kerak!"))
-    if not phone_number[3:5] in number_codes:
-        return ValidationError(_("Telefon nomer kodi uzbek kodi emas"))
+    if not phone_number[4:6] in number_codes:
+        raise ValidationError(_("Telefon nomer kodi uzbek kodi emas"))
     if not phone_number[1:].isdigit():
         raise ValidationError(_("Telefon raqami faqat butun sonlar(0,1,2,3,4,5,6,7,8,9) iborat bo`lishi kerak!"))
     return phone_number
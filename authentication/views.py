@@ -7,7 +7,8 @@ from rest_framework_simplejwt.tokens import (
     AccessToken,
     RefreshToken
 )
-from .models import User, BlacklistedAccessToken
+from .blacklist import blacklist_access_token
+from .models import User
 from .serializers import LogoutSerializer
 
 
@@ -70,7 +71,6 @@ class LoginViewSet(ViewSet):
         token1 = RefreshToken(refresh_token)
         token2 = AccessToken(access_token)
         token1.blacklist()
-        obj = BlacklistedAccessToken.objects.create(token=token2)
-        obj.save()
+        blacklist_access_token(token2)
         return Response(data={'message': 'Logged out successfully', 'ok': True},
                         status=status.HTTP_205_RESET_CONTENT)
\ No newline at end of file
@@ -9,6 +9,7 @@ https://docs.djangoproject.com/en/5.2/topics/settings/
 For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
     'authentication',
     'dashboard',
     'web',
+    'jobs',
+    'idempotency',
 
     # installed
     'corsheaders',
@@ -103,6 +106,52 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Backend of the public web response cache: 'locmem' for a single process, 'file'
+# when several workers have to share entries and invalidations.
+WEB_CACHE_BACKEND = os.environ.get('WEB_CACHE_BACKEND', 'locmem')
+
+WEB_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'web-response-cache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'web',
+    },
+}
+
+# Users of access tokens, cached by CachedJWTAuthentication. Every worker must see a user dropped when it
+# changes (deactivated, new password), so the default is shared between processes: 'file'. 'locmem' only
+# suits a single process. Entries hold the id, username and flags of a user, never the password hash.
+AUTH_CACHE_BACKEND = os.environ.get('AUTH_CACHE_BACKEND', 'file')
+
+AUTH_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-user-cache',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'auth',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'auth': AUTH_CACHE_BACKENDS[AUTH_CACHE_BACKEND],
+    'web': {
+        **WEB_CACHE_BACKENDS[WEB_CACHE_BACKEND],
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -149,6 +198,63 @@ STATICFILES_DIRS = [BASE_DIR / "static"]
 MEDIA_URL = 'media/'
 MEDIA_ROOT = 'media'
 
+# Uploads are named by the SHA-256 of their bytes, computed by the upload handlers as the request streams in
+STORAGES = {
+    'default': {'BACKEND': 'core.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+FILE_UPLOAD_HANDLERS = [
+    'core.storage.HashingMemoryFileUploadHandler',
+    'core.storage.HashingTemporaryFileUploadHandler',
+]
+
+# Uploaded files are never overwritten in place, so browsers and proxies may keep them for long;
+# content-addressed ones are also marked immutable
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_CACHE_MAX_AGE = 60 * 60 * 24
+# 'nginx' (X-Accel-Redirect to MEDIA_ACCEL_PREFIX + 'media/' or 'static/' + path) or 'apache'
+# (X-Sendfile) let the front proxy send media and static files; unset, Django sends them
+MEDIA_SENDFILE_BACKEND = os.environ.get('MEDIA_SENDFILE_BACKEND') or None
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/internal/')
+
+# Unreferenced uploads are removed by collect_media_garbage once this many seconds old, which covers uploads
+# whose rows aren't committed yet; with MEDIA_GC_ON_COMMIT, also right after a row drops them
+MEDIA_GC_GRACE_PERIOD = 60 * 60 * 24
+MEDIA_GC_ON_COMMIT = os.environ.get('MEDIA_GC_ON_COMMIT', '').lower() in ('1', 'true', 'yes')
+
+# Widths of the WebP/JPEG variants generated for uploaded images by the 'images' job queue
+IMAGE_VARIANT_WIDTHS = (320, 640, 1024, 1600)
+
+# Processes rendering batches of QR codes (0 renders them in the request thread), and the smallest
+# batch worth sending to them
+QR_CODE_WORKERS = min(os.cpu_count() or 1, 4)
+QR_CODE_POOL_THRESHOLD = 50
+
+# Background jobs, run by `manage.py run_jobs`: queue -> jobs running at once across all workers
+JOBS_QUEUES = {
+    'default': 2,
+    'images': 2,
+    'qr': 1,
+    'stats': 1,
+}
+JOBS_CONCURRENCY = 4
+JOBS_POLL_INTERVAL = 1
+JOBS_MAX_ATTEMPTS = 5
+# Seconds before the first retry, doubled for each further attempt up to the maximum
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 60 * 60
+# Running jobs whose worker hasn't refreshed their lock for this long are requeued
+JOBS_LOCK_TIMEOUT = 5 * 60
+# Finished jobs are deleted by the workers this many seconds after they finished; failed ones are kept
+# longer, so they can still be looked at and retried
+JOBS_RETENTION = 60 * 60 * 24 * 7
+JOBS_FAILED_RETENTION = 60 * 60 * 24 * 30
+
+# Responses of create requests sent with an Idempotency-Key header are replayed to retries for this long;
+# expired keys are deleted at most once per interval by each process
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+IDEMPOTENCY_PURGE_INTERVAL = 60 * 10
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -157,10 +263,13 @@ AUTH_USER_MODEL = 'authentication.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'authentication.authentication.CachedJWTAuthentication',
+    ),
 }
 
+# Default page size of the keyset-paginated lists (core.pagination.KeysetPagination)
+KEYSET_PAGE_SIZE = 20
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=14),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=14),
@@ -168,6 +277,9 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# Seconds between incremental reloads of the in-process access token blacklist
+ACCESS_TOKEN_BLACKLIST_REFRESH_INTERVAL = 5
+
 SWAGGER_SETTINGS = {
     'SCHEMES': ['https'],
     'SECURITY_DEFINITIONS': {
@@ -180,3 +292,6 @@ SWAGGER_SETTINGS = {
 }
 
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+
+# Rejected rows of event imports, downloadable from the dashboard. Kept out of MEDIA_ROOT, which is public.
+IMPORT_ERRORS_ROOT = BASE_DIR / 'import_errors'
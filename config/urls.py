@@ -15,15 +15,15 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.conf.urls.i18n import i18n_patterns
 from django.urls import path, include, re_path
-from django.views.static import serve
 from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from core import media
+
 admin.site.site_header = 'WEDDING WEB SYSTEM'
 admin.site.site_title = 'WEDDING WEB SYSTEM'
 admin.site.index_title = 'Welcome to dashboard'
@@ -41,18 +41,22 @@ schema_view = get_schema_view(
     permission_classes=[permissions.AllowAny],
 )
 
-urlpatterns = i18n_patterns(
+media_patterns = [
+    re_path(r'^static/(?P<path>.*)$', media.serve, {
+        'document_root': settings.STATIC_ROOT, 'max_age': settings.STATIC_CACHE_MAX_AGE, 'accel_location': 'static',
+    }),
+    re_path(r'^media/(?P<path>.*)$', media.serve),
+]
+
+# Files are served at the URLs storage generates, without the language redirect, and under
+# the language prefix for links that already have it
+urlpatterns = media_patterns + i18n_patterns(
     path('admin/', admin.site.urls),
     path('api/v1/auth/', include('authentication.urls')),
     path('api/v1/web/', include('web.urls')),
     path('api/v1/dashboard/', include('dashboard.urls')),
-    re_path(r'static/(?P<path>.*)$', serve, {'document_root': settings.STATIC_ROOT}),
-    re_path(r'media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    *media_patterns,
     re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_view.without_ui(cache_timeout=0), name="schema-json"),
     re_path(r"^swagger/$", schema_view.with_ui("swagger", cache_timeout=0), name="schema-swagger-ui", ),
     re_path(r"^redoc/$", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc")
-)
-
-if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+)
\ No newline at end of file
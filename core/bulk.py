@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils.timezone import now
+from rest_framework.relations import PrimaryKeyRelatedField
+
+MAX_ITEMS = 1000
+BATCH_SIZE = 500
+
+# bulk_create/bulk_update send no post_save, so the writes below send one signal per batch instead.
+# bulk_saved: sender=model, instances, created, previous (field values before an update, else None)
+bulk_saved = Signal()
+# bulk_deleted: sender=model, instances
+bulk_deleted = Signal()
+
+_bulk_model = ContextVar('bulk_model', default=None)
+
+
+def in_bulk_operation(model):
+    """True while ``model`` is bulk deleted, so per-instance receivers can leave the work to bulk_deleted."""
+    return _bulk_model.get() is model
+
+
+@contextmanager
+def bulk_operation(model):
+    token = _bulk_model.set(model)
+    try:
+        yield
+    finally:
+        _bulk_model.reset(token)
+
+
+def field_state(instance):
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def check_items(items):
+    """Error message for a payload that isn't a non-empty list of at most MAX_ITEMS items, else None."""
+    if not isinstance(items, list) or not items:
+        return 'Expected a non-empty list'
+    if len(items) > MAX_ITEMS:
+        return f'At most {MAX_ITEMS} items per request'
+    return None
+
+
+def preload_related(serializer, items):
+    """Fetch the objects referenced by primary-key fields of ``items`` with one query per field."""
+    preloaded = {}
+    for name, field in serializer.fields.items():
+        if not isinstance(field, PrimaryKeyRelatedField) or field.read_only:
+            continue
+        queryset = field.get_queryset()
+        pks = set()
+        for item in items:
+            if isinstance(item, dict) and item.get(name) is not None:
+                try:
+                    pks.add(queryset.model._meta.pk.to_python(item[name]))
+                except DjangoValidationError:
+                    pass
+        preloaded[name] = queryset.in_bulk(pks)
+    return preloaded
+
+
+def create_instances(model, instances):
+    """bulk_create ``instances`` and send bulk_saved."""
+    model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+    bulk_saved.send(sender=model, instances=instances, created=True, previous=None)
+
+
+def delete_instances(model, instances):
+    """Delete ``instances`` with one query and send bulk_deleted."""
+    with bulk_operation(model):
+        model.objects.filter(pk__in=[instance.pk for instance in instances]).delete()
+    bulk_deleted.send(sender=model, instances=instances)
+
+
+def _item_errors(errors):
+    return [{'index': index, 'errors': item_errors} for index, item_errors in enumerate(errors) if item_errors]
+
+
+def bulk_create(serializer_class, items, context=None):
+    """
+    Validate ``items`` and insert them in one transaction. Returns (instances, errors); nothing
+    is written if any item is invalid.
+    """
+    context = dict(context or {})
+    serializer = serializer_class(data=items, many=True, context=context)
+    context['preloaded'] = preload_related(serializer.child, items)
+    if not serializer.is_valid():
+        return [], _item_errors(serializer.errors)
+    model = serializer_class.Meta.model
+    instances = [model(**validated_data) for validated_data in serializer.validated_data]
+    with transaction.atomic():
+        create_instances(model, instances)
+    return instances, []
+
+
+def bulk_update(serializer_class, items, context=None):
+    """
+    Partially update the objects identified by each item's 'id' in one transaction.
+    Returns (instances, errors); nothing is written if any item is invalid.
+    """
+    model = serializer_class.Meta.model
+    context = dict(context or {})
+    context['preloaded'] = preload_related(serializer_class(context=context), items)
+    ids = [item.get('id') for item in items if isinstance(item, dict)]
+    found = model.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+    instances, previous, fields, errors = [], [], set(), []
+    seen = set()
+    for item in items:
+        instance = found.get(item.get('id')) if isinstance(item, dict) else None
+        if instance is None or instance.pk in seen:
+            errors.append({'id': ['Not found' if instance is None else 'Duplicate id']})
+            continue
+        seen.add(instance.pk)
+        data = {key: value for key, value in item.items() if key != 'id'}
+        serializer = serializer_class(instance, data=data, partial=True, context=context)
+        if not serializer.is_valid():
+            errors.append(serializer.errors)
+            continue
+        errors.append({})
+        previous.append(field_state(instance))
+        for name, value in serializer.validated_data.items():
+            setattr(instance, name, value)
+        fields.update(serializer.validated_data)
+        instances.append(instance)
+    if any(errors):
+        return [], _item_errors(errors)
+    if fields and any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        timestamp = now()
+        for instance in instances:
+            instance.updated_at = timestamp
+        fields.add('updated_at')
+    with transaction.atomic():
+        if fields:
+            model.objects.bulk_update(instances, sorted(fields), batch_size=BATCH_SIZE)
+        bulk_saved.send(sender=model, instances=instances, created=False, previous=previous)
+    return instances, []
+
+
+def bulk_delete(model, ids):
+    """Delete the objects with ``ids`` in one transaction. Returns (instances, errors)."""
+    instances = model.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+    errors = [{} if pk in instances else {'id': ['Not found']} for pk in ids]
+    if any(errors):
+        return [], _item_errors(errors)
+    instances = list(instances.values())
+    with transaction.atomic():
+        delete_instances(model, instances)
+    return instances, []
@@ -0,0 +1,111 @@
+from datetime import date, datetime, time, timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.utils.timezone import make_aware
+from drf_yasg import openapi
+from rest_framework.exceptions import ValidationError
+
+
+def parse_bool(value):
+    value = value.lower()
+    if value in ('true', '1'):
+        return True
+    if value in ('false', '0'):
+        return False
+    raise ValueError(value)
+
+
+def parse_int(value):
+    # Bounded by the widest integer column, as a larger number can't be a query parameter
+    number = int(value)
+    minimum, maximum = connection.ops.integer_field_range('BigIntegerField')
+    if not minimum <= number <= maximum:
+        raise ValueError(value)
+    return number
+
+
+def parse_date(value):
+    return date.fromisoformat(value)
+
+
+def start_of_day(value):
+    return make_aware(datetime.combine(parse_date(value), time.min))
+
+
+def start_of_next_day(value):
+    return make_aware(datetime.combine(parse_date(value) + timedelta(days=1), time.min))
+
+
+class QueryFilter:
+    def __init__(self, lookup, parse=str, description='', type=openapi.TYPE_STRING):
+        self.lookup = lookup
+        self.parse = parse
+        self.description = description
+        self.type = type
+
+
+class ListFilter:
+    """
+    Query-param filtering, free-text search and whitelisted ordering for list endpoints.
+    ``filters`` maps a query param to a QueryFilter. ``search`` is split into words and each
+    word must match one of ``search_fields``. ``ordering`` accepts one of ``ordering_fields``,
+    optionally prefixed with '-', and 'id' in the same direction is added as a tie-breaker
+    so the result can be paginated with KeysetPagination.
+    """
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def __init__(self, filters=None, search_fields=(), ordering_fields=(), default_ordering='-id'):
+        self.filters = filters or {}
+        self.search_fields = search_fields
+        self.ordering_fields = ordering_fields
+        self.default_ordering = default_ordering
+
+    @property
+    def parameters(self):
+        parameters = [
+            openapi.Parameter(name, openapi.IN_QUERY, description=query_filter.description,
+                              type=query_filter.type, required=False)
+            for name, query_filter in self.filters.items()
+        ]
+        if self.search_fields:
+            parameters.append(openapi.Parameter(
+                self.search_param, openapi.IN_QUERY, description=f"Search in: {', '.join(self.search_fields)}",
+                type=openapi.TYPE_STRING, required=False,
+            ))
+        if self.ordering_fields:
+            parameters.append(openapi.Parameter(
+                self.ordering_param, openapi.IN_QUERY,
+                description=f"One of: {', '.join(self.ordering_fields)} (prefix with '-' for descending), "
+                            f"default {self.default_ordering}",
+                type=openapi.TYPE_STRING, required=False,
+            ))
+        return parameters
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_param) or self.default_ordering
+        field = ordering[1:] if ordering.startswith('-') else ordering
+        if field not in (*self.ordering_fields, 'id'):
+            raise ValidationError({'error': f"ordering must be one of: {', '.join(self.ordering_fields)}"})
+        if field == 'id':
+            return (ordering,)
+        return ordering, '-id' if ordering.startswith('-') else 'id'
+
+    def filter_queryset(self, queryset, request):
+        conditions = {}
+        for name, query_filter in self.filters.items():
+            value = request.query_params.get(name)
+            if value in (None, ''):
+                continue
+            try:
+                conditions[query_filter.lookup] = query_filter.parse(value)
+            except ValueError:
+                raise ValidationError({'error': f'Invalid value for {name}: {value}'})
+        queryset = queryset.filter(**conditions)
+        for word in request.query_params.get(self.search_param, '').split():
+            match = Q()
+            for field in self.search_fields:
+                match |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(match)
+        return queryset
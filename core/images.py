@@ -0,0 +1,126 @@
+import logging
+import math
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.timezone import now
+from PIL import ExifTags, Image, ImageOps
+
+from . import bulk
+from .storage import upload_directory
+
+logger = logging.getLogger(__name__)
+
+# format -> (PIL format, extension, MIME type, save options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def variants_field(field_name):
+    """Name of the JSONField holding the variants of the image field ``field_name``."""
+    return f'{field_name}_variants'
+
+
+def render(file, widths):
+    """
+    (width, height, [(format, width, height, bytes)]) for the image in ``file``, one variant per
+    format and per width narrower than the original; the original width is used when it is
+    narrower than all of them. Each width is resized from the previous, larger one.
+    """
+    with Image.open(file) as original:
+        width, height = original.size
+        if original.getexif().get(ExifTags.Base.Orientation) in (5, 6, 7, 8):
+            width, height = height, width
+        targets = sorted({target for target in widths if target < width} or {width}, reverse=True)
+        # Lets JPEG decode at a reduced scale when the largest variant is much smaller than the original
+        scale = targets[0] / width
+        original.draft('RGB', (math.ceil(original.width * scale), math.ceil(original.height * scale)))
+        image = ImageOps.exif_transpose(original)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+    variants = []
+    for target in targets:
+        target_height = max(1, round(height * target / width))
+        if image.size != (target, target_height):
+            image = image.resize((target, target_height), Image.LANCZOS)
+        for name, (pil_format, _, _, options) in FORMATS.items():
+            frame = image.convert('RGB') if pil_format == 'JPEG' and image.mode == 'RGBA' else image
+            output = BytesIO()
+            frame.save(output, pil_format, **options)
+            variants.append((name, target, target_height, output.getvalue()))
+    return width, height, variants
+
+
+def generate(field_file, widths=None):
+    """Render and store the variants of ``field_file``; returns the record kept in the variants field."""
+    stem, _ = os.path.splitext(os.path.basename(field_file.name))
+    directory = os.path.join(upload_directory(field_file.name), 'variants')
+    with field_file.storage.open(field_file.name, 'rb') as file:
+        width, height, rendered = render(file, widths or settings.IMAGE_VARIANT_WIDTHS)
+    variants = []
+    for name, variant_width, variant_height, content in rendered:
+        _, extension, _, _ = FORMATS[name]
+        stored = default_storage.save(os.path.join(directory, f'{stem}_{variant_width}w.{extension}'),
+                                      ContentFile(content))
+        variants.append({'format': name, 'width': variant_width, 'height': variant_height, 'name': stored})
+    return {'source': field_file.name, 'width': width, 'height': height, 'variants': variants}
+
+
+def is_current(instance, field_name):
+    """True if the variants recorded for the image field are those of its current file."""
+    name = getattr(instance, field_name).name
+    record = getattr(instance, variants_field(field_name))
+    return not name or bool(record) and record.get('source') == name
+
+
+def update(model, pk, field_name, force=False):
+    """
+    Generate the variants of one row's image and record them, unless they are current. The
+    record is only written if the row still holds the same file, so a newer upload wins.
+    """
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or not force and is_current(instance, field_name):
+        return False
+    field_file = getattr(instance, field_name)
+    try:
+        record = generate(field_file)
+    except (OSError, Image.DecompressionBombError) as error:
+        logger.warning('Could not render variants of %s: %s', field_file.name, error)
+        # Recorded without variants so the backfill doesn't retry a broken file forever
+        record = {'source': field_file.name, 'variants': []}
+    previous = bulk.field_state(instance)
+    # updated_at too: the variants change the responses, so their validators must change
+    timestamp = now()
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{variants_field(field_name): record}, updated_at=timestamp,
+    )
+    if updated:
+        setattr(instance, variants_field(field_name), record)
+        instance.updated_at = timestamp
+        # Written with update(), so tell the bulk receivers (e.g. the web cache) about it
+        bulk.bulk_saved.send(sender=model, instances=[instance], created=False, previous=[previous])
+    return bool(updated)
+
+
+def srcset(record, url):
+    """
+    {'width', 'height', 'sources': [{'type', 'srcset'}]} from a variants record, one source per
+    format in order of preference, as used by <picture>; ``url`` maps a stored name to a URL.
+    """
+    if not record or not record.get('variants'):
+        return None
+    sources = []
+    for name, (_, _, mime_type, _) in FORMATS.items():
+        candidates = [variant for variant in record['variants'] if variant['format'] == name]
+        if candidates:
+            sources.append({
+                'type': mime_type,
+                'srcset': ', '.join(f"{url(variant['name'])} {variant['width']}w"
+                                    for variant in sorted(candidates, key=lambda variant: variant['width'])),
+            })
+    return {'width': record['width'], 'height': record['height'], 'sources': sources}
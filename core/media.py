@@ -0,0 +1,156 @@
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .storage import is_content_addressed
+
+# Precompressed siblings (file + suffix) served when the client accepts the encoding, best first
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+RANGE = re.compile(r'bytes=(\d*)-(\d*)')
+
+
+class FileRange:
+    """
+    ``length`` bytes of ``file`` from its current position. Keeps fileno() so a WSGI server's
+    file_wrapper can still sendfile() them: it starts at the descriptor's offset and sends
+    Content-Length bytes.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _accepts(request, encoding):
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = part.strip().partition(';')
+        if name.strip() == encoding:
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+def _byte_range(header, size):
+    """(start, end) of a single-range Range header, None to send the whole file, or False if unsatisfiable."""
+    match = RANGE.fullmatch(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+def _cache_headers(response, etag, mtime, max_age, immutable=False):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Cache-Control'] = f'public, max-age={max_age}' + (', immutable' if immutable else '')
+    response['Accept-Ranges'] = 'bytes'
+
+
+@require_safe
+def serve(request, path, document_root=None, max_age=None, accel_location='media'):
+    """
+    Serve a file below ``document_root`` (default MEDIA_ROOT) with long-lived caching headers. With
+    MEDIA_SENDFILE_BACKEND set, the front proxy sends the file (nginx: X-Accel-Redirect to
+    MEDIA_ACCEL_PREFIX + ``accel_location``; apache/lighttpd: X-Sendfile) and the worker is
+    freed at once. Otherwise the file is sent as a FileResponse, which WSGI servers pass to
+    sendfile(), honouring a single Range, If-Range and conditional requests, and preferring a
+    precompressed .br/.gz sibling when the client accepts it. Content-addressed media is
+    marked immutable.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = Path(safe_join(document_root or settings.MEDIA_ROOT, path))
+        stat = fullpath.stat()
+    except (OSError, ValueError):
+        raise Http404('File not found')
+    if not fullpath.is_file():
+        raise Http404('File not found')
+    max_age = settings.MEDIA_CACHE_MAX_AGE if max_age is None else max_age
+    content_type, encoding = mimetypes.guess_type(fullpath.name)
+    content_type = content_type or 'application/octet-stream'
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    immutable = accel_location == 'media' and is_content_addressed(path)
+
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend:
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is not None:
+            return response
+        response = HttpResponse(content_type=content_type)
+        if backend == 'nginx':
+            response['X-Accel-Redirect'] = f'{settings.MEDIA_ACCEL_PREFIX}{accel_location}/{quote(path)}'
+        else:
+            response['X-Sendfile'] = str(fullpath)
+        _cache_headers(response, etag, stat.st_mtime, max_age, immutable)
+        return response
+
+    # A precompressed sibling is only used while it is at least as new as the file itself
+    siblings = []
+    if encoding is None:
+        for name, suffix in PRECOMPRESSED:
+            try:
+                sibling_stat = os.stat(f'{fullpath}{suffix}')
+            except OSError:
+                continue
+            if sibling_stat.st_mtime >= stat.st_mtime:
+                siblings.append((name, suffix, sibling_stat))
+    chosen = next((sibling for sibling in siblings if _accepts(request, sibling[0])), None)
+    if chosen is not None:
+        name, suffix, stat = chosen
+        fullpath = Path(f'{fullpath}{suffix}')
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{name}"'
+
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        size = stat.st_size
+        byte_range = None
+        if 'Range' in request.headers and request.headers.get('If-Range', etag) == etag:
+            byte_range = _byte_range(request.headers['Range'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        else:
+            file = open(fullpath, 'rb')
+            if byte_range is None:
+                response = FileResponse(file, content_type=content_type)
+            else:
+                start, end = byte_range
+                file.seek(start)
+                response = FileResponse(FileRange(file, end - start + 1), status=206, content_type=content_type)
+                response['Content-Length'] = end - start + 1
+                response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            if chosen is not None:
+                response['Content-Encoding'] = chosen[0]
+    _cache_headers(response, etag, stat.st_mtime, max_age, immutable)
+    if siblings:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
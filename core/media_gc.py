@@ -0,0 +1,67 @@
+import os
+import time
+
+from .media import PRECOMPRESSED
+
+
+def walk(root, directory=''):
+    """
+    (name, os.stat_result) of every regular file below ``root``/``directory``, names relative to
+    ``root`` with '/' separators. Streams with os.scandir, one open directory per level, so
+    memory use doesn't grow with the number of files. Symlinks are not followed.
+    """
+    try:
+        entries = os.scandir(os.path.join(root, directory))
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            name = f'{directory}/{entry.name}' if directory else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk(root, name)
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry.stat(follow_symlinks=False)
+
+
+def is_referenced(name, referenced):
+    if name in referenced:
+        return True
+    # A precompressed sibling lives as long as its file
+    return any(name.endswith(suffix) and name[:-len(suffix)] in referenced for _, suffix in PRECOMPRESSED)
+
+
+def is_stale(stat, grace_period, now=None):
+    """True if the file was last written (or reused by a deduplicated upload) over ``grace_period`` seconds ago."""
+    return stat.st_mtime < (time.time() if now is None else now) - grace_period
+
+
+def remove_empty_directories(root, name, top=''):
+    """Remove the directories of ``name`` that became empty, up to ``top`` (kept)."""
+    directory = os.path.dirname(name)
+    while directory and directory != top:
+        try:
+            os.rmdir(os.path.join(root, directory))
+        except OSError:
+            return
+        directory = os.path.dirname(directory)
+
+
+def collect(root, directories, referenced, grace_period, dry_run=False):
+    """
+    Remove the files below ``root``/``directories`` whose names are not in ``referenced`` and
+    that are older than ``grace_period`` seconds, which covers uploads whose rows aren't
+    committed yet. Yields (name, size) per garbage file, removed unless ``dry_run``.
+    """
+    now = time.time()
+    for directory in directories:
+        directory = directory.strip('/')
+        for name, stat in walk(root, directory):
+            if is_referenced(name, referenced) or not is_stale(stat, grace_period, now):
+                continue
+            if not dry_run:
+                try:
+                    os.remove(os.path.join(root, name))
+                except FileNotFoundError:
+                    continue
+                remove_empty_directories(root, name, directory)
+            yield name, stat.st_size
@@ -0,0 +1,108 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# Ordering of the lists shown newest first; 'id' breaks ties between equal created_at
+NEWEST_FIRST = ('-created_at', '-id')
+
+PAGINATION_PARAMETERS = [
+    openapi.Parameter('cursor', openapi.IN_QUERY, description="Cursor from the 'next' link of the previous page",
+                      type=openapi.TYPE_STRING, required=False),
+    openapi.Parameter('page_size', openapi.IN_QUERY, description='Number of items per page',
+                      type=openapi.TYPE_INTEGER, required=False),
+]
+
+
+class KeysetPagination:
+    """
+    Forward-only cursor pagination over ``ordering`` (e.g. ('-created_at', '-id')).
+    The cursor holds the ordering values of the last row of a page and the next page is
+    fetched with a range condition on them instead of OFFSET, so with an index on the
+    ordering columns every page costs the same. The last ordering field must be unique.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = ordering
+        self.page_size = page_size or settings.KEYSET_PAGE_SIZE
+        self.has_next = False
+        self.page = []
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            values = [model._meta.get_field(field.lstrip('-')).to_python(value)
+                      for field, value in zip(self.ordering, values)]
+            if None in values:
+                raise ValueError
+            return values
+        except (ValueError, TypeError, binascii.Error, DjangoValidationError):
+            raise NotFound('Invalid cursor')
+
+    def encode_cursor(self, instance):
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def get_position_filter(self, values):
+        # (a, b) < (x, y) is written as a <= x AND (a < x OR (a = x AND b < y)); the leading
+        # range on the first column lets the database seek in the index instead of scanning.
+        first = self.ordering[0]
+        condition = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+        position = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            position |= equal & Q(**{f"{name}__{'lt' if field.startswith('-') else 'gt'}": value})
+            equal &= Q(**{name: value})
+        return condition & position
+
+    def get_page_queryset(self, queryset, request):
+        """The query of the requested page, with one more row to tell whether there is a next page."""
+        values = self.decode_cursor(request, queryset.model)
+        queryset = queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = queryset.filter(self.get_position_filter(values))
+        return queryset[:self.get_page_size(request) + 1]
+
+    def paginate_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        page = list(self.get_page_queryset(queryset, request))
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(data={'next': self.get_next_link(), 'results': data}, status=status.HTTP_200_OK)
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import qrcode
+import qrcode.image.svg
+from django.conf import settings
+
+# Bump when the rendering changes, so codes rendered before aren't reused
+RENDER_VERSION = 1
+DEFAULT_OPTIONS = {'box_size': 10, 'border': 4, 'error_correction': 'M', 'fill': 'black', 'back_color': 'white'}
+ERROR_CORRECTION = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H,
+}
+
+
+def fingerprint(url, options=None):
+    """SHA-256 of the URL and the render options: codes with the same fingerprint look the same."""
+    key = {'url': url, 'options': {**DEFAULT_OPTIONS, **(options or {})}, 'version': RENDER_VERSION}
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def render(url, options=None):
+    """(PNG bytes, SVG bytes) of the QR code of ``url``. Pure, so it can run in a worker process."""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    code = qrcode.QRCode(version=1, box_size=options['box_size'], border=options['border'],
+                         error_correction=ERROR_CORRECTION[options['error_correction']])
+    code.add_data(url)
+    code.make(fit=True)
+    png = BytesIO()
+    code.make_image(fill_color=options['fill'], back_color=options['back_color']).save(png, format='PNG')
+    svg = BytesIO()
+    code.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(svg)
+    return png.getvalue(), svg.getvalue()
+
+
+def render_many(urls, options=None):
+    """
+    Render the QR codes of ``urls``, yielding (url, png, svg) in order. Large batches are spread
+    over the QR_CODE_WORKERS processes; small ones aren't worth the round trips.
+    """
+    urls = list(urls)
+    if not settings.QR_CODE_WORKERS or len(urls) < settings.QR_CODE_POOL_THRESHOLD:
+        for url in urls:
+            yield url, *render(url, options)
+        return
+    chunksize = max(1, len(urls) // (settings.QR_CODE_WORKERS * 4))
+    # A pool per batch: a long-lived one keeps its processes, which a job worker process waits
+    # for when it exits. spawn: forking a process that runs threads can copy held locks.
+    with ProcessPoolExecutor(max_workers=settings.QR_CODE_WORKERS,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        for url, (png, svg) in zip(urls, executor.map(render, urls, [options] * len(urls), chunksize=chunksize)):
+            yield url, png, svg
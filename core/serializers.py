@@ -0,0 +1,67 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from . import images
+
+
+class EagerLoadingMixin:
+    """
+    Serializers declare the relations their representation follows and views pass
+    their querysets through ``setup_eager_loading`` so lists don't run a query per row.
+    """
+    select_related = ()
+    prefetch_related = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        if cls.select_related:
+            queryset = queryset.select_related(*cls.select_related)
+        if cls.prefetch_related:
+            queryset = queryset.prefetch_related(*cls.prefetch_related)
+        return queryset
+
+
+class PreloadedPrimaryKeyRelatedField(PrimaryKeyRelatedField):
+    """
+    Looks related objects up in ``context['preloaded'][field_name]`` (pk -> instance) when the
+    caller has fetched them up front, e.g. for a bulk payload, instead of one query per item.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded', {}).get(self.field_name)
+        if preloaded is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except DjangoValidationError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[pk]
+
+
+class BulkSerializerMixin:
+    """Makes a ModelSerializer's foreign keys use PreloadedPrimaryKeyRelatedField."""
+    serializer_related_field = PreloadedPrimaryKeyRelatedField
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only representation of an image variants record (see core.images.srcset), with URLs
+    made absolute like ImageField's when the request is in the context.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+
+        def url(name):
+            url = default_storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return images.srcset(value, url)
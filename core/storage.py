@@ -0,0 +1,135 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+CONTENT_ADDRESSED_NAME = re.compile(r'(?:^|/)([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{60})(\.\w+)?$')
+
+
+def is_content_addressed(name):
+    """True if ``name`` is one ContentAddressedStorage made, so its content never changes."""
+    return CONTENT_ADDRESSED_NAME.search(name) is not None
+
+
+def upload_directory(name):
+    """Directory ``name`` was uploaded to, without the shard directories of a content-addressed name."""
+    match = CONTENT_ADDRESSED_NAME.search(name)
+    return name[:match.start()] if match else posixpath.dirname(name)
+
+
+class HashingUploadMixin:
+    """Computes the SHA-256 of an upload while its chunks arrive and leaves it on the file as ``sha256``."""
+
+    def new_file(self, *args, **kwargs):
+        # Set first: MemoryFileUploadHandler.new_file raises StopFutureHandlers when it takes the file
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if getattr(self, 'activated', True):
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file under the SHA-256 of its bytes, sharded by the first two byte pairs
+    (``media/ab/cd/abcd….png``): the upload's directory and extension are kept, its name is
+    not. Identical bytes are stored once, and a stored file never changes, so its URL can be
+    cached forever. Uploads hashed by the Hashing*UploadHandler are not read again; other
+    content is hashed while it is copied to a temporary file next to its final place.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name depends on the content only; _save never overwrites different bytes
+        return name
+
+    def hashed_name(self, name, digest):
+        directory, basename = posixpath.split(name.replace('\\', '/'))
+        extension = os.path.splitext(basename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest[2:4], f'{digest}{extension}')
+
+    def _make_directory(self, directory):
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0o777 & ~self.directory_permissions_mode)
+            try:
+                os.makedirs(directory, self.directory_permissions_mode, exist_ok=True)
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+    def _reuse(self, name):
+        """
+        True if ``name`` is already stored. Its mtime is refreshed, so the grace period of the
+        media garbage collector covers the new reference too.
+        """
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _store(self, temp_path, name):
+        full_path = self.path(name)
+        if self._reuse(name):
+            os.remove(temp_path)
+            return
+        self._make_directory(os.path.dirname(full_path))
+        if self.file_permissions_mode is not None:
+            os.chmod(temp_path, self.file_permissions_mode)
+        # Atomic: a concurrent save of the same bytes replaces the file with identical content
+        os.replace(temp_path, full_path)
+
+    def _save(self, name, content):
+        digest = getattr(content, 'sha256', None)
+        if digest is not None:
+            name = self.hashed_name(name, digest)
+            if self._reuse(name):
+                return name
+            if hasattr(content, 'temporary_file_path'):
+                full_path = self.path(name)
+                self._make_directory(os.path.dirname(full_path))
+                file_move_safe(content.temporary_file_path(), full_path, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+                return name
+
+        directory = os.path.dirname(self.path(name))
+        self._make_directory(directory)
+        sha256 = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    sha256.update(chunk)
+                    temp.write(chunk)
+            if digest is None:
+                name = self.hashed_name(name, sha256.hexdigest())
+            self._store(temp_path, name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
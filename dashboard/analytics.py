@@ -0,0 +1,186 @@
+import calendar
+import math
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import EventRollupModel, BookModel, ROLLUP_PERIOD
+
+PERIODS = [period for period, _ in ROLLUP_PERIOD]
+PERCENTILES = (50, 90)
+ROLLUP_FIELDS = ('category_id', 'book_date', 'price', 'number_of_guests')
+
+
+def bucket_start(period, day):
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return date(day.year, 1, 1)
+
+
+def bucket_end(period, day):
+    start = bucket_start(period, day)
+    if period == 'day':
+        return start
+    if period == 'week':
+        return start + timedelta(days=6) if start <= date.max - timedelta(days=6) else date.max
+    if period == 'month':
+        return start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    return date(day.year, 12, 31)
+
+
+def effective_range(period, start=None, end=None):
+    """The range get_analytics covers: ``start`` and ``end`` widened to whole buckets."""
+    return (bucket_start(period, start) if start is not None else None,
+            bucket_end(period, end) if end is not None else None)
+
+
+def _add_deltas(deltas, events, sign):
+    for event in events:
+        for period in PERIODS:
+            key = (period, bucket_start(period, event['book_date']), event['category_id'])
+            delta = deltas.setdefault(key, {'bookings': 0, 'revenue': 0, 'guests_total': 0, 'guests': Counter()})
+            delta['bookings'] += sign
+            delta['revenue'] += sign * event['price']
+            delta['guests_total'] += sign * event['number_of_guests']
+            delta['guests'][str(event['number_of_guests'])] += sign
+
+
+def event_state(instance):
+    return {field: BookModel._meta.get_field(field).to_python(getattr(instance, field)) for field in ROLLUP_FIELDS}
+
+
+def update_rollups(old=(), new=()):
+    """
+    Move the contribution of events from their ``old`` states to their ``new`` ones (lists of
+    event_state dicts). The affected rollup rows are read in one query and written back in bulk.
+    """
+    deltas = {}
+    _add_deltas(deltas, old, -1)
+    _add_deltas(deltas, new, 1)
+    deltas = {key: delta for key, delta in deltas.items()
+              if delta['bookings'] or delta['revenue'] or delta['guests_total'] or any(delta['guests'].values())}
+    if not deltas:
+        return
+    buckets = Q()
+    for period in PERIODS:
+        starts = {start for key_period, start, _ in deltas if key_period == period}
+        if starts:
+            buckets |= Q(period=period, bucket_start__in=starts)
+    with transaction.atomic():
+        rollups = {
+            (rollup.period, rollup.bucket_start, rollup.category_id): rollup
+            for rollup in EventRollupModel.objects.select_for_update().filter(
+                buckets, category_id__in={category_id for *_, category_id in deltas},
+            )
+        }
+        saved, deleted = [], []
+        for key, delta in deltas.items():
+            rollup = rollups.get(key) or EventRollupModel(period=key[0], bucket_start=key[1], category_id=key[2])
+            rollup.bookings += delta['bookings']
+            rollup.revenue += delta['revenue']
+            rollup.guests_total += delta['guests_total']
+            histogram = Counter(rollup.guests_histogram)
+            histogram.update(delta['guests'])
+            rollup.guests_histogram = {guests: count for guests, count in histogram.items() if count > 0}
+            if rollup.bookings > 0:
+                saved.append(rollup)
+            elif rollup.pk:
+                deleted.append(rollup.pk)
+        # New and changed rows in one upsert on the bucket key; bulk_update's CASE per row is far slower
+        EventRollupModel.objects.bulk_create(
+            saved, batch_size=500, update_conflicts=True, unique_fields=['period', 'bucket_start', 'category'],
+            update_fields=['bookings', 'revenue', 'guests_total', 'guests_histogram'],
+        )
+        EventRollupModel.objects.filter(pk__in=deleted).delete()
+
+
+def build_rollups(events):
+    """Aggregate event dicts (ROLLUP_FIELDS) into unsaved rollup rows."""
+    rollups = {}
+    for event in events:
+        for period in PERIODS:
+            key = (period, bucket_start(period, event['book_date']), event['category_id'])
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = EventRollupModel(period=key[0], bucket_start=key[1], category_id=key[2])
+            rollup.bookings += 1
+            rollup.revenue += event['price']
+            rollup.guests_total += event['number_of_guests']
+            guests = str(event['number_of_guests'])
+            rollup.guests_histogram[guests] = rollup.guests_histogram.get(guests, 0) + 1
+    return list(rollups.values())
+
+
+def rebuild():
+    events = BookModel.objects.values(*ROLLUP_FIELDS).iterator(chunk_size=2000)
+    with transaction.atomic():
+        EventRollupModel.objects.all().delete()
+        return len(EventRollupModel.objects.bulk_create(build_rollups(events), batch_size=500))
+
+
+def percentile(histogram, p):
+    """Nearest-rank percentile of a Counter of value -> occurrences."""
+    rank = math.ceil(p / 100 * sum(histogram.values()))
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+    return None
+
+
+def _summary(bookings, revenue, guests_total, histogram):
+    summary = {
+        'bookings': bookings,
+        'revenue': revenue,
+        'guests_mean': round(guests_total / bookings, 1) if bookings else 0,
+    }
+    for p in PERCENTILES:
+        summary[f'guests_p{p}'] = percentile(histogram, p)
+    return summary
+
+
+def get_analytics(period, start=None, end=None, category=None):
+    """
+    Per-bucket totals and per-category breakdown read from the rollups, so the cost depends
+    on the number of buckets in the range and not on the number of events. Rollups only hold
+    whole buckets, so the range is widened to them: see effective_range.
+    """
+    start, end = effective_range(period, start, end)
+    rollups = EventRollupModel.objects.filter(period=period)
+    if start is not None:
+        rollups = rollups.filter(bucket_start__gte=start)
+    if end is not None:
+        rollups = rollups.filter(bucket_start__lte=end)
+    if category is not None:
+        rollups = rollups.filter(category_id=category)
+    rows = rollups.order_by('bucket_start', 'category_id').values(
+        'bucket_start', 'category_id', 'category__name', 'bookings', 'revenue', 'guests_total', 'guests_histogram',
+    )
+    buckets = defaultdict(list)
+    for row in rows:
+        buckets[row['bucket_start']].append(row)
+    results = []
+    for start_date, bucket_rows in buckets.items():
+        histograms = [Counter({int(value): count for value, count in row['guests_histogram'].items()})
+                      for row in bucket_rows]
+        results.append({
+            'bucket_start': start_date,
+            **_summary(sum(row['bookings'] for row in bucket_rows), sum(row['revenue'] for row in bucket_rows),
+                       sum(row['guests_total'] for row in bucket_rows), sum(histograms, Counter())),
+            'categories': [
+                {
+                    'id': row['category_id'],
+                    'name': row['category__name'],
+                    **_summary(row['bookings'], row['revenue'], row['guests_total'], histogram),
+                }
+                for row, histogram in zip(bucket_rows, histograms)
+            ],
+        })
+    return results
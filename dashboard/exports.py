@@ -0,0 +1,38 @@
+from core.export import Export, ExportColumn
+from .models import SALARY_TYPE
+
+EVENT_EXPORT = Export('events', [
+    ExportColumn('ID', 'id'),
+    ExportColumn('Book date', 'book_date'),
+    ExportColumn('Category', 'category__name'),
+    ExportColumn('First name', 'booker_first_name'),
+    ExportColumn('Last name', 'booker_last_name'),
+    ExportColumn('Phone number', 'phone_number'),
+    ExportColumn('Guests', 'number_of_guests'),
+    ExportColumn('Price', 'price'),
+    ExportColumn('Additional info', 'additional_info'),
+    ExportColumn('Created at', 'created_at'),
+])
+
+MESSAGE_EXPORT = Export('messages', [
+    ExportColumn('ID', 'id'),
+    ExportColumn('First name', 'first_name'),
+    ExportColumn('Last name', 'last_name'),
+    ExportColumn('Phone number', 'phone_number'),
+    ExportColumn('Message', 'message'),
+    ExportColumn('Answered', 'answered'),
+    ExportColumn('Created at', 'created_at'),
+])
+
+TEAM_EXPORT = Export('team', [
+    ExportColumn('ID', 'id'),
+    ExportColumn('First name', 'first_name'),
+    ExportColumn('Last name', 'last_name'),
+    ExportColumn('Middle name', 'middle_name'),
+    ExportColumn('Position', 'position__name'),
+    ExportColumn('Working from', 'from_working_hours'),
+    ExportColumn('Working to', 'to_working_hours'),
+    ExportColumn('Salary type', 'salary_type', dict(SALARY_TYPE).get),
+    ExportColumn('Salary', 'salary'),
+    ExportColumn('Work start date', 'work_start_data'),
+])
@@ -0,0 +1,56 @@
+from drf_yasg import openapi
+
+from core.filters import ListFilter, QueryFilter, parse_bool, parse_date, parse_int, start_of_day, start_of_next_day
+
+EVENT_FILTER = ListFilter(
+    filters={
+        'date_from': QueryFilter('book_date__gte', parse_date, 'Book date from (YYYY-MM-DD)'),
+        'date_to': QueryFilter('book_date__lte', parse_date, 'Book date to (YYYY-MM-DD)'),
+        'category': QueryFilter('category_id', parse_int, 'Category id', openapi.TYPE_INTEGER),
+        'guests_min': QueryFilter('number_of_guests__gte', parse_int, 'Minimum number of guests', openapi.TYPE_INTEGER),
+        'guests_max': QueryFilter('number_of_guests__lte', parse_int, 'Maximum number of guests', openapi.TYPE_INTEGER),
+    },
+    search_fields=('booker_first_name', 'booker_last_name', 'phone_number'),
+    ordering_fields=('book_date', 'number_of_guests', 'price', 'created_at'),
+    default_ordering='-book_date',
+)
+
+MESSAGE_FILTER = ListFilter(
+    filters={
+        'date_from': QueryFilter('created_at__gte', start_of_day, 'Sent from (YYYY-MM-DD)'),
+        'date_to': QueryFilter('created_at__lt', start_of_next_day, 'Sent to (YYYY-MM-DD)'),
+        'answered': QueryFilter('answered', parse_bool, 'true or false', openapi.TYPE_BOOLEAN),
+    },
+    search_fields=('first_name', 'last_name', 'phone_number'),
+    ordering_fields=('created_at',),
+    default_ordering='-created_at',
+)
+
+TEAM_FILTER = ListFilter(
+    filters={
+        'position': QueryFilter('position_id', parse_int, 'Position id', openapi.TYPE_INTEGER),
+    },
+    search_fields=('first_name', 'last_name', 'middle_name'),
+    ordering_fields=('first_name', 'last_name', 'work_start_data', 'salary', 'created_at'),
+    default_ordering='id',
+)
+
+NEWS_FILTER = ListFilter(
+    filters={
+        'date_from': QueryFilter('created_at__gte', start_of_day, 'Created from (YYYY-MM-DD)'),
+        'date_to': QueryFilter('created_at__lt', start_of_next_day, 'Created to (YYYY-MM-DD)'),
+    },
+    search_fields=('title',),
+    ordering_fields=('created_at', 'title'),
+    default_ordering='-created_at',
+)
+
+JOB_FILTER = ListFilter(
+    filters={
+        'status': QueryFilter('status', description='queued, running, succeeded or failed'),
+        'queue': QueryFilter('queue', description='Queue name'),
+        'task': QueryFilter('task', description='Dotted path of the task'),
+    },
+    ordering_fields=('created_at', 'run_at'),
+    default_ordering='-id',
+)
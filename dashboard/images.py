@@ -0,0 +1,20 @@
+from .models import (
+    AboutUsModel,
+    GalleryModel,
+    HomeModel,
+    NewsModel,
+    TeamMemberModel,
+    WebSocialMedia,
+    WeddingCategoryModel,
+)
+
+# model -> image field whose variants are generated by core.images
+IMAGE_FIELDS = {
+    HomeModel: 'image',
+    AboutUsModel: 'image',
+    WeddingCategoryModel: 'image',
+    GalleryModel: 'image',
+    NewsModel: 'image',
+    TeamMemberModel: 'image',
+    WebSocialMedia: 'social_media_image',
+}
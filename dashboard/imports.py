@@ -0,0 +1,187 @@
+import csv
+import math
+import re
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from authentication.validators import validate_uz_phone_number
+from core import bulk
+from .exports import EVENT_EXPORT
+from .models import BookModel, WeddingCategoryModel
+
+CHUNK_SIZE = 5000
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y')
+REQUIRED_COLUMNS = ('book_date', 'category', 'booker_first_name', 'booker_last_name', 'phone_number')
+# Column names accepted besides the field names: the headers of the events export, so an export can be re-imported
+COLUMN_ALIASES = {column.header: column.field.replace('__name', '') for column in EVENT_EXPORT.columns}
+ERROR_FILE_NAME = re.compile(r'[0-9a-f]{32}\.csv')
+
+
+class ImportFileError(ValueError):
+    """The file can't be imported at all, e.g. a required column is missing."""
+
+
+def _date(value):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f'Invalid date: {value}')
+
+
+def _number(parse, value, name):
+    if not value:
+        return 0
+    try:
+        number = parse(value.replace(' ', '').replace(',', '.'))
+    except ValueError:
+        raise ValueError(f'Invalid {name}: {value}')
+    if number < 0 or not math.isfinite(number):
+        raise ValueError(f'Invalid {name}: {value}')
+    if parse is int:
+        # The column's range: a larger value would fail the INSERT of the whole chunk
+        _, maximum = connection.ops.integer_field_range(BookModel._meta.get_field(name).get_internal_type())
+        if maximum is not None and number > maximum:
+            raise ValueError(f'{name} must be at most {maximum}: {value}')
+    return number
+
+
+def _name(value, name):
+    if not value:
+        raise ValueError(f'{name} is required')
+    if len(value) > 250:
+        raise ValueError(f'{name} is longer than 250 characters')
+    return value
+
+
+def _phone_numbers(rows):
+    """Validate the distinct phone numbers of a batch once: number -> (normalized, error)."""
+    results = {}
+    for phone_number in {row.get('phone_number') or '' for row in rows}:
+        try:
+            results[phone_number] = (validate_uz_phone_number(phone_number), None)
+        except serializers.ValidationError as error:
+            results[phone_number] = (None, ' '.join(str(detail) for detail in error.detail))
+    return results
+
+
+class EventImport:
+    """
+    Stream-parses a CSV of bookings and inserts the valid rows with bulk_create, one transaction
+    per chunk, so memory use doesn't depend on the size of the file. Categories are resolved
+    by name (or id) from one preloaded map. Rejected rows go to ``errors_file`` with their line
+    number and the reason; chunks written before a failure stay written, unless the caller
+    runs the import in a transaction of its own (a request with an Idempotency-Key does).
+    """
+
+    def __init__(self, errors_file=None, chunk_size=None):
+        self.errors_file = errors_file
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.created = 0
+        self.rejected = 0
+        self._errors_writer = None
+        self._categories = {}
+        self._category_ids = set()
+
+    def load_categories(self):
+        for pk, name in WeddingCategoryModel.objects.values_list('id', 'name'):
+            self._categories.setdefault(name.strip().casefold(), pk)
+            self._category_ids.add(pk)
+
+    def category_id(self, value):
+        if value.isdigit() and int(value) in self._category_ids:
+            return int(value)
+        try:
+            return self._categories[value.casefold()]
+        except KeyError:
+            raise ValueError(f'Unknown category: {value}')
+
+    def reject(self, line, row, message):
+        self.rejected += 1
+        if self.errors_file is None:
+            return
+        if self._errors_writer is None:
+            self._errors_writer = csv.writer(self.errors_file)
+            self._errors_writer.writerow(['line', 'error', *self._fieldnames])
+        self._errors_writer.writerow([line, message, *row])
+
+    def build(self, row, phone_numbers):
+        phone_number, error = phone_numbers[row.get('phone_number') or '']
+        if error:
+            raise ValueError(error)
+        return BookModel(
+            book_date=_date(row['book_date']),
+            category_id=self.category_id(row['category']),
+            booker_first_name=_name(row['booker_first_name'], 'booker_first_name'),
+            booker_last_name=_name(row['booker_last_name'], 'booker_last_name'),
+            phone_number=phone_number,
+            number_of_guests=_number(int, row.get('number_of_guests'), 'number_of_guests'),
+            price=_number(float, row.get('price'), 'price'),
+            additional_info=row.get('additional_info') or '',
+        )
+
+    def import_chunk(self, chunk):
+        phone_numbers = _phone_numbers(row for _, row, _ in chunk)
+        events = []
+        for line, row, values in chunk:
+            try:
+                events.append(self.build(row, phone_numbers))
+            except ValueError as error:
+                self.reject(line, values, str(error))
+        if events:
+            with transaction.atomic():
+                bulk.create_instances(BookModel, events)
+            self.created += len(events)
+
+    def run(self, lines):
+        """Import the CSV text ``lines`` (a file opened in text mode with newline=''). Returns self."""
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is None:
+            raise ImportFileError('The file is empty')
+        header = [name.strip() for name in header]
+        self._fieldnames = header
+        fields = [COLUMN_ALIASES.get(name, name) for name in header]
+        missing = [name for name in REQUIRED_COLUMNS if name not in fields]
+        if missing:
+            raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+        self.load_categories()
+        chunk = []
+        for values in reader:
+            if not any(values):
+                continue
+            if len(values) != len(fields):
+                self.reject(reader.line_num, values, f'Expected {len(fields)} columns, got {len(values)}')
+                continue
+            chunk.append((reader.line_num, {field: value.strip() for field, value in zip(fields, values)}, values))
+            if len(chunk) == self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self
+
+
+def errors_root():
+    return Path(settings.IMPORT_ERRORS_ROOT)
+
+
+def new_error_file():
+    """(name, path) of a fresh error file under IMPORT_ERRORS_ROOT."""
+    errors_root().mkdir(parents=True, exist_ok=True)
+    name = f'{uuid.uuid4().hex}.csv'
+    return name, errors_root() / name
+
+
+def error_file_path(name):
+    """Path of the error file ``name``, or None if the name isn't one new_error_file could have made."""
+    if not ERROR_FILE_NAME.fullmatch(name):
+        return None
+    path = errors_root() / name
+    return path if path.is_file() else None
@@ -0,0 +1,153 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.utils.timezone import now
+from rest_framework.request import Request
+
+from core.pagination import KeysetPagination, NEWEST_FIRST
+from dashboard.filters import EVENT_FILTER, JOB_FILTER, MESSAGE_FILTER, NEWS_FILTER, TEAM_FILTER
+from dashboard.models import (
+    HomeModel,
+    AboutUsModel,
+    WeddingCategoryModel,
+    GalleryModel,
+    PriceModel,
+    BookModel,
+    EventRollupModel,
+    NewsModel,
+    PositionModel,
+    TeamMemberModel,
+    WebContactInfoModel,
+    WebSocialMedia,
+)
+from dashboard.serializers import EventSerializer, TeamMemberDashboardSerializer
+from jobs.models import JobModel
+from web.models import ContactUsModel
+from web.serializers import GallerySerializer
+
+
+def _request(**params):
+    return Request(RequestFactory().get('/', params))
+
+
+def _cursor(model, ordering, **values):
+    return KeysetPagination(ordering=ordering).encode_cursor(model(**values))
+
+
+def _page(queryset, ordering, **params):
+    """The query of a page of a KeysetPagination list, as the view runs it for ``params``."""
+    return KeysetPagination(ordering=ordering).get_page_queryset(queryset, _request(**params))
+
+
+def _filtered_page(list_filter, queryset, **params):
+    """The query of a page of a ListFilter list, as the view runs it for ``params``."""
+    request = _request(**params)
+    pagination = KeysetPagination(ordering=list_filter.get_ordering(request))
+    return pagination.get_page_queryset(list_filter.filter_queryset(queryset, request), request)
+
+
+def _filtered(list_filter, queryset, **params):
+    request = _request(**params)
+    return list_filter.filter_queryset(queryset, request).order_by(*list_filter.get_ordering(request))
+
+
+def endpoint_queries():
+    """
+    (name, queryset, scan_allowed) for the queries behind the web and dashboard endpoints.
+    Lists are built with the filters and pagination their views use. Scans are only allowed
+    for small settings/lookup tables that are always read whole, and for pages ordered by id
+    alone, which walk the rowid and stop at the page size.
+    """
+    today = now().date()
+    created_at = now()
+    events = EventSerializer.setup_eager_loading(BookModel.objects.all())
+    event_ordering = EVENT_FILTER.get_ordering(_request())
+    return [
+        ('web get_main_page', HomeModel.objects.all()[:1], True),
+        ('web get_about_us', AboutUsModel.objects.all()[:1], True),
+        ('web get_our_services', WeddingCategoryModel.objects.all(), True),
+        ('web get_prices', PriceModel.objects.all(), True),
+        ('web get_our_team', TeamMemberModel.objects.select_related('position'), True),
+        ('web get_contact_us_info', WebContactInfoModel.objects.all()[:1], True),
+        ('web get_web_social_media', WebSocialMedia.objects.all(), True),
+        ('web get_calendar_datas (deprecated full dump)', BookModel.objects.all(), True),
+        ('web get_gallery', _page(GallerySerializer.setup_eager_loading(GalleryModel.objects.all()), NEWEST_FIRST),
+         False),
+        ('web get_gallery (next page)',
+         _page(GallerySerializer.setup_eager_loading(GalleryModel.objects.all()), NEWEST_FIRST,
+               cursor=_cursor(GalleryModel, NEWEST_FIRST, created_at=created_at, id=1)), False),
+        ('web get_gallery_by_id', GalleryModel.objects.select_related('category').filter(category__id=1), False),
+        ('web get_news', _page(NewsModel.objects.all(), NEWEST_FIRST), False),
+        ('web get_news (next page)',
+         _page(NewsModel.objects.all(), NEWEST_FIRST, cursor=_cursor(NewsModel, NEWEST_FIRST, created_at=created_at,
+                                                                     id=1)), False),
+        ('web get_calendar_data_info', BookModel.objects.select_related('category').filter(book_date=today)[:1],
+         False),
+        ('web get_availability',
+         BookModel.objects.filter(book_date__gte=date(today.year, 1, 1), book_date__lt=date(today.year + 1, 1, 1))
+         .values_list('book_date', flat=True).distinct(), False),
+        ('dashboard get_upcoming_events',
+         BookModel.objects.select_related('category').filter(book_date__gte=today).order_by('book_date')[:3], False),
+        ('dashboard get_unanswered_messages', ContactUsModel.objects.filter(answered=False).order_by(*NEWEST_FIRST),
+         False),
+        ('dashboard get_web_stats (unanswered messages)', ContactUsModel.objects.filter(answered=False).values('id'),
+         False),
+        ('dashboard get_all_events', _filtered_page(EVENT_FILTER, events), False),
+        ('dashboard get_all_events (next page)',
+         _filtered_page(EVENT_FILTER, events, cursor=_cursor(BookModel, event_ordering,
+                                                             book_date=today + timedelta(days=1), id=1)), False),
+        ('dashboard get_all_events (this week)',
+         _filtered_page(EVENT_FILTER, events, date_from=today.isoformat(),
+                        date_to=(today + timedelta(days=6)).isoformat()), False),
+        ('dashboard get_all_events (by category)', _filtered_page(EVENT_FILTER, events, category='1'), False),
+        ('dashboard get_all_events (by guests)',
+         _filtered_page(EVENT_FILTER, events, ordering='-number_of_guests'), False),
+        ('dashboard get_event_by_id', BookModel.objects.select_related('category').filter(id=1), False),
+        ('dashboard get_all_messages', _filtered_page(MESSAGE_FILTER, ContactUsModel.objects.all()), False),
+        ('dashboard get_all_messages (answered)',
+         _filtered_page(MESSAGE_FILTER, ContactUsModel.objects.all(), answered='true'), False),
+        ('dashboard get_all_messages (next page)',
+         _filtered_page(MESSAGE_FILTER, ContactUsModel.objects.all(),
+                        cursor=_cursor(ContactUsModel, NEWEST_FIRST, created_at=created_at, id=1)), False),
+        ('dashboard get_all_our_team',
+         _filtered(TEAM_FILTER, TeamMemberDashboardSerializer.setup_eager_loading(TeamMemberModel.objects.all())),
+         True),
+        ('dashboard get_all_news', _filtered(NEWS_FILTER, NewsModel.objects.all()), False),
+        ('dashboard get_all_jobs', _filtered_page(JOB_FILTER, JobModel.objects.all()), True),
+        ('dashboard get_all_jobs (failed)', _filtered_page(JOB_FILTER, JobModel.objects.all(), status='failed'), False),
+        ('dashboard get_all_positions', PositionModel.objects.all(), True),
+        ('dashboard get_event_analytics',
+         EventRollupModel.objects.filter(period='month', bucket_start__gte=date(today.year, 1, 1),
+                                         bucket_start__lte=today).select_related('category'), False),
+        ('dashboard get_event_stats', EventRollupModel.objects.filter(period='year').values('category__name'), False),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Run EXPLAIN QUERY PLAN for the endpoint queries and fail if one of them scans a whole table'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('check_query_plans supports SQLite only')
+        failures = []
+        with connection.cursor() as cursor:
+            for name, queryset, scan_allowed in endpoint_queries():
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                details = [row[-1] for row in cursor.fetchall()]
+                scans = [detail for detail in details if detail.startswith('SCAN') and ' USING ' not in detail]
+                if scans and not scan_allowed:
+                    failures.append(name)
+                    style = self.style.ERROR
+                elif scans:
+                    style = self.style.WARNING
+                else:
+                    style = self.style.SUCCESS
+                self.stdout.write(style(name))
+                for detail in details:
+                    self.stdout.write(f'    {detail}')
+        if failures:
+            raise CommandError(f"Full table scans in: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('No unexpected full table scans'))
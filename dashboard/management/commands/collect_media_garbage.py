@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import media_gc
+from dashboard.media_gc import referenced_names, upload_directories
+
+
+class Command(BaseCommand):
+    help = 'Remove uploaded files, and image variants, that no row refers to any more'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report the files that would be removed')
+        parser.add_argument('--grace-period', type=int, default=settings.MEDIA_GC_GRACE_PERIOD,
+                            help='Seconds an unreferenced file is kept after it was last written')
+
+    def handle(self, *args, **options):
+        # References are read before the walk: a file uploaded since is newer than the grace period
+        referenced = referenced_names()
+        files = size = 0
+        for name, file_size in media_gc.collect(settings.MEDIA_ROOT, upload_directories(), referenced,
+                                                options['grace_period'], dry_run=options['dry_run']):
+            files += 1
+            size += file_size
+            if options['verbosity'] > 1:
+                self.stdout.write(name)
+        verb = 'would be removed' if options['dry_run'] else 'removed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{files} unreferenced files ({size / 1024 / 1024:.1f} MB) {verb}, {len(referenced)} referenced'
+        ))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from core import bulk, images
+from core.storage import is_content_addressed
+from dashboard.media_gc import file_fields
+
+
+class Command(BaseCommand):
+    help = 'Re-store uploaded files under their content hash and point the rows at them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only count the files that would be renamed')
+
+    def rename(self, model, instance, field_name):
+        field_file = getattr(instance, field_name)
+        old_name = field_file.name
+        with field_file.storage.open(old_name, 'rb') as file:
+            new_name = field_file.storage.save(old_name, file)
+        # updated_at too: the URLs change, so responses validated before must not get a 304
+        values = {field_name: new_name, 'updated_at': now()}
+        record = getattr(instance, images.variants_field(field_name), None)
+        if record and record.get('source') == old_name:
+            # Same bytes, so the variants stay valid for the new name
+            values[images.variants_field(field_name)] = {**record, 'source': new_name}
+        previous = bulk.field_state(instance)
+        # Only if the row still holds the old file, so a concurrent upload wins
+        if not model.objects.filter(pk=instance.pk, **{field_name: old_name}).update(**values):
+            return False
+        for name, value in values.items():
+            setattr(instance, name, value)
+        bulk.bulk_saved.send(sender=model, instances=[instance], created=False, previous=[previous])
+        return True
+
+    def handle(self, *args, **options):
+        renamed = missing = 0
+        for model, field_name in file_fields():
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for instance in rows.iterator():
+                field_file = getattr(instance, field_name)
+                if is_content_addressed(field_file.name):
+                    continue
+                if not field_file.storage.exists(field_file.name):
+                    missing += 1
+                    self.stderr.write(f'{model.__name__} {instance.pk}: {field_file.name} is missing')
+                    continue
+                if options['dry_run'] or self.rename(model, instance, field_name):
+                    renamed += 1
+        verb = 'would be renamed' if options['dry_run'] else 'renamed'
+        self.stdout.write(self.style.SUCCESS(f'{renamed} files {verb}, {missing} missing'))
+        if renamed and not options['dry_run']:
+            self.stdout.write('The old files are no longer referenced and can be removed')
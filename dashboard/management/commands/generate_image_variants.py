@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from core import images
+from dashboard import tasks
+from dashboard.images import IMAGE_FIELDS
+
+
+class Command(BaseCommand):
+    help = 'Queue (or generate) the responsive variants of uploaded images that have none or outdated ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate current variants too')
+        parser.add_argument('--inline', action='store_true', help='Generate them here instead of in the job queue')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for model, field_name in IMAGE_FIELDS.items():
+            rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True}).values_list(
+                'pk', field_name, images.variants_field(field_name),
+            )
+            for pk, name, record in rows.iterator():
+                if options['force'] or not record or record.get('source') != name:
+                    jobs.append((model, pk, field_name))
+        if options['inline']:
+            updated = sum(images.update(*job, force=options['force']) for job in jobs)
+            self.stdout.write(self.style.SUCCESS(f'{updated} of {len(jobs)} images updated'))
+            return
+        for model, pk, field_name in jobs:
+            tasks.enqueue_image_variants(model, pk, field_name, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f'{len(jobs)} images queued'))
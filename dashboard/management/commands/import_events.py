@@ -0,0 +1,33 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.imports import CHUNK_SIZE, EventImport, ImportFileError
+
+
+class Command(BaseCommand):
+    help = 'Import events from a CSV file; rejected rows are written to an error file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument('--errors', help='Where to write rejected rows (default: <path>.errors.csv)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows inserted per transaction')
+
+    def handle(self, *args, **options):
+        errors_path = options['errors'] or f"{options['path']}.errors.csv"
+        started = time.monotonic()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as lines, \
+                    open(errors_path, 'w', encoding='utf-8-sig', newline='') as errors_file:
+                result = EventImport(errors_file, options['chunk_size']).run(lines)
+        except (OSError, UnicodeDecodeError, ImportFileError) as error:
+            raise CommandError(str(error))
+        finally:
+            if os.path.exists(errors_path) and not os.path.getsize(errors_path):
+                os.remove(errors_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'{result.created} events imported, {result.rejected} rejected in {time.monotonic() - started:.1f}s'
+        ))
+        if result.rejected:
+            self.stdout.write(f'Rejected rows: {errors_path}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import analytics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the event analytics rollups from BookModel'
+
+    def handle(self, *args, **options):
+        count = analytics.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{count} rollup rows written'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index of events, messages and news'
+
+    def handle(self, *args, **options):
+        if not search.is_supported():
+            raise CommandError('rebuild_search_index supports SQLite only')
+        count = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{count} documents indexed'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from dashboard import stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized dashboard stats from the source tables'
+
+    def handle(self, *args, **options):
+        row = stats.reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f'employees={row.employees} booked_events={row.booked_events} '
+            f'unanswered_messages={row.unanswered_messages} annual_income={row.annual_income}'
+        ))
@@ -0,0 +1,91 @@
+import logging
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+
+from core import images, media_gc
+
+logger = logging.getLogger(__name__)
+
+
+def file_fields(app_label='dashboard'):
+    """(model, field name) of every file field of the app's models."""
+    for model in apps.get_app_config(app_label).get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField):
+                yield model, field.name
+
+
+def upload_directories():
+    """The directories file fields upload to, which the collector walks."""
+    directories = set()
+    for model, field_name in file_fields():
+        upload_to = model._meta.get_field(field_name).upload_to
+        if isinstance(upload_to, str):
+            directories.add(upload_to.strip('/'))
+    return sorted(directories)
+
+
+def _variants_field(model, field_name):
+    name = images.variants_field(field_name)
+    return name if any(field.name == name for field in model._meta.get_fields()) else None
+
+
+def _record_names(record):
+    return [variant['name'] for variant in (record or {}).get('variants', ())]
+
+
+def referenced_names():
+    """Every stored name a row refers to: the files of the file fields and their recorded variants."""
+    referenced = set()
+    for model, field_name in file_fields():
+        variants_field = _variants_field(model, field_name)
+        rows = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+        if variants_field is None:
+            referenced.update(rows.values_list(field_name, flat=True).iterator())
+            continue
+        for name, record in rows.values_list(field_name, variants_field).iterator():
+            referenced.add(name)
+            referenced.update(_record_names(record))
+    return referenced
+
+
+def instance_files(instance):
+    """{name: variant names} of the files ``instance`` holds."""
+    files = {}
+    for model, field_name in file_fields():
+        if isinstance(instance, model):
+            name = getattr(instance, field_name).name
+            if name:
+                variants_field = _variants_field(model, field_name)
+                record = getattr(instance, variants_field) if variants_field else None
+                files[name] = _record_names(record) if record and record.get('source') == name else []
+    return files
+
+
+def is_referenced(name):
+    return any(model.objects.filter(**{field_name: name}).exists() for model, field_name in file_fields())
+
+
+def release(files):
+    """
+    Remove the files (and their variants) of ``files`` ({name: variant names}) that no row
+    refers to any more and that are past the grace period; the rest is left to the
+    collect_media_garbage command. Variants go with their source: identical sources share one
+    stored name, so a source still referenced keeps its variants.
+    """
+    for name, variants in files.items():
+        if is_referenced(name):
+            continue
+        for stored in (name, *variants):
+            try:
+                path = default_storage.path(stored)
+                if media_gc.is_stale(os.stat(path), settings.MEDIA_GC_GRACE_PERIOD):
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as error:
+                logger.warning('Could not remove %s: %s', stored, error)
@@ -0,0 +1,306 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_alter_aboutusmodel_successful_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QrCodeModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('url', models.URLField(verbose_name='url')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='media/', verbose_name='image')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RemoveField(
+            model_name='dashboardstatsmodel',
+            name='annual_income',
+        ),
+        migrations.RemoveField(
+            model_name='pricemodel',
+            name='highlights',
+        ),
+        migrations.AddField(
+            model_name='pricehighlightmodel',
+            name='price',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='dashboard.pricemodel'),
+        ),
+        migrations.AlterField(
+            model_name='aboutushighlightmodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='aboutushighlightmodel',
+            name='title',
+            field=models.CharField(max_length=300, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='main_description',
+            field=models.TextField(verbose_name='main_description'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='successful_events',
+            field=models.IntegerField(default=0, verbose_name='successful_events'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='title',
+            field=models.CharField(max_length=300, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='aboutusmodel',
+            name='work_experience',
+            field=models.IntegerField(default=0, verbose_name='work_experience'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='additional_info',
+            field=models.TextField(verbose_name='additional_info'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='book_date',
+            field=models.DateField(verbose_name='book_date'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='booker_first_name',
+            field=models.CharField(max_length=250, verbose_name='booker_first_name'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='booker_last_name',
+            field=models.CharField(max_length=250, verbose_name='booker_last_name'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='number_of_guests',
+            field=models.PositiveIntegerField(default=0, verbose_name='number_of_guests'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='phone_number',
+            field=models.CharField(max_length=13, verbose_name='phone_number'),
+        ),
+        migrations.AlterField(
+            model_name='bookmodel',
+            name='price',
+            field=models.FloatField(default=0, verbose_name='price'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstatsmodel',
+            name='employees',
+            field=models.IntegerField(default=0, verbose_name='employees'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstatsmodel',
+            name='events',
+            field=models.IntegerField(default=0, verbose_name='events'),
+        ),
+        migrations.AlterField(
+            model_name='dashboardstatsmodel',
+            name='unanswered_messages',
+            field=models.IntegerField(default=0, verbose_name='unanswered_messages'),
+        ),
+        migrations.AlterField(
+            model_name='gallerymodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='homemodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='homemodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='homemodel',
+            name='title',
+            field=models.CharField(max_length=300, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='newsmodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='newsmodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='newsmodel',
+            name='title',
+            field=models.CharField(max_length=300, verbose_name='title'),
+        ),
+        migrations.AlterField(
+            model_name='positionmodel',
+            name='name',
+            field=models.CharField(max_length=250, verbose_name='name'),
+        ),
+        migrations.AlterField(
+            model_name='pricehighlightmodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='pricemodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='pricemodel',
+            name='price',
+            field=models.FloatField(default=0, verbose_name='price'),
+        ),
+        migrations.AlterField(
+            model_name='pricemodel',
+            name='type',
+            field=models.CharField(default='', max_length=250),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='pricetypemodel',
+            name='name',
+            field=models.CharField(max_length=250, verbose_name='name'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='first_name',
+            field=models.CharField(max_length=250, verbose_name='first_name'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='from_working_hours',
+            field=models.TimeField(verbose_name='from_working_hours'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='last_name',
+            field=models.CharField(max_length=250, verbose_name='last_name'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='middle_name',
+            field=models.CharField(max_length=250, verbose_name='middle_name'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='salary',
+            field=models.FloatField(default=0, verbose_name='salary'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='salary_type',
+            field=models.IntegerField(choices=[(1, 'Monthly'), (2, 'Daily')], default=1, verbose_name='salary_type'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='to_working_hours',
+            field=models.TimeField(verbose_name='to_working_hours'),
+        ),
+        migrations.AlterField(
+            model_name='teammembermodel',
+            name='work_start_data',
+            field=models.DateField(verbose_name='work_start_data'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='close_to',
+            field=models.TimeField(verbose_name='close_to'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='email',
+            field=models.EmailField(max_length=254, verbose_name='email'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='location',
+            field=models.CharField(max_length=300, verbose_name='location'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='location_url',
+            field=models.CharField(default='example.com', max_length=300, verbose_name='location_url'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='open_from',
+            field=models.TimeField(verbose_name='open_from'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='phone_number',
+            field=models.CharField(max_length=13, verbose_name='phone_number'),
+        ),
+        migrations.AlterField(
+            model_name='webcontactinfomodel',
+            name='wedding_hall_name',
+            field=models.CharField(max_length=300, verbose_name='wedding_hall_name'),
+        ),
+        migrations.AlterField(
+            model_name='websocialmedia',
+            name='name',
+            field=models.CharField(max_length=250, verbose_name='name'),
+        ),
+        migrations.AlterField(
+            model_name='websocialmedia',
+            name='social_media_image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='social_media_image'),
+        ),
+        migrations.AlterField(
+            model_name='websocialmedia',
+            name='url',
+            field=models.URLField(verbose_name='url'),
+        ),
+        migrations.AlterField(
+            model_name='weddingcategorymodel',
+            name='description',
+            field=models.TextField(verbose_name='description'),
+        ),
+        migrations.AlterField(
+            model_name='weddingcategorymodel',
+            name='image',
+            field=models.ImageField(null=True, upload_to='media/', verbose_name='image'),
+        ),
+        migrations.AlterField(
+            model_name='weddingcategorymodel',
+            name='name',
+            field=models.CharField(max_length=250, verbose_name='name'),
+        ),
+    ]
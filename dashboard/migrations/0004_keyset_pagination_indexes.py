@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_qrcodemodel_remove_dashboardstatsmodel_annual_income_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookmodel',
+            index=models.Index(fields=['book_date', 'id'], name='book_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallerymodel',
+            index=models.Index(fields=['created_at', 'id'], name='gallery_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsmodel',
+            index=models.Index(fields=['created_at', 'id'], name='news_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookmodel',
+            index=models.Index(fields=['book_date', 'category'], name='book_date_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallerymodel',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='gallery_category_created_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:17
+
+from django.db import migrations, models
+
+STATS_PK = 1
+
+
+def fill_stats(apps, schema_editor):
+    DashboardStatsModel = apps.get_model('dashboard', 'DashboardStatsModel')
+    first = DashboardStatsModel.objects.order_by('id').first()
+    if first is not None and first.pk != STATS_PK:
+        DashboardStatsModel.objects.filter(pk=first.pk).update(id=STATS_PK)
+    DashboardStatsModel.objects.exclude(pk=STATS_PK).delete()
+    about_us = apps.get_model('dashboard', 'AboutUsModel').objects.order_by('id').first()
+    DashboardStatsModel.objects.update_or_create(pk=STATS_PK, defaults={
+        'employees': apps.get_model('dashboard', 'TeamMemberModel').objects.count(),
+        'booked_events': apps.get_model('dashboard', 'BookModel').objects.count(),
+        'unanswered_messages': apps.get_model('web', 'ContactUsModel').objects.filter(answered=False).count(),
+        'annual_income': about_us.work_experience if about_us else 0,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_hot_query_indexes'),
+        ('web', '0003_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardstatsmodel',
+            name='annual_income',
+            field=models.IntegerField(default=0, verbose_name='annual_income'),
+        ),
+        migrations.AddField(
+            model_name='dashboardstatsmodel',
+            name='booked_events',
+            field=models.IntegerField(default=0, verbose_name='booked_events'),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
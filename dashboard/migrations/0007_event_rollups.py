@@ -0,0 +1,64 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:19
+
+from datetime import date, timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _bucket_starts(day):
+    return {
+        'day': day,
+        'week': day - timedelta(days=day.weekday()),
+        'month': day.replace(day=1),
+        'year': date(day.year, 1, 1),
+    }
+
+
+def build_rollups(apps, schema_editor):
+    BookModel = apps.get_model('dashboard', 'BookModel')
+    EventRollupModel = apps.get_model('dashboard', 'EventRollupModel')
+    rollups = {}
+    events = BookModel.objects.values('category_id', 'book_date', 'price', 'number_of_guests').iterator()
+    for event in events:
+        for period, start in _bucket_starts(event['book_date']).items():
+            key = (period, start, event['category_id'])
+            if key not in rollups:
+                rollups[key] = EventRollupModel(period=period, bucket_start=start, category_id=event['category_id'],
+                                                bookings=0, revenue=0, guests_total=0, guests_histogram={})
+            rollup = rollups[key]
+            rollup.bookings += 1
+            rollup.revenue += event['price']
+            rollup.guests_total += event['number_of_guests']
+            guests = str(event['number_of_guests'])
+            rollup.guests_histogram[guests] = rollup.guests_histogram.get(guests, 0) + 1
+    EventRollupModel.objects.bulk_create(rollups.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0006_materialized_dashboard_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventRollupModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month'), ('year', 'Year')], max_length=5, verbose_name='period')),
+                ('bucket_start', models.DateField(verbose_name='bucket_start')),
+                ('bookings', models.IntegerField(default=0, verbose_name='bookings')),
+                ('revenue', models.FloatField(default=0, verbose_name='revenue')),
+                ('guests_total', models.BigIntegerField(default=0, verbose_name='guests_total')),
+                ('guests_histogram', models.JSONField(default=dict, verbose_name='guests_histogram')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='dashboard.weddingcategorymodel')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'bucket_start', 'category'), name='event_rollup_bucket_uniq')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
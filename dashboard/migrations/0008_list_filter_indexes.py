@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0007_event_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookmodel',
+            index=models.Index(fields=['category', 'book_date', 'id'], name='book_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmodel',
+            index=models.Index(fields=['number_of_guests', 'id'], name='book_guests_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmodel',
+            index=models.Index(fields=['price', 'id'], name='book_price_id_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+import re
+
+from django.db import migrations
+
+# Frozen copy of dashboard.search as of this migration, so later changes to it don't change the migration
+TABLE = 'dashboard_search'
+# (app label, model, rowid code, title fields, body fields); the FTS rowid is object id * 4 + code
+DOCUMENTS = (
+    ('dashboard', 'BookModel', 1, ('booker_first_name', 'booker_last_name'), ('phone_number', 'additional_info')),
+    ('web', 'ContactUsModel', 2, ('first_name', 'last_name'), ('phone_number', 'message')),
+    ('dashboard', 'NewsModel', 3, ('title',), ('description',)),
+)
+CHUNK_SIZE = 2000
+
+
+def _phone_tokens(value):
+    digits = re.sub(r'\D', '', value or '')
+    return f'{digits} {digits[-9:]}' if len(digits) > 9 else digits
+
+
+def _document(values, code, title_fields, body_fields):
+    body = [_phone_tokens(values[field]) if field == 'phone_number' else values[field] or '' for field in body_fields]
+    return values['id'] * 4 + code, ' '.join(values[field] or '' for field in title_fields), ' '.join(body)
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {TABLE} USING fts5("
+        f"title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    insert = f'INSERT INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)'
+    with schema_editor.connection.cursor() as cursor:
+        for app_label, model_name, code, title_fields, body_fields in DOCUMENTS:
+            model = apps.get_model(app_label, model_name)
+            rows = model.objects.values('id', *title_fields, *body_fields).iterator(chunk_size=CHUNK_SIZE)
+            batch = []
+            for values in rows:
+                batch.append(_document(values, code, title_fields, body_fields))
+                if len(batch) == CHUNK_SIZE:
+                    cursor.executemany(insert, batch)
+                    batch = []
+            cursor.executemany(insert, batch)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0008_list_filter_indexes'),
+        ('web', '0004_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0009_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutusmodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+        migrations.AddField(
+            model_name='gallerymodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+        migrations.AddField(
+            model_name='homemodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+        migrations.AddField(
+            model_name='newsmodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+        migrations.AddField(
+            model_name='teammembermodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+        migrations.AddField(
+            model_name='websocialmedia',
+            name='social_media_image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='social_media_image_variants'),
+        ),
+        migrations.AddField(
+            model_name='weddingcategorymodel',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='image_variants'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qrcodemodel',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64, verbose_name='fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='qrcodemodel',
+            name='svg',
+            field=models.FileField(blank=True, null=True, upload_to='media/', verbose_name='svg'),
+        ),
+    ]
@@ -14,6 +14,7 @@ class HomeModel(BaseModel):
     title = models.CharField(_('title'), max_length=300)
     description = models.TextField(_('description'), )
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
 
     def __str__(self):
         return f'{self.title}'
@@ -31,6 +32,7 @@ class AboutUsModel(BaseModel):
     title = models.CharField(_('title'), max_length=300)
     description = models.TextField(_('description'), )
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
     highlight = models.ManyToManyField(AboutUsHighlightModel)
     main_description = models.TextField(_('main_description'), )
     successful_events = models.IntegerField(_('successful_events'), default=0)
@@ -44,6 +46,7 @@ class WeddingCategoryModel(BaseModel):
     name = models.CharField(_('name'), max_length=250)
     description = models.TextField(_('description'), )
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
 
     def __str__(self):
         return f"{self.name}"
@@ -52,6 +55,13 @@ class WeddingCategoryModel(BaseModel):
 class GalleryModel(BaseModel):
     category = models.ForeignKey(WeddingCategoryModel, on_delete=models.CASCADE)
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='gallery_created_id_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='gallery_category_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.category}"
@@ -92,6 +102,15 @@ class BookModel(BaseModel):
     price = models.FloatField(_('price'), default=0)
     additional_info = models.TextField(_('additional_info'), )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['book_date', 'id'], name='book_date_id_idx'),
+            models.Index(fields=['book_date', 'category'], name='book_date_category_idx'),
+            models.Index(fields=['category', 'book_date', 'id'], name='book_category_date_idx'),
+            models.Index(fields=['number_of_guests', 'id'], name='book_guests_id_idx'),
+            models.Index(fields=['price', 'id'], name='book_price_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.book_date}"
 
@@ -100,6 +119,12 @@ class NewsModel(BaseModel):
     title = models.CharField(_('title'), max_length=300)
     description = models.TextField(_('description'), )
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='news_created_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title}"
@@ -123,6 +148,7 @@ class TeamMemberModel(BaseModel):
     salary = models.FloatField(_('salary'), default=0)
     work_start_data = models.DateField(_('work_start_data'), )
     image = models.ImageField(_('image'), upload_to='media/', null=True)
+    image_variants = models.JSONField(_('image_variants'), default=dict, blank=True)
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -145,6 +171,7 @@ class WebSocialMedia(BaseModel):
     name = models.CharField(_('name'), max_length=250)
     url = models.URLField(_('url'), )
     social_media_image = models.ImageField(_('social_media_image'), upload_to='media/', null=True)
+    social_media_image_variants = models.JSONField(_('social_media_image_variants'), default=dict, blank=True)
 
     def __str__(self):
         return f"{self.id}"
@@ -153,12 +180,44 @@ class WebSocialMedia(BaseModel):
 class DashboardStatsModel(BaseModel):
     employees = models.IntegerField(_('employees'), default=0)
     events = models.IntegerField(_('events'), default=0)
+    booked_events = models.IntegerField(_('booked_events'), default=0)
     unanswered_messages = models.IntegerField(_('unanswered_messages'), default=0)
+    annual_income = models.IntegerField(_('annual_income'), default=0)
 
     def __str__(self):
         return f'{self.employees}'
 
 
+ROLLUP_PERIOD = (
+    ('day', 'Day'),
+    ('week', 'Week'),
+    ('month', 'Month'),
+    ('year', 'Year'),
+)
+
+
+class EventRollupModel(BaseModel):
+    period = models.CharField(_('period'), max_length=5, choices=ROLLUP_PERIOD)
+    bucket_start = models.DateField(_('bucket_start'), )
+    category = models.ForeignKey(WeddingCategoryModel, on_delete=models.CASCADE)
+    bookings = models.IntegerField(_('bookings'), default=0)
+    revenue = models.FloatField(_('revenue'), default=0)
+    guests_total = models.BigIntegerField(_('guests_total'), default=0)
+    # number_of_guests -> bookings, for percentiles
+    guests_histogram = models.JSONField(_('guests_histogram'), default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'bucket_start', 'category'], name='event_rollup_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.bucket_start}"
+
+
 class QrCodeModel(BaseModel):
     url = models.URLField(_('url'), )
     image = models.ImageField(_('image'), upload_to='media/', blank=True, null=True)
+    svg = models.FileField(_('svg'), upload_to='media/', blank=True, null=True)
+    # core.qr.fingerprint of the URL and render options the files were rendered from
+    fingerprint = models.CharField(_('fingerprint'), max_length=64, blank=True, db_index=True)
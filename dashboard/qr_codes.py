@@ -0,0 +1,87 @@
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils.timezone import now
+
+from core import bulk, qr
+from .models import QrCodeModel
+
+MAX_BATCH = 5000
+# SQLite allows 999 parameters per query
+LOOKUP_BATCH = 900
+
+
+def rendered_files(fingerprints):
+    """fingerprint -> (image name, svg name) of the codes already rendered with those fingerprints."""
+    fingerprints = list(fingerprints)
+    files = {}
+    for start in range(0, len(fingerprints), LOOKUP_BATCH):
+        rows = (QrCodeModel.objects.filter(fingerprint__in=fingerprints[start:start + LOOKUP_BATCH])
+                .exclude(image='').exclude(image__isnull=True).exclude(svg='').exclude(svg__isnull=True)
+                .values_list('fingerprint', 'image', 'svg'))
+        for fingerprint, image, svg in rows:
+            files.setdefault(fingerprint, (image, svg))
+    return files
+
+
+def store(instance, fingerprint, png, svg):
+    instance.image.save(f'qr_{fingerprint}.png', ContentFile(png), save=False)
+    instance.svg.save(f'qr_{fingerprint}.svg', ContentFile(svg), save=False)
+
+
+def assign(instance):
+    """
+    Point ``instance`` at the PNG and SVG of its URL if a code with the same fingerprint was
+    rendered before. Otherwise its files are cleared until render_pending renders them, and
+    False is returned. Doesn't save the instance.
+    """
+    fingerprint = qr.fingerprint(instance.url)
+    if instance.fingerprint == fingerprint and instance.image and instance.svg:
+        return True
+    instance.fingerprint = fingerprint
+    files = rendered_files([fingerprint]).get(fingerprint)
+    instance.image, instance.svg = files or (None, None)
+    return files is not None
+
+
+def render_pending(pk, fingerprint):
+    """Render the files of a code assign() left without; skipped if the code changed meanwhile."""
+    instance = QrCodeModel.objects.filter(pk=pk, fingerprint=fingerprint).first()
+    if instance is None or instance.image and instance.svg:
+        return False
+    files = rendered_files([fingerprint]).get(fingerprint)
+    if files is None:
+        png, svg = qr.render(instance.url)
+        store(instance, fingerprint, png, svg)
+        files = instance.image.name, instance.svg.name
+    previous = bulk.field_state(instance)
+    timestamp = now()
+    if not QrCodeModel.objects.filter(pk=pk, fingerprint=fingerprint).update(
+        image=files[0], svg=files[1], updated_at=timestamp,
+    ):
+        return False
+    instance.image, instance.svg, instance.updated_at = *files, timestamp
+    # Written with update(), so tell the bulk receivers about it
+    bulk.bulk_saved.send(sender=QrCodeModel, instances=[instance], created=False, previous=[previous])
+    return True
+
+
+def create_many(urls):
+    """
+    Create one code per URL in one transaction. Each distinct fingerprint is rendered once,
+    in the process pool for large batches, and codes rendered before are reused.
+    """
+    fingerprints = {url: qr.fingerprint(url) for url in urls}
+    files = rendered_files(set(fingerprints.values()))
+    missing = [url for url, fingerprint in fingerprints.items() if fingerprint not in files]
+    for url, png, svg in qr.render_many(missing):
+        instance = QrCodeModel()
+        store(instance, fingerprints[url], png, svg)
+        files[fingerprints[url]] = (instance.image.name, instance.svg.name)
+    instances = [
+        QrCodeModel(url=url, fingerprint=fingerprints[url], image=files[fingerprints[url]][0],
+                    svg=files[fingerprints[url]][1])
+        for url in urls
+    ]
+    with transaction.atomic():
+        bulk.create_instances(QrCodeModel, instances)
+    return instances
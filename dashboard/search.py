@@ -0,0 +1,109 @@
+import re
+
+from django.db import connection
+
+from web.models import ContactUsModel
+from .models import BookModel, NewsModel
+
+TABLE = 'dashboard_search'
+# Weights of the title and body columns in bm25
+RANK_WEIGHTS = (10.0, 1.0)
+
+# kind -> (code, model, title fields, body fields). The FTS rowid is object id * 4 + code, so a
+# document can be replaced or deleted by rowid without a lookup table.
+DOCUMENTS = {
+    'event': (1, BookModel, ('booker_first_name', 'booker_last_name'), ('phone_number', 'additional_info')),
+    'message': (2, ContactUsModel, ('first_name', 'last_name'), ('phone_number', 'message')),
+    'news': (3, NewsModel, ('title',), ('description',)),
+}
+KINDS = {code: kind for kind, (code, *_) in DOCUMENTS.items()}
+MODEL_KINDS = {model: kind for kind, (_, model, *_) in DOCUMENTS.items()}
+
+
+def is_supported():
+    return connection.vendor == 'sqlite'
+
+
+def _phone_tokens(value):
+    # '+998 90 123-45-67' should be found by 998901234567 as well as by the local 901234567
+    digits = re.sub(r'\D', '', value or '')
+    return f'{digits} {digits[-9:]}' if len(digits) > 9 else digits
+
+
+def document(kind, values):
+    """(rowid, title, body) for a dict of field values."""
+    code, _, title_fields, body_fields = DOCUMENTS[kind]
+    body = [_phone_tokens(values[field]) if field == 'phone_number' else values[field] or '' for field in body_fields]
+    return values['id'] * 4 + code, ' '.join(values[field] or '' for field in title_fields), ' '.join(body)
+
+
+def index(instance):
+    index_many([instance])
+
+
+def index_many(instances):
+    if not is_supported() or not instances:
+        return
+    kind = MODEL_KINDS[type(instances[0])]
+    _, _, title_fields, body_fields = DOCUMENTS[kind]
+    documents = [
+        document(kind, {field: getattr(instance, field) for field in ('id', *title_fields, *body_fields)})
+        for instance in instances
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT OR REPLACE INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)', documents)
+
+
+def remove(instance):
+    remove_many([instance])
+
+
+def remove_many(instances):
+    if not is_supported() or not instances:
+        return
+    code = DOCUMENTS[MODEL_KINDS[type(instances[0])]][0]
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s',
+                           [[instance.pk * 4 + code] for instance in instances])
+
+
+def rebuild(chunk_size=2000):
+    """Re-index every document."""
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+        for kind, (_, model, title_fields, body_fields) in DOCUMENTS.items():
+            rows = model.objects.values('id', *title_fields, *body_fields).iterator(chunk_size=chunk_size)
+            batch = []
+            for values in rows:
+                batch.append(document(kind, values))
+                if len(batch) == chunk_size:
+                    cursor.executemany(f'INSERT INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)', batch)
+                    count += len(batch)
+                    batch = []
+            cursor.executemany(f'INSERT INTO {TABLE} (rowid, title, body) VALUES (%s, %s, %s)', batch)
+            count += len(batch)
+    return count
+
+
+def build_query(text):
+    """Every word of ``text`` as a quoted prefix term, so user input can't inject FTS syntax."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def search(text, kind=None, limit=20):
+    """[(kind, id, snippet)] ordered by bm25 rank, best first."""
+    query = build_query(text)
+    if not query:
+        return []
+    sql = (f"SELECT rowid, snippet({TABLE}, -1, '[', ']', '...', 12) FROM {TABLE} "
+           f"WHERE {TABLE} MATCH %s")
+    params = [query]
+    if kind is not None:
+        sql += ' AND rowid %% 4 = %s'
+        params.append(DOCUMENTS[kind][0])
+    sql += f' ORDER BY bm25({TABLE}, %s, %s) LIMIT %s'
+    params += [*RANK_WEIGHTS, limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(KINDS[rowid % 4], rowid // 4, snippet) for rowid, snippet in cursor.fetchall()]
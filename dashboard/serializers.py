@@ -1,7 +1,13 @@
-import qrcode
+from collections import Counter
+
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
 
+from core import bulk
+from core.serializers import EagerLoadingMixin, BulkSerializerMixin
+
+from . import qr_codes, tasks
 from .models import (
     TeamMemberModel,
     BookModel,
@@ -16,13 +22,14 @@ from .models import (
     AboutUsHighlightModel,
     PriceHighLightModel, QrCodeModel, PositionModel, NewsModel,
 )
+from jobs.models import JobModel
 from web.models import ContactUsModel
 import json
-from io import BytesIO
-from django.core.files.base import ContentFile
 
 
-class TeamMemberDashboardSerializer(serializers.ModelSerializer):
+class TeamMemberDashboardSerializer(EagerLoadingMixin, BulkSerializerMixin, serializers.ModelSerializer):
+    select_related = ('position',)
+
     class Meta:
         model = TeamMemberModel
         fields = ['id', 'first_name', 'last_name', 'position', 'from_working_hours', 'to_working_hours', 'salary_type', 'salary',
@@ -35,7 +42,9 @@ class TeamMemberDashboardSerializer(serializers.ModelSerializer):
         return data
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(EagerLoadingMixin, BulkSerializerMixin, serializers.ModelSerializer):
+    select_related = ('category',)
+
     class Meta:
         model = BookModel
         fields = ['id', 'book_date', 'category', 'booker_first_name', 'booker_last_name', 'phone_number',
@@ -59,21 +68,22 @@ class DashboardSpecialPositionSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class PriceHighlightDashboardSerializer(serializers.ModelSerializer):
+class PriceHighlightDashboardSerializer(BulkSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = PriceHighLightModel
         fields = ['id', 'description', 'price']
 
 
-class PriceDashboardSerializer(serializers.ModelSerializer):
+class PriceDashboardSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     highlight = serializers.SerializerMethodField(source='get_highlight')
+    prefetch_related = ('pricehighlightmodel_set',)
+
     class Meta:
         model = PriceModel
         fields = ['id', 'type', 'price', 'description', 'highlight']
 
     def get_highlight(self, data):
-        highlight = PriceHighLightModel.objects.filter(price=data)
-        return PriceHighlightDashboardSerializer(highlight, many=True).data
+        return PriceHighlightDashboardSerializer(data.pricehighlightmodel_set.all(), many=True).data
 
 
 class CreatePriceDashboardSerializer(serializers.ModelSerializer):
@@ -82,6 +92,51 @@ class CreatePriceDashboardSerializer(serializers.ModelSerializer):
         fields = ['id', 'type', 'price', 'description']
 
 
+class PriceWithHighlightsSerializer(CreatePriceDashboardSerializer):
+    """Writes a price together with its highlight descriptions in one transaction."""
+    highlights = serializers.ListField(child=serializers.CharField(), required=False, write_only=True)
+
+    class Meta(CreatePriceDashboardSerializer.Meta):
+        fields = CreatePriceDashboardSerializer.Meta.fields + ['highlights']
+
+    def create(self, validated_data):
+        highlights = validated_data.pop('highlights', [])
+        with transaction.atomic():
+            price = super().create(validated_data)
+            bulk.create_instances(PriceHighLightModel, [
+                PriceHighLightModel(price=price, description=description) for description in highlights
+            ])
+        return price
+
+    def update(self, instance, validated_data):
+        highlights = validated_data.pop('highlights', None)
+        with transaction.atomic():
+            price = super().update(instance, validated_data)
+            if highlights is not None:
+                self.sync_highlights(price, highlights)
+        return price
+
+    @staticmethod
+    def sync_highlights(price, descriptions):
+        # Keep highlights whose description is still listed, delete the others and create the missing ones
+        wanted = Counter(descriptions)
+        stale = []
+        for highlight in price.pricehighlightmodel_set.order_by('id'):
+            if wanted[highlight.description] > 0:
+                wanted[highlight.description] -= 1
+            else:
+                stale.append(highlight)
+        missing = []
+        for description in descriptions:
+            if wanted[description] > 0:
+                wanted[description] -= 1
+                missing.append(PriceHighLightModel(price=price, description=description))
+        if stale:
+            bulk.delete_instances(PriceHighLightModel, stale)
+        if missing:
+            bulk.create_instances(PriceHighLightModel, missing)
+
+
 class AboutUsHighlightDashboardSerializer(serializers.ModelSerializer):
     class Meta:
         model = AboutUsHighlightModel
@@ -121,25 +176,15 @@ class WebSettingsSerializer(serializers.ModelSerializer):
 
 
 class DashboardStatsSerializer(serializers.ModelSerializer):
-    annual_income = serializers.SerializerMethodField(source='get_annual_income')
     class Meta:
         model = DashboardStatsModel
         fields = ['id', 'employees', 'events', 'annual_income', 'unanswered_messages']
 
     def to_representation(self, instance):
-        employees = TeamMemberModel.objects.all().count()
-        events = BookModel.objects.all().count()
-        messages = ContactUsModel.objects.filter(answered=False).count()
         data = super().to_representation(instance)
-        data['employees'] = employees
-        data['events'] = instance.events + events
-        data['unanswered_messages'] = messages
+        data['events'] = instance.events + instance.booked_events
         return data
 
-    def get_annual_income(self, data):
-        work_experience = AboutUsModel.objects.all().first()
-        return work_experience.work_experience
-
 
 class UnansweredMessagesSerializer(serializers.ModelSerializer):
     class Meta:
@@ -153,8 +198,10 @@ class CategoryImageSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'image']
 
 
-class UpcomingEventsSerializer(serializers.ModelSerializer):
+class UpcomingEventsSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     category = serializers.SerializerMethodField()
+    select_related = ('category',)
+
     class Meta:
         model = BookModel
         fields = ['id', 'category', 'book_date', 'booker_first_name', 'booker_last_name', 'number_of_guests']
@@ -173,47 +220,51 @@ class PriceTypeSerializer(serializers.ModelSerializer):
 class QrCodeSerializer(serializers.ModelSerializer):
     class Meta:
         model = QrCodeModel
-        fields = ['id', 'url', 'image']
+        fields = ['id', 'url', 'image', 'svg']
 
 
 class QrCodeCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = QrCodeModel
-        fields = ['id', 'url', 'image']
+        fields = ['id', 'url', 'image', 'svg']
+        read_only_fields = ['image', 'svg']
 
     def create(self, validated_data):
-        url = validated_data.get("url")
-        qr = qrcode.QRCode(version=1, box_size=10, border=4)
-        qr.add_data(url)
-        qr.make(fit=True)
-
-        img = qr.make_image(fill="black", back_color="white")
-
-        buffer = BytesIO()
-        img.save(buffer)
-        buffer.seek(0)
-
         instance = QrCodeModel(**validated_data)
-
-        filename = f"qr_{instance.id or 'temp'}.png"
-        instance.image.save(filename, ContentFile(buffer.read()), save=False)
-
-        buffer.close()
+        rendered = qr_codes.assign(instance)
         instance.save()
+        if not rendered:
+            tasks.enqueue_qr_code(instance)
         return instance
 
 
 class QrCodeUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = QrCodeModel
-        fields = ['id', 'url', 'image']
+        fields = ['id', 'url', 'image', 'svg']
+        read_only_fields = ['image', 'svg']
 
     def update(self, instance, validated_data):
         instance.url = validated_data.get("url", instance.url)
+        # A changed URL gets the code already rendered for it, or a new one from the queue
+        rendered = qr_codes.assign(instance)
         instance.save()
+        if not rendered:
+            tasks.enqueue_qr_code(instance)
         return instance
 
 
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobModel
+        fields = ['id', 'queue', 'task', 'kwargs', 'status', 'attempts', 'max_attempts', 'run_at', 'started_at',
+                  'finished_at', 'result', 'error', 'created_at']
+
+
+class QrCodeBatchSerializer(serializers.Serializer):
+    urls = serializers.ListField(child=serializers.URLField(), allow_empty=False, max_length=qr_codes.MAX_BATCH)
+
+
 class DashboardNewsSerializer(serializers.ModelSerializer):
     class Meta:
         model = NewsModel
@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core import images
+from core.bulk import bulk_saved, bulk_deleted, in_bulk_operation
+from web.models import ContactUsModel
+from . import analytics, media_gc, search, stats, tasks
+from .images import IMAGE_FIELDS
+from .models import TeamMemberModel, BookModel, AboutUsModel
+
+COUNTED_MODELS = {
+    TeamMemberModel: 'employees',
+    BookModel: 'booked_events',
+}
+# Models whose replaced or deleted files are released after commit with MEDIA_GC_ON_COMMIT
+FILE_MODELS = {model for model, _ in media_gc.file_fields()}
+
+
+@receiver(post_save)
+def count_created(sender, created, **kwargs):
+    if created and sender in COUNTED_MODELS:
+        stats.add(COUNTED_MODELS[sender], 1)
+
+
+@receiver(post_delete)
+def count_deleted(sender, **kwargs):
+    if sender in COUNTED_MODELS and not in_bulk_operation(sender):
+        stats.add(COUNTED_MODELS[sender], -1)
+
+
+@receiver(bulk_saved)
+def count_bulk_created(sender, instances, created, **kwargs):
+    if created and sender in COUNTED_MODELS:
+        stats.add(COUNTED_MODELS[sender], len(instances))
+
+
+@receiver(bulk_deleted)
+def count_bulk_deleted(sender, instances, **kwargs):
+    if sender in COUNTED_MODELS:
+        stats.add(COUNTED_MODELS[sender], -len(instances))
+
+
+@receiver(pre_save, sender=ContactUsModel)
+def remember_previous_answered(sender, instance, **kwargs):
+    instance._previous_answered = None
+    if instance.pk:
+        instance._previous_answered = sender.objects.filter(pk=instance.pk).values_list('answered', flat=True).first()
+
+
+@receiver(post_save, sender=ContactUsModel)
+def count_unanswered_messages(sender, instance, **kwargs):
+    was_unanswered = getattr(instance, '_previous_answered', None) is False
+    stats.add('unanswered_messages', int(not instance.answered) - int(was_unanswered))
+
+
+@receiver(post_delete, sender=ContactUsModel)
+def uncount_unanswered_message(sender, instance, **kwargs):
+    if not instance.answered and not in_bulk_operation(sender):
+        stats.add('unanswered_messages', -1)
+
+
+@receiver(post_save, sender=AboutUsModel)
+@receiver(post_delete, sender=AboutUsModel)
+def refresh_annual_income(sender, **kwargs):
+    stats.refresh_annual_income()
+
+
+@receiver(pre_save, sender=BookModel)
+def remember_previous_event(sender, instance, **kwargs):
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = sender.objects.filter(pk=instance.pk).values(*analytics.ROLLUP_FIELDS).first()
+
+
+@receiver(post_save, sender=BookModel)
+def update_event_rollups(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_state', None)
+    analytics.update_rollups(old=[previous] if previous else [], new=[analytics.event_state(instance)])
+
+
+@receiver(post_delete, sender=BookModel)
+def remove_event_from_rollups(sender, instance, **kwargs):
+    if not in_bulk_operation(sender):
+        analytics.update_rollups(old=[analytics.event_state(instance)])
+
+
+@receiver(bulk_saved, sender=BookModel)
+def update_event_rollups_bulk(sender, instances, previous, **kwargs):
+    old = [{field: state[field] for field in analytics.ROLLUP_FIELDS} for state in previous or ()]
+    analytics.update_rollups(old=old, new=[analytics.event_state(instance) for instance in instances])
+
+
+@receiver(bulk_deleted, sender=BookModel)
+def remove_events_from_rollups(sender, instances, **kwargs):
+    analytics.update_rollups(old=[analytics.event_state(instance) for instance in instances])
+
+
+@receiver(post_save)
+def index_search_document(sender, instance, **kwargs):
+    if sender in search.MODEL_KINDS:
+        search.index(instance)
+
+
+@receiver(post_delete)
+def remove_search_document(sender, instance, **kwargs):
+    if sender in search.MODEL_KINDS and not in_bulk_operation(sender):
+        search.remove(instance)
+
+
+@receiver(bulk_saved)
+def index_search_documents(sender, instances, **kwargs):
+    if sender in search.MODEL_KINDS:
+        search.index_many(instances)
+
+
+@receiver(bulk_deleted)
+def remove_search_documents(sender, instances, **kwargs):
+    if sender in search.MODEL_KINDS:
+        search.remove_many(instances)
+
+
+@receiver(post_save)
+def generate_image_variants(sender, instance, **kwargs):
+    if sender in IMAGE_FIELDS and not images.is_current(instance, IMAGE_FIELDS[sender]):
+        tasks.enqueue_image_variants(sender, instance.pk, IMAGE_FIELDS[sender])
+
+
+def _release_files(files):
+    if files and settings.MEDIA_GC_ON_COMMIT:
+        transaction.on_commit(lambda: media_gc.release(files))
+
+
+@receiver(pre_save)
+def remember_previous_files(sender, instance, **kwargs):
+    if settings.MEDIA_GC_ON_COMMIT and instance.pk and sender in FILE_MODELS:
+        previous = sender.objects.filter(pk=instance.pk).first()
+        instance._previous_files = media_gc.instance_files(previous) if previous else {}
+
+
+@receiver(post_save)
+def release_replaced_files(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_files', None)
+    if previous:
+        current = media_gc.instance_files(instance)
+        _release_files({name: variants for name, variants in previous.items() if name not in current})
+
+
+@receiver(post_delete)
+def release_deleted_files(sender, instance, **kwargs):
+    if settings.MEDIA_GC_ON_COMMIT and sender in FILE_MODELS and not in_bulk_operation(sender):
+        _release_files(media_gc.instance_files(instance))
+
+
+@receiver(bulk_deleted)
+def release_bulk_deleted_files(sender, instances, **kwargs):
+    if settings.MEDIA_GC_ON_COMMIT and sender in FILE_MODELS:
+        _release_files({name: variants for instance in instances
+                        for name, variants in media_gc.instance_files(instance).items()})
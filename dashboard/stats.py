@@ -0,0 +1,41 @@
+from django.db.models import F, Subquery
+from django.db.models.functions import Coalesce
+
+from web.models import ContactUsModel
+from .models import DashboardStatsModel, TeamMemberModel, BookModel, AboutUsModel
+
+# The materialized stats live in a single row
+STATS_PK = 1
+
+
+def _first_work_experience():
+    return AboutUsModel.objects.order_by('id').values('work_experience')[:1]
+
+
+def reconcile():
+    """Rebuild the stats row from the source tables."""
+    stats, _ = DashboardStatsModel.objects.update_or_create(pk=STATS_PK, defaults={
+        'employees': TeamMemberModel.objects.count(),
+        'booked_events': BookModel.objects.count(),
+        'unanswered_messages': ContactUsModel.objects.filter(answered=False).count(),
+        'annual_income': _first_work_experience().values_list('work_experience', flat=True).first() or 0,
+    })
+    return stats
+
+
+def get_stats():
+    return DashboardStatsModel.objects.filter(pk=STATS_PK).first() or reconcile()
+
+
+def _update(**values):
+    if not DashboardStatsModel.objects.filter(pk=STATS_PK).update(**values):
+        reconcile()
+
+
+def add(field, delta):
+    if delta:
+        _update(**{field: F(field) + delta})
+
+
+def refresh_annual_income():
+    _update(annual_income=Coalesce(Subquery(_first_work_experience()), 0))
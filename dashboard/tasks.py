@@ -0,0 +1,47 @@
+from django.apps import apps
+
+from core import images
+from jobs.queue import task
+from . import analytics, qr_codes, stats
+
+
+@task(queue='images')
+def generate_image_variants(model, pk, field_name, force=False):
+    """``model`` is the model's label, e.g. 'dashboard.NewsModel'."""
+    return images.update(apps.get_model(model), pk, field_name, force=force)
+
+
+def enqueue_image_variants(model, pk, field_name, force=False):
+    """Queue the variants of a row's image; one queued job per image."""
+    label = model._meta.label
+    return generate_image_variants.enqueue(key=f'image-variants:{label}:{pk}:{field_name}',
+                                           model=label, pk=pk, field_name=field_name, force=force)
+
+
+@task(queue='qr')
+def render_qr_code(pk, fingerprint):
+    return qr_codes.render_pending(pk, fingerprint)
+
+
+def enqueue_qr_code(instance):
+    """Queue the rendering of a code qr_codes.assign() couldn't reuse files for."""
+    return render_qr_code.enqueue(key=f'qr-code:{instance.pk}:{instance.fingerprint}',
+                                  pk=instance.pk, fingerprint=instance.fingerprint)
+
+
+@task(queue='qr')
+def create_qr_codes(urls):
+    """Returns the ids of the created codes, in the order of ``urls``."""
+    return [instance.pk for instance in qr_codes.create_many(urls)]
+
+
+@task(queue='stats')
+def reconcile_stats():
+    row = stats.reconcile()
+    return {'employees': row.employees, 'booked_events': row.booked_events,
+            'unanswered_messages': row.unanswered_messages}
+
+
+@task(queue='stats')
+def rebuild_event_rollups():
+    return analytics.rebuild()
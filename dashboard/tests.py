@@ -1,3 +1,815 @@
-from django.test import TestCase
+import csv
+import hashlib
+import os
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from PIL import Image
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.core.management import CommandError, call_command
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.authentication import CachedJWTAuthentication, get_cache as get_auth_cache
+from authentication.blacklist import access_token_blacklist
+from authentication.models import User
+from core import bulk, qr
+from jobs.models import JobModel
+from web.models import ContactUsModel
+from .models import (
+    AboutUsModel,
+    DashboardStatsModel,
+    EventRollupModel,
+    PriceModel,
+    PriceHighLightModel,
+    WeddingCategoryModel,
+    BookModel,
+    NewsModel,
+    PositionModel,
+    QrCodeModel,
+    TeamMemberModel,
+)
+
+
+class DashboardTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='admin', password='Admin12345')
+        access_token = RefreshToken.for_user(user).access_token
+        access_token['role'] = 'admin'
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
+        # Warm up the auth caches so query counts only cover the view
+        cache.clear()
+        get_auth_cache().clear()
+        CachedJWTAuthentication().get_user(access_token)
+
+    def count_queries(self, url):
+        access_token_blacklist.refresh(force=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+
+class PricesTest(DashboardTestCase):
+    def create_prices(self, count):
+        prices = PriceModel.objects.bulk_create(
+            PriceModel(type=f'type {i}', price=i, description='description') for i in range(count)
+        )
+        PriceHighLightModel.objects.bulk_create(
+            PriceHighLightModel(price=price, description=f'highlight {n}') for price in prices for n in range(2)
+        )
+
+    def test_get_all_prices_query_count_does_not_depend_on_number_of_prices(self):
+        self.create_prices(3)
+        small_count, data = self.count_queries(reverse('get_all_prices'))
+        self.assertEqual(len(data), 3)
+        self.assertEqual([len(price['highlight']) for price in data], [2, 2, 2])
+        self.create_prices(2997)
+        large_count, data = self.count_queries(reverse('get_all_prices'))
+        self.assertEqual(len(data), 3000)
+        self.assertEqual(small_count, large_count)
+
+    def test_get_price_by_id_includes_highlights(self):
+        self.create_prices(1)
+        price = PriceModel.objects.get()
+        _, data = self.count_queries(reverse('get_price_by_id', kwargs={'pk': price.id}))
+        self.assertEqual(data['highlight'], [
+            {'id': highlight.id, 'description': highlight.description, 'price': price.id}
+            for highlight in PriceHighLightModel.objects.order_by('id')
+        ])
+
+    def post_price(self, highlights):
+        access_token_blacklist.refresh(force=True)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('create_price'), {
+                'type': 'Gold', 'price': 100, 'description': 'description', 'highlights': highlights,
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return len(queries), response.json()
+
+    def test_create_price_query_count_does_not_depend_on_number_of_highlights(self):
+        small_count, data = self.post_price(['a', 'b'])
+        self.assertEqual([highlight['description'] for highlight in data['highlight']], ['a', 'b'])
+        large_count, data = self.post_price([f'highlight {n}' for n in range(50)])
+        self.assertEqual(len(data['highlight']), 50)
+        self.assertEqual(small_count, large_count)
+
+    def test_invalid_price_creates_no_highlights(self):
+        response = self.client.post(reverse('create_price'), {
+            'type': 'Gold', 'price': 'not a number', 'description': 'description', 'highlights': ['a'],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PriceModel.objects.exists())
+        self.assertFalse(PriceHighLightModel.objects.exists())
+
+    def test_update_price_replaces_highlights_keeping_unchanged_ones(self):
+        _, data = self.post_price(['a', 'b', 'b'])
+        kept = {highlight['description']: highlight['id'] for highlight in data['highlight'][:2]}
+        response = self.client.patch(reverse('update_price', kwargs={'pk': data['id']}), {
+            'price': 200, 'highlights': ['b', 'c', 'a'],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['price'], 200)
+        highlights = {highlight['description']: highlight['id'] for highlight in data['highlight']}
+        self.assertEqual(set(highlights), {'a', 'b', 'c'})
+        self.assertEqual(highlights['a'], kept['a'])
+        self.assertEqual(highlights['b'], kept['b'])
+        self.assertEqual(PriceHighLightModel.objects.count(), 3)
+
+    def test_update_price_without_highlights_leaves_them_alone(self):
+        _, data = self.post_price(['a', 'b'])
+        response = self.client.patch(reverse('update_price', kwargs={'pk': data['id']}), {'type': 'Silver'},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['type'], 'Silver')
+        self.assertEqual(len(response.json()['highlight']), 2)
+
+
+class RelatedQueryCountTest(DashboardTestCase):
+    def create_rows(self, count):
+        categories = WeddingCategoryModel.objects.bulk_create(
+            WeddingCategoryModel(name=f'category {i}', description='description') for i in range(count)
+        )
+        BookModel.objects.bulk_create(
+            BookModel(category=category, book_date=now().date() + timedelta(days=i), booker_first_name='first',
+                      booker_last_name='last', phone_number='+998901234567', additional_info='info')
+            for i, category in enumerate(categories)
+        )
+        positions = PositionModel.objects.bulk_create(PositionModel(name=f'position {i}') for i in range(count))
+        TeamMemberModel.objects.bulk_create(
+            TeamMemberModel(first_name='first', last_name='last', middle_name='middle', position=position,
+                            from_working_hours='09:00', to_working_hours='18:00', work_start_data='2024-01-01')
+            for position in positions
+        )
+
+    def test_query_count_does_not_depend_on_number_of_rows(self):
+        urls = [reverse('get_all_our_team'), reverse('get_all_events'), reverse('get_upcoming_events')]
+        self.create_rows(2)
+        small_counts = [self.count_queries(url)[0] for url in urls]
+        self.create_rows(50)
+        self.assertEqual([self.count_queries(url)[0] for url in urls], small_counts)
+
+
+class WebStatsTest(DashboardTestCase):
+    def create_event(self, category):
+        return BookModel.objects.create(category=category, book_date=now().date(), booker_first_name='first',
+                                        booker_last_name='last', phone_number='+998901234567', additional_info='info')
+
+    def test_stats_follow_inserts_updates_and_deletes(self):
+        category = WeddingCategoryModel.objects.create(name='category', description='description')
+        events = [self.create_event(category) for _ in range(3)]
+        events[0].delete()
+        position = PositionModel.objects.create(name='position')
+        TeamMemberModel.objects.create(first_name='first', last_name='last', middle_name='middle', position=position,
+                                       from_working_hours='09:00', to_working_hours='18:00',
+                                       work_start_data='2024-01-01')
+        messages = [ContactUsModel.objects.create(first_name='first', last_name='last', phone_number='+998901234567',
+                                                  message='message') for _ in range(3)]
+        messages[0].answered = True
+        messages[0].save()
+        messages[1].delete()
+        AboutUsModel.objects.create(title='title', description='description', main_description='main',
+                                    work_experience=7)
+        DashboardStatsModel.objects.filter(pk=1).update(events=10)
+
+        count, data = self.count_queries(reverse('get_web_stats'))
+        self.assertEqual(count, 1)
+        self.assertEqual(data, {'id': 1, 'employees': 1, 'events': 12, 'annual_income': 7, 'unanswered_messages': 1})
+
+    def test_reconcile_stats_rebuilds_counters(self):
+        category = WeddingCategoryModel.objects.create(name='category', description='description')
+        self.create_event(category)
+        DashboardStatsModel.objects.filter(pk=1).update(booked_events=100, employees=5)
+        call_command('reconcile_stats', stdout=StringIO())
+        stats = DashboardStatsModel.objects.get(pk=1)
+        self.assertEqual((stats.booked_events, stats.employees), (1, 0))
+
+
+class EventAnalyticsTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hall = WeddingCategoryModel.objects.create(name='hall', description='description')
+        self.garden = WeddingCategoryModel.objects.create(name='garden', description='description')
+
+    def create_event(self, category, book_date, price, guests):
+        return BookModel.objects.create(category=category, book_date=book_date, price=price, number_of_guests=guests,
+                                        booker_first_name='first', booker_last_name='last',
+                                        phone_number='+998901234567', additional_info='info')
+
+    def rollups(self):
+        return sorted(EventRollupModel.objects.values_list(
+            'period', 'bucket_start', 'category_id', 'bookings', 'revenue', 'guests_total', 'guests_histogram'))
+
+    def test_rollups_follow_event_changes(self):
+        self.create_event(self.hall, date(2025, 1, 10), 100, 50)
+        self.create_event(self.hall, date(2025, 1, 20), 200, 150)
+        moved = self.create_event(self.hall, date(2025, 2, 1), 300, 100)
+        removed = self.create_event(self.garden, date(2025, 2, 3), 50, 20)
+        moved.book_date = date(2025, 1, 25)
+        moved.save()
+        removed.delete()
+
+        _, data = self.count_queries(reverse('get_event_analytics') + '?period=month&from=2025-01-15&to=2025-12-31')
+        self.assertEqual(data['results'], [{
+            'bucket_start': '2025-01-01', 'bookings': 3, 'revenue': 600.0, 'guests_mean': 100.0,
+            'guests_p50': 100, 'guests_p90': 150,
+            'categories': [{'id': self.hall.id, 'name': 'hall', 'bookings': 3, 'revenue': 600.0,
+                            'guests_mean': 100.0, 'guests_p50': 100, 'guests_p90': 150}],
+        }])
+        incremental = self.rollups()
+        call_command('rebuild_event_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_query_count_does_not_depend_on_range(self):
+        self.create_event(self.hall, date(2021, 3, 1), 100, 50)
+        self.create_event(self.garden, date(2025, 3, 1), 100, 50)
+        week, _ = self.count_queries(reverse('get_event_analytics') + '?period=week&from=2025-03-01&to=2025-03-07')
+        years, data = self.count_queries(reverse('get_event_analytics') + '?period=week&from=2020-01-01&to=2025-12-31')
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(week, years)
+
+    def test_event_stats_reads_rollups(self):
+        self.create_event(self.hall, date(2024, 5, 1), 100, 50)
+        self.create_event(self.hall, date(2025, 5, 1), 100, 50)
+        self.create_event(self.garden, date(2025, 5, 2), 100, 50)
+        _, data = self.count_queries(reverse('get_event_stats'))
+        self.assertEqual(data, [{'category': 'hall', 'count': 2, 'percent': 66.7},
+                                {'category': 'garden', 'count': 1, 'percent': 33.3}])
+
+    def test_range_is_widened_to_whole_buckets(self):
+        self.create_event(self.hall, date(2025, 1, 10), 100, 50)
+        self.create_event(self.hall, date(2025, 2, 20), 200, 150)
+        _, data = self.count_queries(reverse('get_event_analytics') + '?period=month&from=2025-01-15&to=2025-02-03')
+        self.assertEqual((data['from'], data['to']), ('2025-01-01', '2025-02-28'))
+        self.assertEqual([bucket['bookings'] for bucket in data['results']], [1, 1])
+        _, data = self.count_queries(reverse('get_event_analytics') + '?period=week&to=9999-12-31')
+        self.assertEqual((data['from'], data['to']), (None, '9999-12-31'))
+
+    def test_invalid_period_is_rejected(self):
+        self.assertEqual(self.client.get(reverse('get_event_analytics') + '?period=decade').status_code, 400)
+
+
+class ListFilterTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hall = WeddingCategoryModel.objects.create(name='hall', description='description')
+        self.garden = WeddingCategoryModel.objects.create(name='garden', description='description')
+        for day, category, guests, name in [(1, self.hall, 50, 'Ali'), (3, self.garden, 120, 'Vali'),
+                                            (5, self.hall, 200, 'Alisher'), (20, self.hall, 80, 'Bobur')]:
+            BookModel.objects.create(category=category, book_date=date(2025, 6, day), number_of_guests=guests,
+                                     booker_first_name=name, booker_last_name='last', phone_number='+998901234567',
+                                     additional_info='info')
+
+    def get_names(self, query):
+        response = self.client.get(reverse('get_all_events') + query)
+        self.assertEqual(response.status_code, 200)
+        return [event['booker_first_name'] for event in response.json()['results']]
+
+    def test_filters_search_and_ordering(self):
+        self.assertEqual(self.get_names('?date_from=2025-06-01&date_to=2025-06-07'), ['Alisher', 'Vali', 'Ali'])
+        self.assertEqual(self.get_names(f'?category={self.hall.id}&guests_min=60'), ['Bobur', 'Alisher'])
+        self.assertEqual(self.get_names('?search=ali'), ['Alisher', 'Vali', 'Ali'])
+        self.assertEqual(self.get_names('?search=bob last'), ['Bobur'])
+        self.assertEqual(self.get_names('?ordering=number_of_guests'), ['Ali', 'Bobur', 'Vali', 'Alisher'])
+
+    def test_ordering_is_used_for_pagination(self):
+        response = self.client.get(reverse('get_all_events') + '?ordering=-number_of_guests&page_size=3').json()
+        self.assertEqual([event['booker_first_name'] for event in response['results']], ['Alisher', 'Vali', 'Bobur'])
+        self.assertEqual([event['booker_first_name'] for event in self.client.get(response['next']).json()['results']],
+                         ['Ali'])
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get(reverse('get_all_events') + '?ordering=additional_info').status_code, 400)
+        self.assertEqual(self.client.get(reverse('get_all_events') + '?guests_min=many').status_code, 400)
+        self.assertEqual(self.client.get(reverse('get_all_events') + '?ordering=--book_date').status_code, 400)
+        self.assertEqual(self.client.get(reverse('get_all_events') + '?category=99999999999999999999999').status_code,
+                         400)
+
+    def test_messages_answered_filter(self):
+        for answered in (True, False, False):
+            ContactUsModel.objects.create(first_name='first', last_name='last', phone_number='+998901234567',
+                                          message='message', answered=answered)
+        response = self.client.get(reverse('get_all_messages') + '?answered=false')
+        self.assertEqual([message['answered'] for message in response.json()['results']], [False, False])
+
+
+class ExportTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hall = WeddingCategoryModel.objects.create(name='hall', description='description')
+        for day, guests, name in [(1, 50, 'Ali'), (3, 120, '=cmd()'), (20, 80, 'Bobur')]:
+            BookModel.objects.create(category=self.hall, book_date=date(2025, 6, day), number_of_guests=guests,
+                                     booker_first_name=name, booker_last_name='<last & co>',
+                                     phone_number='+998901234567', price=1500.5, additional_info='info')
+
+    def export(self, query):
+        response = self.client.get(reverse('export_events') + query)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_export_is_filtered_and_ordered_like_the_list(self):
+        response, content = self.export('?date_to=2025-06-07&ordering=book_date')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows[0][:3], ['ID', 'Book date', 'Category'])
+        self.assertEqual([row[1:4] for row in rows[1:]], [['2025-06-01', 'hall', 'Ali'],
+                                                          ['2025-06-03', 'hall', "'=cmd()"]])
+        # Phone numbers aren't mistaken for formulas
+        self.assertEqual(rows[1][5], '+998901234567')
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        response, content = self.export('?file_type=xlsx&ordering=book_date')
+        self.assertTrue(response['Content-Disposition'].endswith('.xlsx"'))
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+        namespace = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+        rows = sheet.findall('s:sheetData/s:row', namespace)
+        self.assertEqual(len(rows), 4)
+        cells = rows[1].findall('s:c', namespace)
+        self.assertEqual(cells[4].find('s:is/s:t', namespace).text, '<last & co>')
+        self.assertEqual(cells[7].find('s:v', namespace).text, '1500.5')
+
+    def test_export_runs_in_constant_number_of_queries(self):
+        access_token_blacklist.refresh(force=True)
+        with CaptureQueriesContext(connection) as small:
+            self.export('')
+        BookModel.objects.bulk_create(
+            BookModel(category=self.hall, book_date=date(2025, 7, 1), booker_first_name='first',
+                      booker_last_name='last', phone_number='+998901234567', additional_info='info')
+            for _ in range(100)
+        )
+        access_token_blacklist.refresh(force=True)
+        with CaptureQueriesContext(connection) as large:
+            _, content = self.export('')
+        self.assertEqual(content.decode('utf-8-sig').count('\r\n'), 104)
+        self.assertEqual(len(small), len(large))
+
+    def test_messages_and_team_exports(self):
+        ContactUsModel.objects.create(first_name='first', last_name='last', phone_number='+998901234567',
+                                      message='message', answered=True)
+        response = self.client.get(reverse('export_messages') + '?answered=true')
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 2)
+        response = self.client.get(reverse('export_our_team') + '?file_type=xlsx')
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_file_type_is_rejected(self):
+        self.assertEqual(self.client.get(reverse('export_events') + '?file_type=pdf').status_code, 400)
+
+
+class ImportTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hall = WeddingCategoryModel.objects.create(name='Hall', description='description')
+        errors_root = tempfile.TemporaryDirectory()
+        self.addCleanup(errors_root.cleanup)
+        settings_override = override_settings(IMPORT_ERRORS_ROOT=errors_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, content, **headers):
+        upload = SimpleUploadedFile('events.csv', content.encode('utf-8-sig'), content_type='text/csv')
+        return self.client.post(reverse('import_events'), {'file': upload}, **headers)
+
+    def test_valid_rows_are_imported_and_rejected_rows_can_be_downloaded(self):
+        response = self.upload(
+            'book_date,category,booker_first_name,booker_last_name,phone_number,number_of_guests,price\n'
+            '2025-06-01,hall,Ali,Valiyev,+998 90 123 45 67,100,"1500,5"\n'
+            f'02.06.2025,{self.hall.id},Vali,Aliyev,+998901234567,,\n'
+            '2025-06-03,garden,Bobur,Aliyev,+998901234567,10,0\n'
+            '2025-06-04,hall,Olim,Aliyev,+998121234567,10,0\n'
+            'yesterday,hall,Aziz,Aliyev,+998901234567,10,0\n'
+            '2025-06-05,hall,Anvar,Aliyev,+998901234567,99999999999999999999999,0\n'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['created'], data['rejected']), (2, 4))
+        self.assertEqual(list(BookModel.objects.order_by('book_date').values_list(
+            'booker_first_name', 'phone_number', 'number_of_guests', 'price')),
+            [('Ali', '+998901234567', 100, 1500.5), ('Vali', '+998901234567', 0, 0)])
+        self.assertEqual(DashboardStatsModel.objects.get().booked_events, 2)
+        response = self.client.get(data['error_file'])
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual([row[:3] for row in rows[1:]], [['4', 'Unknown category: garden', '2025-06-03'],
+                                                         ['5', 'Telefon nomer kodi uzbek kodi emas', '2025-06-04'],
+                                                         ['6', 'Invalid date: yesterday', 'yesterday'],
+                                                         ['7', mock.ANY, '2025-06-05']])
+        self.assertTrue(rows[-1][1].startswith('number_of_guests must be at most'))
+
+    def test_export_can_be_imported_back(self):
+        BookModel.objects.create(category=self.hall, book_date=date(2025, 6, 1), booker_first_name='Ali',
+                                 booker_last_name='Valiyev', phone_number='+998901234567', number_of_guests=50,
+                                 price=100, additional_info='info')
+        content = b''.join(self.client.get(reverse('export_events')).streaming_content).decode('utf-8-sig')
+        data = self.upload(content).json()
+        self.assertEqual((data['created'], data['rejected'], data['error_file']), (1, 0, None))
+        self.assertEqual(BookModel.objects.filter(booker_first_name='Ali', additional_info='info').count(), 2)
+
+    def test_file_without_required_columns_is_rejected(self):
+        response = self.upload('book_date,category\n2025-06-01,hall\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Missing columns: booker_first_name, booker_last_name, phone_number')
+        self.assertEqual(self.client.get(reverse('import_events_errors', kwargs={'name': '..db.csv'})).status_code, 404)
+
+    @mock.patch('dashboard.imports.CHUNK_SIZE', 2)
+    def test_keyed_imports_are_all_or_nothing_and_replayed(self):
+        content = ('book_date,category,booker_first_name,booker_last_name,phone_number\n'
+                   + '2025-06-01,Hall,first,last,+998901234567\n' * 3)
+        create_instances = bulk.create_instances
+
+        def fail_second_chunk(model, instances):
+            if BookModel.objects.exists():
+                raise DatabaseError('disk I/O error')
+            return create_instances(model, instances)
+
+        self.client.raise_request_exception = False
+        with mock.patch('dashboard.imports.bulk.create_instances', side_effect=fail_second_chunk):
+            self.assertEqual(self.upload(content, HTTP_IDEMPOTENCY_KEY='import-1').status_code, 500)
+        # The first chunk was rolled back with the rest, so the retry starts from scratch
+        self.assertFalse(BookModel.objects.exists())
+        response = self.upload(content, HTTP_IDEMPOTENCY_KEY='import-1')
+        self.assertEqual(response.json()['created'], 3)
+        replay = self.upload(content, HTTP_IDEMPOTENCY_KEY='import-1')
+        self.assertEqual((replay.json(), replay['Idempotent-Replayed']), (response.json(), 'true'))
+        self.assertEqual(BookModel.objects.count(), 3)
+
+    def test_command_imports_in_chunks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'events.csv')
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['book_date', 'category', 'booker_first_name', 'booker_last_name', 'phone_number'])
+                writer.writerows(['2025-06-01', 'Hall', 'first', 'last', '+998901234567'] for _ in range(25))
+                writer.writerow(['2025-06-01', 'Hall', '', 'last', '+998901234567'])
+            out = StringIO()
+            call_command('import_events', path, '--chunk-size', '10', stdout=out)
+            self.assertIn('25 events imported, 1 rejected', out.getvalue())
+            with open(f'{path}.errors.csv', encoding='utf-8-sig') as errors_file:
+                self.assertEqual(list(csv.reader(errors_file))[1][:2], ['27', 'booker_first_name is required'])
+        self.assertEqual(BookModel.objects.count(), 25)
+        self.assertEqual(EventRollupModel.objects.get(period='year').bookings, 25)
+
+
+class SearchTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        category = WeddingCategoryModel.objects.create(name='hall', description='description')
+        self.event = BookModel.objects.create(category=category, book_date=date(2025, 6, 1),
+                                              booker_first_name='Alisher', booker_last_name='Karimov',
+                                              phone_number='+998901234567', additional_info='Live music')
+        self.message = ContactUsModel.objects.create(first_name='Dilnoza', last_name='Alimova',
+                                                     phone_number='+998935554433', message='Is June free?')
+        self.news = NewsModel.objects.create(title='Summer offers', description='Discounts for Alisher and friends')
+
+    def search(self, query):
+        response = self.client.get(reverse('search') + query)
+        self.assertEqual(response.status_code, 200)
+        return [(result['type'], result['id']) for result in response.json()['results']]
+
+    def test_prefix_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search('?q=ali'), [('event', self.event.id), ('message', self.message.id),
+                                                 ('news', self.news.id)])
+        self.assertEqual(self.search('?q=alish'), [('event', self.event.id), ('news', self.news.id)])
+        self.assertEqual(self.search('?q=ali&type=message'), [('message', self.message.id)])
+
+    def test_phone_numbers_match_with_and_without_country_code(self):
+        self.assertEqual(self.search('?q=%2B99890123'), [('event', self.event.id)])
+        self.assertEqual(self.search('?q=93555'), [('message', self.message.id)])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.event.booker_first_name = 'Sardor'
+        self.event.save()
+        self.message.delete()
+        self.assertEqual(self.search('?q=ali'), [('news', self.news.id)])
+        self.assertEqual(self.search('?q=sardor'), [('event', self.event.id)])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('?q=ali'), [('news', self.news.id)])
+
+    def test_search_syntax_in_input_is_ignored(self):
+        self.assertEqual(self.search('?q=alisher" OR'), [])
+        self.assertEqual(self.search('?q=(alisher*'), [('event', self.event.id), ('news', self.news.id)])
+
+
+class BulkWriteTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        self.hall = WeddingCategoryModel.objects.create(name='hall', description='description')
+        self.garden = WeddingCategoryModel.objects.create(name='garden', description='description')
+
+    def events(self, count, category):
+        return [
+            {'book_date': str(date(2025, 1, 1) + timedelta(days=i)), 'category': category.id,
+             'booker_first_name': f'booker {i}', 'booker_last_name': 'last', 'phone_number': '+998901234567',
+             'number_of_guests': 100 + i, 'price': 1000}
+            for i in range(count)
+        ]
+
+    def send(self, name, payload, method='post'):
+        return getattr(self.client, method)(reverse(name), data=payload, content_type='application/json')
+
+    def rollups(self):
+        return sorted(EventRollupModel.objects.values_list('period', 'bucket_start', 'category_id', 'bookings',
+                                                          'revenue', 'guests_total', 'guests_histogram'))
+
+    def test_bulk_create_runs_a_bounded_number_of_queries(self):
+        self.send('bulk_create_events', self.events(2, self.hall))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.send('bulk_create_events', self.events(200, self.garden))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()), 200)
+        # SQLite's variable limit splits the inserts into a few statements
+        self.assertLess(len(queries), 20)
+        self.assertEqual(BookModel.objects.count(), 202)
+        self.assertEqual(DashboardStatsModel.objects.get(pk=1).booked_events, 202)
+        incremental = self.rollups()
+        call_command('rebuild_event_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_invalid_items_are_reported_and_nothing_is_written(self):
+        events = self.events(3, self.hall)
+        events[1]['category'] = 999
+        events[2]['number_of_guests'] = 'many'
+        response = self.send('bulk_create_events', events)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1, 2])
+        self.assertFalse(BookModel.objects.exists())
+
+    def test_bulk_update_and_delete_keep_derived_data_in_sync(self):
+        ids = [event['id'] for event in self.send('bulk_create_events', self.events(5, self.hall)).json()]
+        response = self.send('bulk_update_events', [
+            {'id': ids[0], 'category': self.garden.id, 'book_date': '2025-03-01'},
+            {'id': ids[1], 'number_of_guests': 7},
+        ], method='patch')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['category'], 'garden')
+        response = self.send('bulk_delete_events', {'ids': ids[2:]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BookModel.objects.count(), 2)
+        self.assertEqual(DashboardStatsModel.objects.get(pk=1).booked_events, 2)
+        search = self.client.get(reverse('search') + '?q=booker').json()['results']
+        self.assertEqual(sorted(result['id'] for result in search), ids[:2])
+        incremental = self.rollups()
+        call_command('rebuild_event_rollups', stdout=StringIO())
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_unknown_ids_are_rejected(self):
+        response = self.send('bulk_update_events', [{'id': 999, 'number_of_guests': 7}], method='patch')
+        self.assertEqual(response.json()['errors'], [{'index': 0, 'errors': {'id': ['Not found']}}])
+        self.assertEqual(self.send('bulk_delete_events', {'ids': [999]}).status_code, 400)
+
+    def test_bulk_create_price_highlights(self):
+        price = PriceModel.objects.create(type='type', price=1, description='description')
+        response = self.send('bulk_create_price_highlights',
+                             [{'price': price.id, 'description': f'highlight {i}'} for i in range(3)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(price.pricehighlightmodel_set.count(), 3)
+
+
+def run_jobs():
+    call_command('run_jobs', '--burst', '--concurrency', '0', stdout=StringIO())
+
+
+def png(color):
+    output = BytesIO()
+    Image.new('RGB', (4, 4), color).save(output, 'PNG')
+    return output.getvalue()
+
+
+class ContentAddressedStorageTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_category(self, name, content):
+        response = self.client.post(reverse('create_category'), data={
+            'name': name, 'description': 'description',
+            'image': SimpleUploadedFile('Photo.PNG', content, content_type='image/png'),
+        })
+        self.assertEqual(response.status_code, 201)
+        return WeddingCategoryModel.objects.get(name=name).image.name
+
+    def stored_files(self):
+        return sorted(os.path.relpath(os.path.join(directory, name), settings.MEDIA_ROOT)
+                      for directory, _, names in os.walk(settings.MEDIA_ROOT) for name in names)
+
+    def test_identical_uploads_are_stored_once_under_their_hash(self):
+        red = png('red')
+        digest = hashlib.sha256(red).hexdigest()
+        first = self.create_category('first', red)
+        self.assertEqual(first, f'media/{digest[:2]}/{digest[2:4]}/{digest}.png')
+        self.assertEqual(self.create_category('second', red), first)
+        blue = self.create_category('third', png('blue'))
+        self.assertNotEqual(blue, first)
+        self.assertEqual(self.stored_files(), sorted([first, blue]))
+        response = self.client.get(f'/media/{first}')
+        self.assertEqual(b''.join(response.streaming_content), red)
+        self.assertEqual(response['Cache-Control'], f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable')
+
+    def test_large_uploads_are_hashed_while_streamed_to_disk(self):
+        content = png('green') + os.urandom(4096)
+        with override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024):
+            name = self.create_category('large', content)
+        self.assertIn(hashlib.sha256(content).hexdigest(), name)
+        with open(os.path.join(settings.MEDIA_ROOT, name), 'rb') as file:
+            self.assertEqual(file.read(), content)
+        self.assertEqual(self.stored_files(), [name])
+
+    def test_existing_files_are_moved_to_content_addressed_names(self):
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, 'media'))
+        for name in ('ice4.png', 'ice4_EdlSaqB.png'):
+            with open(os.path.join(settings.MEDIA_ROOT, 'media', name), 'wb') as file:
+                file.write(png('white'))
+        first = WeddingCategoryModel.objects.create(
+            name='first', description='description', image='media/ice4.png',
+            image_variants={'source': 'media/ice4.png', 'variants': []},
+        )
+        second = WeddingCategoryModel.objects.create(name='second', description='description',
+                                                     image='media/ice4_EdlSaqB.png')
+        updated_at = first.updated_at
+        out = StringIO()
+        call_command('content_address_media', '--dry-run', stdout=out)
+        self.assertIn('2 files would be renamed', out.getvalue())
+        call_command('content_address_media', stdout=out)
+        self.assertIn('2 files renamed, 0 missing', out.getvalue())
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(first.image_variants['source'], first.image.name)
+        self.assertGreater(first.updated_at, updated_at)
+        self.assertEqual(len(self.stored_files()), 3)
+
+
+class MediaGarbageTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, IMAGE_VARIANT_WIDTHS=(2,))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create_category(self, name, color):
+        category = WeddingCategoryModel.objects.create(
+            name=name, description='description',
+            image=SimpleUploadedFile('photo.png', png(color), content_type='image/png'),
+        )
+        run_jobs()
+        category.refresh_from_db()
+        return category
+
+    def write(self, name, age=2 * 24 * 60 * 60):
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(b'orphan')
+        self.age(name, age)
+
+    def age(self, name, seconds=2 * 24 * 60 * 60):
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        past = os.stat(path).st_mtime - seconds
+        os.utime(path, (past, past))
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(settings.MEDIA_ROOT, name))
+
+    def test_unreferenced_files_past_the_grace_period_are_removed(self):
+        category = self.create_category('hall', 'red')
+        kept = [category.image.name, f'{category.image.name}.gz',
+                *(variant['name'] for variant in category.image_variants['variants'])]
+        for name in kept:
+            if not self.exists(name):
+                self.write(name)
+            self.age(name)
+        self.write('media/ab/cd/old.png')
+        self.write('media/variants/old_320w.webp')
+        self.write('media/recent.png', age=0)
+        self.write('outside.png')
+        out = StringIO()
+        call_command('collect_media_garbage', '--dry-run', stdout=out)
+        self.assertIn('2 unreferenced files (0.0 MB) would be removed', out.getvalue())
+        self.assertTrue(self.exists('media/ab/cd/old.png'))
+        call_command('collect_media_garbage', '--verbosity', '2', stdout=out)
+        self.assertIn('media/ab/cd/old.png\n', out.getvalue())
+        self.assertIn('2 unreferenced files (0.0 MB) removed', out.getvalue())
+        self.assertFalse(self.exists('media/ab'))
+        self.assertFalse(self.exists('media/variants/old_320w.webp'))
+        self.assertTrue(all(self.exists(name) for name in [*kept, 'media/recent.png', 'outside.png']))
+
+    @override_settings(MEDIA_GC_ON_COMMIT=True)
+    def test_files_dropped_by_rows_are_released_after_commit(self):
+        first = self.create_category('first', 'red')
+        second = self.create_category('second', 'red')
+        shared = first.image.name
+        variants = [variant['name'] for variant in first.image_variants['variants']]
+        for name in [shared, *variants]:
+            self.age(name)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_category', args=[first.id]))
+        # The second category holds the same bytes
+        self.assertTrue(self.exists(shared))
+        with self.captureOnCommitCallbacks(execute=True):
+            data = encode_multipart(BOUNDARY, {'image': SimpleUploadedFile('new.png', png('blue'))})
+            response = self.client.patch(reverse('update_category', args=[second.id]), data=data,
+                                         content_type=MULTIPART_CONTENT)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any(self.exists(name) for name in [shared, *variants]))
+        second.refresh_from_db()
+        self.age(second.image.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(reverse('delete_category', args=[second.id]))
+        self.assertFalse(self.exists(second.image.name))
+
+
+class QrCodeTest(DashboardTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, QR_CODE_WORKERS=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def create(self, url):
+        response = self.client.post(reverse('create_qr_code'), data={'url': url}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        run_jobs()
+        return QrCodeModel.objects.get(pk=response.json()['id'])
+
+    def test_codes_are_rendered_once_per_url(self):
+        with mock.patch.object(qr, 'render', wraps=qr.render) as render:
+            first = self.create('https://example.com/invite/1')
+            second = self.create('https://example.com/invite/1')
+        self.assertEqual(render.call_count, 1)
+        # The second code reused the files in the request, without a job
+        self.assertEqual(JobModel.objects.count(), 1)
+        self.assertEqual(first.fingerprint, qr.fingerprint('https://example.com/invite/1'))
+        self.assertEqual((second.image.name, second.svg.name), (first.image.name, first.svg.name))
+        with first.image.open('rb') as file, Image.open(file) as image:
+            self.assertEqual(image.format, 'PNG')
+        with first.svg.open('rb') as file:
+            self.assertIn(b'<svg', file.read())
+        data = self.client.get(reverse('get_qr_code_by_id', args=[first.id])).json()
+        self.assertTrue(data['svg'].endswith('.svg'))
+
+    def test_changing_the_url_renders_a_new_code(self):
+        code = self.create('https://example.com/invite/1')
+        image = code.image.name
+        response = self.client.patch(reverse('update_qr_code', args=[code.id]),
+                                     data={'url': 'https://example.com/invite/2'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json()['image'])
+        run_jobs()
+        code.refresh_from_db()
+        self.assertNotEqual(code.image.name, image)
+        self.assertEqual(code.fingerprint, qr.fingerprint('https://example.com/invite/2'))
+
+    def test_batch_create(self):
+        existing = self.create('https://example.com/invite/0')
+        urls = [f'https://example.com/invite/{i}' for i in range(4)] + ['https://example.com/invite/1']
+        response = self.client.post(reverse('batch_create_qr_codes'), data={'urls': urls},
+                                    content_type='application/json')
+        self.assertEqual((response.status_code, response.json()['status']), (202, 'queued'))
+        with override_settings(QR_CODE_WORKERS=2, QR_CODE_POOL_THRESHOLD=2):
+            run_jobs()
+        job = self.client.get(reverse('get_job_by_id', args=[response.json()['id']])).json()
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual([QrCodeModel.objects.get(pk=pk).url for pk in job['result']], urls)
+        codes = {code.url: code for code in QrCodeModel.objects.exclude(pk=existing.pk)}
+        self.assertEqual(len(codes), 4)
+        self.assertEqual(codes[existing.url].image.name, existing.image.name)
+        self.assertEqual(len({code.image.name for code in codes.values()}), 4)
+        response = self.client.post(reverse('batch_create_qr_codes'), data={'urls': ['not a url']},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class QueryPlansTest(TestCase):
+    def test_endpoint_queries_use_indexes(self):
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('dashboard get_all_events (by category)', out.getvalue())
+        self.assertIn('No unexpected full table scans', out.getvalue())
+
+    def test_full_table_scans_fail_the_check(self):
+        queries = [('scan', BookModel.objects.filter(booker_first_name='Ali'), False)]
+        with mock.patch('dashboard.management.commands.check_query_plans.endpoint_queries', return_value=queries):
+            with self.assertRaisesMessage(CommandError, 'Full table scans in: scan'):
+                call_command('check_query_plans', stdout=StringIO())
@@ -9,7 +9,8 @@ from .views import (
     MessagesViewSet,
     SocialMediasViewSet,
     WebSettingsViewSet, PriceHighlightViewSet, AboutUsHighlightViewSet, QRCodeViewSet, DashboardPositionViewSet,
-    DashboardNewsViewSet,
+    DashboardNewsViewSet, DashboardSearchViewSet, EventsBulkViewSet, TeamMembersBulkViewSet,
+    PriceHighlightsBulkViewSet, EventsImportViewSet, JobsViewSet,
 )
 
 urlpatterns = [
@@ -19,15 +20,23 @@ urlpatterns = [
     path('get_upcoming_events/', MainPageViewSet.as_view({'get': 'upcoming_events'}), name='get_upcoming_events'),
     path('get_web_stats/', MainPageViewSet.as_view({'get': 'get_web_stats'}), name='get_web_stats'),
     path('get_event_stats/', MainPageViewSet.as_view({'get': 'event_stats'}), name='get_event_stats'),
+    path('get_event_analytics/', MainPageViewSet.as_view({'get': 'event_analytics'}), name='get_event_analytics'),
+    path('get_web_cache_stats/', MainPageViewSet.as_view({'get': 'web_cache_stats'}), name='get_web_cache_stats'),
+    path('recompute_stats/', MainPageViewSet.as_view({'post': 'recompute_stats'}), name='recompute_stats'),
     # OurTeam
     path('get_our_team_by_id/<int:pk>/', OurTeamViewSet.as_view({'get': 'get_by_id'}), name='get_our_team_by_id'),
     path('get_all_our_team/', OurTeamViewSet.as_view({'get': 'get_all'}), name='get_all_our_team'),
+    path('export_our_team/', OurTeamViewSet.as_view({'get': 'export'}), name='export_our_team'),
     path('create_our_team/', OurTeamViewSet.as_view({'post': 'create'}), name='create_our_team'),
     path('update_our_team/<int:pk>/', OurTeamViewSet.as_view({'patch': 'update'}), name='update_our_team'),
     path('delete_our_team/<int:pk>/', OurTeamViewSet.as_view({'delete': 'delete'}), name='delete_our_team'),
     # Events
     path('get_event_by_id/<int:pk>/', EventsViewSet.as_view({'get': 'get_by_id'}), name='get_event_by_id'),
     path('get_all_events/', EventsViewSet.as_view({'get': 'get_all'}), name='get_all_events'),
+    path('export_events/', EventsViewSet.as_view({'get': 'export'}), name='export_events'),
+    path('import_events/', EventsImportViewSet.as_view({'post': 'create'}), name='import_events'),
+    path('import_events_errors/<str:name>/', EventsImportViewSet.as_view({'get': 'errors'}),
+         name='import_events_errors'),
     path('create_event/', EventsViewSet.as_view({'post': 'create'}), name='create_event'),
     path('update_event/<int:pk>/', EventsViewSet.as_view({'patch': 'update'}), name='update_event'),
     path('delete_event/<int:pk>/', EventsViewSet.as_view({'delete': 'delete'}), name='delete_event'),
@@ -52,6 +61,7 @@ urlpatterns = [
     # Messages
     path('get_message_by_id/<int:pk>/', MessagesViewSet.as_view({'get': 'get_by_id'}), name='get_message_by_id'),
     path('get_all_messages/', MessagesViewSet.as_view({'get': 'get_all'}), name='get_all_messages'),
+    path('export_messages/', MessagesViewSet.as_view({'get': 'export'}), name='export_messages'),
     path('update_message/<int:pk>/', MessagesViewSet.as_view({'patch': 'update'}), name='update_message'),
     path('delete_message/<int:pk>/', MessagesViewSet.as_view({'delete': 'delete'}), name='delete_message'),
     # SocialMedias
@@ -93,6 +103,7 @@ urlpatterns = [
     path('get_qr_code_by_id/<int:pk>/', QRCodeViewSet.as_view({'get': 'get_by_id'}), name='get_qr_code_by_id'),
     path('get_qr_code/', QRCodeViewSet.as_view({'get': 'get'}), name='get_qr_code'),
     path('create_qr_code/', QRCodeViewSet.as_view({'post': 'create'}), name='create_qr_code'),
+    path('batch_create_qr_codes/', QRCodeViewSet.as_view({'post': 'batch_create'}), name='batch_create_qr_codes'),
     path('update_qr_code/<int:pk>/', QRCodeViewSet.as_view({'patch': 'update'}), name='update_qr_code'),
     path('delete_qr_code/<int:pk>/', QRCodeViewSet.as_view({'delete': 'delete'}), name='delete_qr_code'),
     # position
@@ -108,4 +119,26 @@ urlpatterns = [
     path('create_news/', DashboardNewsViewSet.as_view({'post': 'create'}), name='get_all_positions'),
     path('update_news/<int:pk>/', DashboardNewsViewSet.as_view({'patch': 'update'}), name='get_all_positions'),
     path('delete_news/<int:pk>/', DashboardNewsViewSet.as_view({'delete': 'delete'}), name='get_all_positions'),
+    # bulk writes
+    path('bulk_create_events/', EventsBulkViewSet.as_view({'post': 'bulk_create'}), name='bulk_create_events'),
+    path('bulk_update_events/', EventsBulkViewSet.as_view({'patch': 'bulk_update'}), name='bulk_update_events'),
+    path('bulk_delete_events/', EventsBulkViewSet.as_view({'post': 'bulk_delete'}), name='bulk_delete_events'),
+    path('bulk_create_team_members/', TeamMembersBulkViewSet.as_view({'post': 'bulk_create'}),
+         name='bulk_create_team_members'),
+    path('bulk_update_team_members/', TeamMembersBulkViewSet.as_view({'patch': 'bulk_update'}),
+         name='bulk_update_team_members'),
+    path('bulk_delete_team_members/', TeamMembersBulkViewSet.as_view({'post': 'bulk_delete'}),
+         name='bulk_delete_team_members'),
+    path('bulk_create_price_highlights/', PriceHighlightsBulkViewSet.as_view({'post': 'bulk_create'}),
+         name='bulk_create_price_highlights'),
+    path('bulk_update_price_highlights/', PriceHighlightsBulkViewSet.as_view({'patch': 'bulk_update'}),
+         name='bulk_update_price_highlights'),
+    path('bulk_delete_price_highlights/', PriceHighlightsBulkViewSet.as_view({'post': 'bulk_delete'}),
+         name='bulk_delete_price_highlights'),
+    # background jobs
+    path('get_all_jobs/', JobsViewSet.as_view({'get': 'get_all'}), name='get_all_jobs'),
+    path('get_job_by_id/<int:pk>/', JobsViewSet.as_view({'get': 'get_by_id'}), name='get_job_by_id'),
+    path('retry_job/<int:pk>/', JobsViewSet.as_view({'post': 'retry'}), name='retry_job'),
+    # search
+    path('search/', DashboardSearchViewSet.as_view({'get': 'search'}), name='search'),
 ]
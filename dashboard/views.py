@@ -1,4 +1,10 @@
-from django.db.models import Count, F, Sum
+import csv
+import io
+from datetime import date
+
+from django.db.models import F, Sum
+from django.http import FileResponse
+from django.urls import reverse
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.viewsets import ViewSet
@@ -14,10 +20,9 @@ from .models import (
     AboutUsModel,
     WebSocialMedia,
     WebContactInfoModel,
-    DashboardStatsModel,
     AboutUsHighlightModel,
     PriceHighLightModel,
-    QrCodeModel, PositionModel, NewsModel
+    QrCodeModel, PositionModel, NewsModel, EventRollupModel
 )
 from .serializers import (
     TeamMemberDashboardSerializer,
@@ -36,14 +41,26 @@ from .serializers import (
     QrCodeCreateSerializer,
     QrCodeUpdateSerializer,
     QrCodeSerializer,
+    QrCodeBatchSerializer,
+    JobSerializer,
     UpdateMessageSerializer,
     DashboardSpecialPositionSerializer,
-    CreatePriceDashboardSerializer, DashboardNewsSerializer,
+    PriceWithHighlightsSerializer, DashboardNewsSerializer,
 )
+from idempotency.keys import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from jobs.models import FAILED, QUEUED, JobModel
 from web.models import ContactUsModel
+from web.cache import get_stats as get_web_cache_stats
+from core import bulk
+from core.pagination import KeysetPagination, PAGINATION_PARAMETERS
+from .filters import EVENT_FILTER, MESSAGE_FILTER, TEAM_FILTER, NEWS_FILTER, JOB_FILTER
+from .exports import EVENT_EXPORT, MESSAGE_EXPORT, TEAM_EXPORT
+from . import analytics, imports, qr_codes, stats, tasks
+from . import search as search_index
 from rest_framework.parsers import (
     MultiPartParser,
-    FormParser
+    FormParser,
+    JSONParser,
 )
 
 
@@ -57,9 +74,7 @@ class MainPageViewSet(ViewSet):
         tags=['dashboard']
     )
     def get_web_stats(self, request, *args, **kwargs):
-        web_stats = DashboardStatsModel.objects.all().first()
-        if web_stats is None:
-            web_stats = DashboardStatsModel.objects.create()
+        web_stats = stats.get_stats()
         serializer = DashboardStatsSerializer(web_stats, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -73,7 +88,8 @@ class MainPageViewSet(ViewSet):
     )
     def upcoming_events(self, request, *args, **kwargs):
         today = now().date()
-        events = BookModel.objects.filter(book_date__gte=today).order_by('book_date')[:3]
+        events = UpcomingEventsSerializer.setup_eager_loading(BookModel.objects.filter(book_date__gte=today))
+        events = events.order_by('book_date')[:3]
         serializer = UpcomingEventsSerializer(events, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -86,7 +102,7 @@ class MainPageViewSet(ViewSet):
         tags=['dashboard']
     )
     def unanswered_messages(self, request, *args, **kwargs):
-        messages = ContactUsModel.objects.filter(answered=False)
+        messages = ContactUsModel.objects.filter(answered=False).order_by('-created_at', '-id')
         serializer = UnansweredMessagesSerializer(messages, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -99,13 +115,14 @@ class MainPageViewSet(ViewSet):
         tags=['dashboard']
     )
     def event_stats(self, request, *args, **kwargs):
-        category_stats = (
-            BookModel.objects
+        category_stats = list(
+            EventRollupModel.objects
+            .filter(period='year')
             .values(category_name=F('category__name'))
-            .annotate(count=Count('id'))
+            .annotate(count=Sum('bookings'))
             .order_by('-count')
         )
-        total = category_stats.aggregate(total=Sum('count'))['total'] or 0
+        total = sum(stat['count'] for stat in category_stats)
         results = [
             {
                 'category': stat['category_name'],
@@ -116,6 +133,68 @@ class MainPageViewSet(ViewSet):
         ]
         return Response(data=results, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        operation_description="Bookings, revenue and guest statistics per day, week, month or year, "
+                              "with a per-category breakdown",
+        operation_summary="Get Event Analytics",
+        manual_parameters=[
+            openapi.Parameter('period', openapi.IN_QUERY, description="One of: day, week, month, year",
+                              type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('from', openapi.IN_QUERY,
+                              description="First day (YYYY-MM-DD), rounded down to the start of its period",
+                              type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('to', openapi.IN_QUERY,
+                              description="Last day (YYYY-MM-DD), rounded up to the end of its period",
+                              type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('category', openapi.IN_QUERY, description="Category id",
+                              type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={
+            200: 'ok',
+            400: 'Invalid parameters',
+        },
+        tags=['dashboard']
+    )
+    def event_analytics(self, request, *args, **kwargs):
+        period = request.query_params.get('period')
+        if period not in analytics.PERIODS:
+            return Response(data={'error': f"period must be one of: {', '.join(analytics.PERIODS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            start, end = (date.fromisoformat(request.query_params[name]) if request.query_params.get(name) else None
+                          for name in ('from', 'to'))
+            category = request.query_params.get('category')
+            category = int(category) if category else None
+        except ValueError:
+            return Response(data={'error': 'from and to must be YYYY-MM-DD dates and category an integer'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        results = analytics.get_analytics(period, start, end, category)
+        start, end = analytics.effective_range(period, start, end)
+        return Response(data={'period': period, 'from': start, 'to': end, 'results': results},
+                        status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Get hit/miss counters of the web response cache",
+        operation_summary="Get Web Cache Stats",
+        responses={
+            200: 'ok',
+        },
+        tags=['dashboard']
+    )
+    def web_cache_stats(self, request, *args, **kwargs):
+        return Response(data=get_web_cache_stats(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Queue a rebuild of the stats and the event analytics rollups from the source tables",
+        operation_summary="Recompute Stats",
+        responses={202: JobSerializer(many=True)},
+        tags=['dashboard']
+    )
+    def recompute_stats(self, request, *args, **kwargs):
+        jobs = [tasks.reconcile_stats.enqueue(key='reconcile-stats'),
+                tasks.rebuild_event_rollups.enqueue(key='rebuild-event-rollups')]
+        return Response(data=JobSerializer(jobs, many=True).data, status=status.HTTP_202_ACCEPTED)
+
 
 class OurTeamViewSet(ViewSet):
     parser_classes = [MultiPartParser, FormParser]
@@ -123,16 +202,30 @@ class OurTeamViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get all Team Members",
         operation_summary="Get all Team Members",
+        manual_parameters=TEAM_FILTER.parameters,
         responses={
             200: TeamMemberDashboardSerializer(),
         },
         tags=['dashboard']
     )
     def get_all(self, request, *args, **kwargs):
-        our_team = TeamMemberModel.objects.all()
+        our_team = TEAM_FILTER.filter_queryset(TeamMemberModel.objects.all(), request)
+        our_team = TeamMemberDashboardSerializer.setup_eager_loading(our_team)
+        our_team = our_team.order_by(*TEAM_FILTER.get_ordering(request))
         serializer = TeamMemberDashboardSerializer(our_team, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        operation_description="Export Team Members as CSV or XLSX, filtered and ordered like the list",
+        operation_summary="Export Team Members",
+        manual_parameters=TEAM_FILTER.parameters + TEAM_EXPORT.parameters,
+        responses={200: 'CSV or XLSX file'},
+        tags=['dashboard']
+    )
+    def export(self, request, *args, **kwargs):
+        our_team = TEAM_FILTER.filter_queryset(TeamMemberModel.objects.all(), request)
+        return TEAM_EXPORT.response(our_team.order_by(*TEAM_FILTER.get_ordering(request)), request)
+
     @swagger_auto_schema(
         operation_description="Get Team Member by Id",
         operation_summary="Get Team Member by Id",
@@ -142,7 +235,8 @@ class OurTeamViewSet(ViewSet):
         tags=['dashboard']
     )
     def get_by_id(self, request, *args, **kwargs):
-        team_member = TeamMemberModel.objects.filter(id=kwargs['pk']).first()
+        team_member = TeamMemberModel.objects.filter(id=kwargs['pk'])
+        team_member = TeamMemberDashboardSerializer.setup_eager_loading(team_member).first()
         if team_member is None:
             return Response(data={'error': 'Team member not found'}, status=status.HTTP_404_NOT_FOUND)
         serializer = TeamMemberDashboardSerializer(team_member, context={'request': request})
@@ -152,6 +246,7 @@ class OurTeamViewSet(ViewSet):
         operation_description="Create Team Member",
         operation_summary="Create Team Member",
         manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
             openapi.Parameter(
                 name='first_name',
                 in_=openapi.IN_FORM,
@@ -220,6 +315,7 @@ class OurTeamViewSet(ViewSet):
         responses={201: TeamMemberDashboardSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = TeamMemberDashboardSerializer(data=request.data)
         if not serializer.is_valid():
@@ -330,15 +426,29 @@ class EventsViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get all Events",
         operation_summary="Get all Events",
+        manual_parameters=EVENT_FILTER.parameters + PAGINATION_PARAMETERS,
         responses={
             200: EventSerializer(),
         },
         tags=['dashboard']
     )
     def get_all(self, request, *args, **kwargs):
-        our_team = BookModel.objects.all()
+        paginator = KeysetPagination(ordering=EVENT_FILTER.get_ordering(request))
+        events = EventSerializer.setup_eager_loading(EVENT_FILTER.filter_queryset(BookModel.objects.all(), request))
+        our_team = paginator.paginate_queryset(events, request)
         serializer = EventSerializer(our_team, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Export Events as CSV or XLSX, filtered and ordered like the list",
+        operation_summary="Export Events",
+        manual_parameters=EVENT_FILTER.parameters + EVENT_EXPORT.parameters,
+        responses={200: 'CSV or XLSX file'},
+        tags=['dashboard']
+    )
+    def export(self, request, *args, **kwargs):
+        events = EVENT_FILTER.filter_queryset(BookModel.objects.all(), request)
+        return EVENT_EXPORT.response(events.order_by(*EVENT_FILTER.get_ordering(request)), request)
 
     @swagger_auto_schema(
         operation_description="Get Event by Id",
@@ -349,7 +459,7 @@ class EventsViewSet(ViewSet):
         tags=['dashboard']
     )
     def get_by_id(self, request, *args, **kwargs):
-        event = BookModel.objects.filter(id=kwargs['pk']).first()
+        event = EventSerializer.setup_eager_loading(BookModel.objects.filter(id=kwargs['pk'])).first()
         if event is None:
             return Response(data={'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
         serializer = EventSerializer(event, context={'request': request})
@@ -358,6 +468,7 @@ class EventsViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Event",
         operation_summary="Create Event",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -375,6 +486,7 @@ class EventsViewSet(ViewSet):
         responses={201: EventSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = EventSerializer(data=request.data)
         if not serializer.is_valid():
@@ -463,6 +575,7 @@ class CategoriesViewSet(ViewSet):
         operation_description="Create Category",
         operation_summary="Create Category",
         manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
             openapi.Parameter(
                 name='name',
                 in_=openapi.IN_FORM,
@@ -488,6 +601,7 @@ class CategoriesViewSet(ViewSet):
         responses={201: CategorySerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = CategorySerializer(data=request.data)
         if not serializer.is_valid():
@@ -561,7 +675,7 @@ class PricesViewSet(ViewSet):
         tags=['dashboard']
     )
     def get_all(self, request, *args, **kwargs):
-        our_team = PriceModel.objects.all()
+        our_team = PriceDashboardSerializer.setup_eager_loading(PriceModel.objects.all())
         serializer = PriceDashboardSerializer(our_team, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -574,7 +688,7 @@ class PricesViewSet(ViewSet):
         tags=['dashboard']
     )
     def get_by_id(self, request, *args, **kwargs):
-        price = PriceModel.objects.filter(id=kwargs['pk']).first()
+        price = PriceDashboardSerializer.setup_eager_loading(PriceModel.objects.filter(id=kwargs['pk'])).first()
         if price is None:
             return Response(data={'error': 'Price not found'}, status=status.HTTP_404_NOT_FOUND)
         serializer = PriceDashboardSerializer(price, context={'request': request})
@@ -583,6 +697,7 @@ class PricesViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Price",
         operation_summary="Create Price",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -597,22 +712,20 @@ class PricesViewSet(ViewSet):
             },
             required=['type', 'description', 'price']
         ),
-        responses={201: CreatePriceDashboardSerializer()},
+        responses={201: PriceDashboardSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
-        serializer = CreatePriceDashboardSerializer(data=request.data)
+        serializer = PriceWithHighlightsSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         obj = serializer.save()
-        highlights = request.data.get('highlights', [])
-        for highlight in highlights:
-            PriceHighLightModel.objects.create(price=obj, description=highlight)
-        serializer = PriceDashboardSerializer(obj)
-        return Response(data=serializer.data, status=status.HTTP_201_CREATED)
+        return Response(data=self._price_data(obj.pk), status=status.HTTP_201_CREATED)
 
     @swagger_auto_schema(
-        operation_description="Update Price",
+        operation_description="Update Price. If highlights is given, the price's highlights are replaced by it: "
+                              "highlights with a listed description are kept, the others are deleted.",
         operation_summary="Update Price",
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
@@ -620,21 +733,31 @@ class PricesViewSet(ViewSet):
                 'type': openapi.Schema(type=openapi.TYPE_STRING, description='type'),
                 'description': openapi.Schema(type=openapi.TYPE_STRING, description='description'),
                 'price': openapi.Schema(type=openapi.TYPE_NUMBER, format='float', description='price'),
+                'highlights': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Items(type=openapi.TYPE_STRING),
+                    description='List of highlight descriptions'
+                ),
             },
             required=[]
         ),
-        responses={200: CreatePriceDashboardSerializer()},
+        responses={200: PriceDashboardSerializer()},
         tags=['dashboard'],
     )
     def update(self, request, *args, **kwargs):
         our_team = PriceModel.objects.filter(id=kwargs['pk']).first()
         if our_team is None:
             return Response(data={'error': 'Price not found'}, status=status.HTTP_404_NOT_FOUND)
-        serializer = CreatePriceDashboardSerializer(our_team, data=request.data, partial=True)
+        serializer = PriceWithHighlightsSerializer(our_team, data=request.data, partial=True)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         serializer.save()
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return Response(data=self._price_data(our_team.pk), status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _price_data(pk):
+        price = PriceDashboardSerializer.setup_eager_loading(PriceModel.objects.filter(pk=pk)).get()
+        return PriceDashboardSerializer(price).data
 
     @swagger_auto_schema(
         operation_description="Delete Price",
@@ -688,6 +811,7 @@ class AboutUsViewSet(ViewSet):
         operation_description="Create About Us",
         operation_summary="Create About Us",
         manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
             openapi.Parameter(
                 name='title',
                 in_=openapi.IN_FORM,
@@ -734,6 +858,7 @@ class AboutUsViewSet(ViewSet):
         responses={201: AboutUsDashboardSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = AboutUsDashboardSerializer(data=request.data)
         if not serializer.is_valid():
@@ -822,15 +947,29 @@ class MessagesViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get all Messages",
         operation_summary="Get all Messages",
+        manual_parameters=MESSAGE_FILTER.parameters + PAGINATION_PARAMETERS,
         responses={
             200: MessageSerializer(),
         },
         tags=['dashboard']
     )
     def get_all(self, request, *args, **kwargs):
-        our_team = ContactUsModel.objects.all()
+        paginator = KeysetPagination(ordering=MESSAGE_FILTER.get_ordering(request))
+        our_team = paginator.paginate_queryset(MESSAGE_FILTER.filter_queryset(ContactUsModel.objects.all(), request),
+                                               request)
         serializer = MessageSerializer(our_team, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Export Messages as CSV or XLSX, filtered and ordered like the list",
+        operation_summary="Export Messages",
+        manual_parameters=MESSAGE_FILTER.parameters + MESSAGE_EXPORT.parameters,
+        responses={200: 'CSV or XLSX file'},
+        tags=['dashboard']
+    )
+    def export(self, request, *args, **kwargs):
+        messages = MESSAGE_FILTER.filter_queryset(ContactUsModel.objects.all(), request)
+        return MESSAGE_EXPORT.response(messages.order_by(*MESSAGE_FILTER.get_ordering(request)), request)
 
     @swagger_auto_schema(
         operation_description="Get Message by Id",
@@ -922,6 +1061,7 @@ class SocialMediasViewSet(ViewSet):
         operation_description="Create Social Medias",
         operation_summary="Create Social Medias",
         manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
             openapi.Parameter(
                 name='name',
                 in_=openapi.IN_FORM,
@@ -947,6 +1087,7 @@ class SocialMediasViewSet(ViewSet):
         responses={201: SocialMediaSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = SocialMediaSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1042,6 +1183,7 @@ class WebSettingsViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Contact Info",
         operation_summary="Create Contact Info",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -1059,6 +1201,7 @@ class WebSettingsViewSet(ViewSet):
         responses={201: WebSettingsSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = WebSettingsSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1144,6 +1287,7 @@ class PriceHighlightViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Price Highlights",
         operation_summary="Create Price Highlights",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -1154,6 +1298,7 @@ class PriceHighlightViewSet(ViewSet):
         responses={201: PriceHighlightDashboardSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         price = PriceModel.objects.filter(id=kwargs['pk']).first()
         if price is None:
@@ -1237,6 +1382,7 @@ class AboutUsHighlightViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create About Us Highlights",
         operation_summary="Create About Us Highlights",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -1248,6 +1394,7 @@ class AboutUsHighlightViewSet(ViewSet):
         responses={201: AboutUsHighlightDashboardSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = AboutUsHighlightDashboardSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1328,6 +1475,7 @@ class QRCodeViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Qr Code",
         operation_summary="Create Qr Code",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -1338,6 +1486,7 @@ class QRCodeViewSet(ViewSet):
         responses={201: QrCodeCreateSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = QrCodeCreateSerializer(data=request.data, context={'request': request})
         if not serializer.is_valid():
@@ -1345,6 +1494,24 @@ class QRCodeViewSet(ViewSet):
         serializer.save()
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        operation_description=f"Queue the creation of one Qr Code per URL (at most {qr_codes.MAX_BATCH}), e.g. for "
+                              "invitations. Codes already rendered for a URL are reused, the rest are rendered in a "
+                              "process pool. The job's result is the ids of the codes, in the order of the URLs.",
+        operation_summary="Create Qr Codes in bulk",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        request_body=QrCodeBatchSerializer(),
+        responses={202: JobSerializer()},
+        tags=['dashboard'],
+    )
+    @idempotent
+    def batch_create(self, request, *args, **kwargs):
+        serializer = QrCodeBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        job = tasks.create_qr_codes.enqueue(urls=serializer.validated_data['urls'])
+        return Response(data=JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
     @swagger_auto_schema(
         operation_description="Update Qr Code",
         operation_summary="Update Qr Code",
@@ -1416,6 +1583,7 @@ class DashboardPositionViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Create Position",
         operation_summary="Create Position",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -1426,6 +1594,7 @@ class DashboardPositionViewSet(ViewSet):
         responses={201: DashboardSpecialPositionSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = DashboardSpecialPositionSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1478,13 +1647,15 @@ class DashboardNewsViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get all News",
         operation_summary="Get all News",
+        manual_parameters=NEWS_FILTER.parameters,
         responses={
             200: DashboardNewsSerializer(),
         },
         tags=['dashboard']
     )
     def get_all(self, request, *args, **kwargs):
-        news = NewsModel.objects.all()
+        news = NEWS_FILTER.filter_queryset(NewsModel.objects.all(), request)
+        news = news.order_by(*NEWS_FILTER.get_ordering(request))
         serializer = DashboardNewsSerializer(news, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -1507,6 +1678,7 @@ class DashboardNewsViewSet(ViewSet):
         operation_description="Create News",
         operation_summary="Create News",
         manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
             openapi.Parameter(
                 name='title',
                 in_=openapi.IN_FORM,
@@ -1532,6 +1704,7 @@ class DashboardNewsViewSet(ViewSet):
         responses={201: DashboardNewsSerializer()},
         tags=['dashboard'],
     )
+    @idempotent
     def create(self, request, *args, **kwargs):
         serializer = DashboardNewsSerializer(data=request.data)
         if not serializer.is_valid():
@@ -1592,3 +1765,264 @@ class DashboardNewsViewSet(ViewSet):
             return Response(data={'error': 'News not found'}, status=status.HTTP_404_NOT_FOUND)
         news.delete()
         return Response(data={'News successfully deleted'}, status=status.HTTP_200_OK)
+
+
+class DashboardSearchViewSet(ViewSet):
+    search_serializers = {
+        'event': EventSerializer,
+        'message': MessageSerializer,
+        'news': DashboardNewsSerializer,
+    }
+
+    @swagger_auto_schema(
+        operation_description="Ranked full-text search over events (booker names, phone, additional info), "
+                              "messages (names, phone, message) and news (title, description). "
+                              "Every word is matched as a prefix.",
+        operation_summary="Search",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="Search text", type=openapi.TYPE_STRING,
+                              required=True),
+            openapi.Parameter('type', openapi.IN_QUERY, description="One of: event, message, news",
+                              type=openapi.TYPE_STRING, required=False),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="Maximum number of results (default 20)",
+                              type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={
+            200: 'ok',
+            400: 'Invalid parameters',
+        },
+        tags=['dashboard']
+    )
+    def search(self, request, *args, **kwargs):
+        if not search_index.is_supported():
+            return Response(data={'error': 'Search is not available on this database'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        kind = request.query_params.get('type') or None
+        if kind is not None and kind not in search_index.DOCUMENTS:
+            return Response(data={'error': f"type must be one of: {', '.join(search_index.DOCUMENTS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response(data={'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        hits = search_index.search(request.query_params.get('q', ''), kind=kind, limit=limit)
+        objects = {}
+        for hit_kind, serializer_class in self.search_serializers.items():
+            ids = [object_id for found_kind, object_id, _ in hits if found_kind == hit_kind]
+            if ids:
+                queryset = search_index.DOCUMENTS[hit_kind][1].objects.filter(id__in=ids)
+                if hasattr(serializer_class, 'setup_eager_loading'):
+                    queryset = serializer_class.setup_eager_loading(queryset)
+                objects[hit_kind] = {
+                    item['id']: item
+                    for item in serializer_class(queryset, many=True, context={'request': request}).data
+                }
+        results = [
+            {'type': hit_kind, 'id': object_id, 'snippet': snippet, 'data': objects[hit_kind][object_id]}
+            for hit_kind, object_id, snippet in hits
+            if object_id in objects.get(hit_kind, {})
+        ]
+        return Response(data={'results': results}, status=status.HTTP_200_OK)
+
+
+BULK_ITEMS_SCHEMA = openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT))
+
+
+class BulkWriteViewSet(ViewSet):
+    """Bulk create, update and delete of ``serializer_class`` objects, one transaction per request."""
+    parser_classes = [JSONParser]
+    serializer_class = None
+
+    @swagger_auto_schema(
+        operation_description="Create a list of objects in one transaction. Nothing is created if an item is "
+                              "invalid; the errors are returned with the index of each invalid item.",
+        operation_summary="Bulk create",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        request_body=BULK_ITEMS_SCHEMA,
+        responses={
+            201: 'Created objects',
+            400: 'Errors per item',
+        },
+        tags=['dashboard'],
+    )
+    @idempotent
+    def bulk_create(self, request, *args, **kwargs):
+        message = bulk.check_items(request.data)
+        if message is not None:
+            return Response(data={'error': message}, status=status.HTTP_400_BAD_REQUEST)
+        instances, errors = bulk.bulk_create(self.serializer_class, request.data, context={'request': request})
+        if errors:
+            return Response(data={'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.serializer_class(instances, many=True, context={'request': request})
+        return Response(data=serializer.data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_description="Partially update a list of objects, each identified by its 'id', in one "
+                              "transaction. Nothing is updated if an item is invalid.",
+        operation_summary="Bulk update",
+        request_body=BULK_ITEMS_SCHEMA,
+        responses={
+            200: 'Updated objects',
+            400: 'Errors per item',
+        },
+        tags=['dashboard'],
+    )
+    def bulk_update(self, request, *args, **kwargs):
+        message = bulk.check_items(request.data)
+        if message is not None:
+            return Response(data={'error': message}, status=status.HTTP_400_BAD_REQUEST)
+        instances, errors = bulk.bulk_update(self.serializer_class, request.data, context={'request': request})
+        if errors:
+            return Response(data={'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = self.serializer_class(instances, many=True, context={'request': request})
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Delete the objects with the given ids in one transaction. Nothing is deleted "
+                              "if an id is not found.",
+        operation_summary="Bulk delete",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'ids': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+            },
+            required=['ids']
+        ),
+        responses={
+            200: 'Successfully deleted',
+            400: 'Errors per item',
+        },
+        tags=['dashboard'],
+    )
+    def bulk_delete(self, request, *args, **kwargs):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        message = bulk.check_items(ids)
+        if message is not None:
+            return Response(data={'error': message}, status=status.HTTP_400_BAD_REQUEST)
+        instances, errors = bulk.bulk_delete(self.serializer_class.Meta.model, ids)
+        if errors:
+            return Response(data={'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data={'message': f'{len(instances)} objects successfully deleted'}, status=status.HTTP_200_OK)
+
+
+class EventsBulkViewSet(BulkWriteViewSet):
+    serializer_class = EventSerializer
+
+
+class TeamMembersBulkViewSet(BulkWriteViewSet):
+    serializer_class = TeamMemberDashboardSerializer
+
+
+class PriceHighlightsBulkViewSet(BulkWriteViewSet):
+    serializer_class = PriceHighlightDashboardSerializer
+
+
+class EventsImportViewSet(ViewSet):
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Import Events from a CSV file with a header row. Columns: book_date, category "
+                              "(name or id), booker_first_name, booker_last_name, phone_number, number_of_guests, "
+                              "price, additional_info; the headers of the events export work too. Valid rows are "
+                              "imported, rejected ones are listed in error_file. Rows are committed in chunks, "
+                              "except with an Idempotency-Key: then the import is all or nothing, so a retry "
+                              "after a failure starts from a clean state.",
+        operation_summary="Import Events",
+        manual_parameters=[
+            IDEMPOTENCY_KEY_PARAMETER,
+            openapi.Parameter(
+                name='file',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_FILE,
+                required=True,
+                description="UTF-8 CSV file"
+            ),
+        ],
+        responses={200: 'created, rejected and error_file', 400: 'File is missing or can not be read'},
+        tags=['dashboard'],
+    )
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(data={'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        name, path = imports.new_error_file()
+        try:
+            with io.TextIOWrapper(upload, encoding='utf-8-sig', newline='') as lines, \
+                    open(path, 'w', encoding='utf-8-sig', newline='') as errors_file:
+                result = imports.EventImport(errors_file).run(lines)
+        except (UnicodeDecodeError, csv.Error, imports.ImportFileError) as error:
+            path.unlink(missing_ok=True)
+            message = 'File must be UTF-8 encoded' if isinstance(error, UnicodeDecodeError) else str(error)
+            return Response(data={'error': message}, status=status.HTTP_400_BAD_REQUEST)
+        if not result.rejected:
+            path.unlink()
+        return Response(data={
+            'created': result.created,
+            'rejected': result.rejected,
+            'error_file': reverse('import_events_errors', kwargs={'name': name}) if result.rejected else None,
+        }, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Download the rejected rows of an import",
+        operation_summary="Download Import Errors",
+        responses={200: 'CSV file', 404: 'Error file not found'},
+        tags=['dashboard'],
+    )
+    def errors(self, request, *args, **kwargs):
+        path = imports.error_file_path(kwargs['name'])
+        if path is None:
+            return Response(data={'error': 'Error file not found'}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'import_errors_{path.name}',
+                            content_type='text/csv; charset=utf-8')
+
+
+class JobsViewSet(ViewSet):
+    @swagger_auto_schema(
+        operation_description="Get background jobs, newest first",
+        operation_summary="Get all Jobs",
+        manual_parameters=JOB_FILTER.parameters + PAGINATION_PARAMETERS,
+        responses={
+            200: JobSerializer(many=True),
+        },
+        tags=['dashboard']
+    )
+    def get_all(self, request, *args, **kwargs):
+        paginator = KeysetPagination(ordering=JOB_FILTER.get_ordering(request))
+        jobs = paginator.paginate_queryset(JOB_FILTER.filter_queryset(JobModel.objects.all(), request), request)
+        serializer = JobSerializer(jobs, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Get Job by Id",
+        operation_summary="Get Job by Id",
+        responses={
+            200: JobSerializer(),
+        },
+        tags=['dashboard']
+    )
+    def get_by_id(self, request, *args, **kwargs):
+        job = JobModel.objects.filter(id=kwargs['pk']).first()
+        if job is None:
+            return Response(data={'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data=JobSerializer(job).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Queue a failed Job again, with its attempts reset",
+        operation_summary="Retry Job",
+        responses={
+            200: JobSerializer(),
+        },
+        tags=['dashboard']
+    )
+    def retry(self, request, *args, **kwargs):
+        job = JobModel.objects.filter(id=kwargs['pk']).first()
+        if job is None:
+            return Response(data={'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        retried = JobModel.objects.filter(pk=job.pk, status=FAILED).update(
+            status=QUEUED, attempts=0, run_at=now(), finished_at=None,
+        )
+        if not retried:
+            return Response(data={'error': 'Only failed jobs can be retried'}, status=status.HTTP_400_BAD_REQUEST)
+        job.refresh_from_db()
+        return Response(data=JobSerializer(job).data, status=status.HTTP_200_OK)
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils.timezone import now
+from drf_yasg import openapi
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKeyModel
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    HEADER, openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description='Unique key of the request, e.g. a UUID. Retrying with the same key and data replays the '
+                'first response instead of creating again.',
+)
+
+_last_purge = 0
+
+
+def _value(value):
+    if isinstance(value, UploadedFile):
+        # Uploads are hashed by the upload handlers as they arrive
+        return getattr(value, 'sha256', None) or f'{value.name}:{value.size}'
+    return value
+
+
+def request_fingerprint(request):
+    """SHA-256 of the parsed request data, with uploaded files standing for their content hash."""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = {key: [_value(value) for value in values] for key, values in data.lists()}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def purge_expired():
+    """Delete the expired keys, at most once per IDEMPOTENCY_PURGE_INTERVAL in each process."""
+    global _last_purge
+    if time.monotonic() - _last_purge >= settings.IDEMPOTENCY_PURGE_INTERVAL:
+        _last_purge = time.monotonic()
+        IdempotencyKeyModel.objects.filter(expires_at__lte=now()).delete()
+
+
+def _find(scope, key):
+    record = IdempotencyKeyModel.objects.filter(scope=scope, key=key).first()
+    if record is not None and record.expires_at <= now():
+        record.delete()
+        return None
+    return record
+
+
+def _claim(scope, key, fingerprint):
+    """Insert the key, or return None if a concurrent request with the same key inserted it first."""
+    try:
+        with transaction.atomic():
+            return IdempotencyKeyModel.objects.create(
+                scope=scope, key=key, fingerprint=fingerprint,
+                expires_at=now() + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+    except IntegrityError:
+        return None
+
+
+def _replay(record, fingerprint):
+    if record.fingerprint != fingerprint:
+        return Response(data={'error': f'{HEADER} was already used for a different request'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    if record.status_code is None:
+        return Response(data={'error': f'A request with this {HEADER} is in progress'},
+                        status=status.HTTP_409_CONFLICT)
+    return Response(data=record.response, status=record.status_code, headers={REPLAYED_HEADER: 'true'})
+
+
+def idempotent(view):
+    """
+    Let clients retry a create safely by sending an Idempotency-Key header. The first request
+    with a key runs the view in a transaction that also stores its response under the key;
+    repeats within IDEMPOTENCY_KEY_TTL get that response back without running the view again.
+    A server error rolls back the view's writes with the key, so the request can be retried.
+    Without the header the view just runs.
+    A view that commits in steps (e.g. import_events) becomes all or nothing with a key: its
+    transactions become savepoints of this one, so a failed request leaves nothing to replay.
+    """
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(data={'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        scope = f'{request.method}:{request.path}:{request.user.pk or ""}'
+        fingerprint = request_fingerprint(request)
+        purge_expired()
+        record = _find(scope, key)
+        if record is not None:
+            return _replay(record, fingerprint)
+        # The key is inserted first, so a concurrent retry waits on it rather than creating too
+        with transaction.atomic():
+            record = _claim(scope, key, fingerprint)
+            if record is None:
+                record = _find(scope, key)
+                if record is None:
+                    return Response(data={'error': f'A request with this {HEADER} is in progress'},
+                                    status=status.HTTP_409_CONFLICT)
+                return _replay(record, fingerprint)
+            response = view(self, request, *args, **kwargs)
+            if response.status_code >= 500:
+                # Rolls back the key with the view's writes, so a retry runs the view again
+                transaction.set_rollback(True)
+            else:
+                record.status_code, record.response = response.status_code, response.data
+                record.save(update_fields=['status_code', 'response'])
+        return response
+    return wrapper
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:23
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKeyModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=255, verbose_name='scope')),
+                ('key', models.CharField(max_length=255, verbose_name='key')),
+                ('fingerprint', models.CharField(max_length=64, verbose_name='fingerprint')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='status_code')),
+                ('response', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='response')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(verbose_name='expires_at')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='idempotency_expires_idx')],
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='idempotency_key_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class IdempotencyKeyModel(models.Model):
+    # Method, path and user of the request: a key is only replayed for the same endpoint and user
+    scope = models.CharField(_('scope'), max_length=255)
+    key = models.CharField(_('key'), max_length=255)
+    # SHA-256 of the request data, so a key reused for a different request is refused
+    fingerprint = models.CharField(_('fingerprint'), max_length=64)
+    status_code = models.PositiveSmallIntegerField(_('status_code'), null=True, blank=True)
+    response = models.JSONField(_('response'), null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(_('expires_at'))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}"
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from authentication.models import User
+from dashboard.models import PriceModel
+from web.models import ContactUsModel
+from .keys import idempotent
+from .models import IdempotencyKeyModel
+
+MESSAGE = {'first_name': 'Ali', 'last_name': 'Valiyev', 'phone_number': '+998901234567', 'message': 'Hello'}
+
+
+class FailingContactView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @idempotent
+    def post(self, request):
+        ContactUsModel.objects.create(**request.data)
+        return Response(data={'error': 'Unavailable'}, status=503)
+
+
+class IdempotencyKeyTest(TestCase):
+    def post(self, data, key='retry-1', url=None, **extra):
+        return self.client.post(url or reverse('contact_us'), data, content_type='application/json',
+                                HTTP_IDEMPOTENCY_KEY=key, **extra)
+
+    def test_retries_replay_the_first_response_without_writing(self):
+        first = self.post(MESSAGE)
+        self.assertEqual(first.status_code, 201)
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.post(MESSAGE)
+        self.assertEqual((retry.status_code, retry.json()), (201, first.json()))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(ContactUsModel.objects.count(), 1)
+        self.assertFalse([query for query in queries if query['sql'].startswith('INSERT')])
+
+    def test_requests_without_a_key_or_with_another_key_create(self):
+        self.client.post(reverse('contact_us'), MESSAGE, content_type='application/json')
+        self.client.post(reverse('contact_us'), MESSAGE, content_type='application/json')
+        self.post(MESSAGE, key='retry-2')
+        self.assertEqual(ContactUsModel.objects.count(), 3)
+
+    def test_a_key_reused_for_a_different_request_is_refused(self):
+        self.post(MESSAGE)
+        response = self.post({**MESSAGE, 'message': 'Another'})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(ContactUsModel.objects.count(), 1)
+
+    def test_a_server_error_rolls_back_the_view_and_the_key(self):
+        for _ in range(2):
+            request = APIRequestFactory().post('/contact', MESSAGE, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+            self.assertEqual(FailingContactView.as_view()(request).status_code, 503)
+            self.assertFalse(ContactUsModel.objects.exists())
+            self.assertFalse(IdempotencyKeyModel.objects.exists())
+
+    def test_expired_keys_are_forgotten(self):
+        self.post(MESSAGE)
+        IdempotencyKeyModel.objects.update(expires_at=now() - timedelta(seconds=1))
+        response = self.post(MESSAGE)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(ContactUsModel.objects.count(), 2)
+        self.assertEqual(IdempotencyKeyModel.objects.count(), 1)
+
+    def test_keys_are_scoped_to_the_user(self):
+        price = {'type': 'Gold', 'price': 100, 'description': 'description', 'highlights': ['a']}
+        for username in ('admin', 'manager'):
+            user = User.objects.create_user(username=username, password='Pass12345')
+            access_token = RefreshToken.for_user(user).access_token
+            access_token['role'] = 'admin'
+            for _ in range(2):
+                response = self.post(price, url=reverse('create_price'), HTTP_AUTHORIZATION=f'Bearer {access_token}')
+                self.assertEqual(response.status_code, 201)
+        self.assertEqual(PriceModel.objects.count(), 2)
@@ -0,0 +1,24 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued jobs until stopped (SIGTERM/SIGINT let the running jobs finish first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', nargs='+', help='Queues to take jobs from (default: all of JOBS_QUEUES)')
+        parser.add_argument('--concurrency', type=int, help='Jobs run at once (default: JOBS_CONCURRENCY)')
+        parser.add_argument('--processes', action='store_true', help='Run jobs in processes instead of threads')
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due')
+
+    def handle(self, *args, **options):
+        worker = Worker(queues=options['queues'], concurrency=options['concurrency'], processes=options['processes'])
+        if not options['burst']:
+            signal.signal(signal.SIGTERM, worker.stop)
+            signal.signal(signal.SIGINT, worker.stop)
+            self.stdout.write(f'Worker {worker.name} processing {", ".join(worker.queues)}')
+        processed = worker.run(burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} jobs processed'))
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('queue', models.CharField(default='default', max_length=50, verbose_name='queue')),
+                ('task', models.CharField(max_length=200, verbose_name='task')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='kwargs')),
+                ('key', models.CharField(blank=True, max_length=200, verbose_name='key')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20, verbose_name='status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='attempts')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='max_attempts')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='run_at')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='locked_by')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='locked_at')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='started_at')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='finished_at')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='result')),
+                ('error', models.TextField(blank=True, verbose_name='error')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'queue', 'run_at'], name='job_due_idx'), models.Index(fields=['status', 'locked_at'], name='job_locked_idx'), models.Index(fields=['key', 'status'], name='job_key_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobmodel',
+            index=models.Index(fields=['status', 'finished_at'], name='job_finished_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+from core.base import BaseModel
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+JOB_STATUS = (
+    (QUEUED, 'Queued'),
+    (RUNNING, 'Running'),
+    (SUCCEEDED, 'Succeeded'),
+    (FAILED, 'Failed'),
+)
+
+
+class JobModel(BaseModel):
+    queue = models.CharField(_('queue'), max_length=50, default='default')
+    # Dotted path of the jobs.queue.Task to run, and its keyword arguments
+    task = models.CharField(_('task'), max_length=200)
+    kwargs = models.JSONField(_('kwargs'), default=dict, blank=True)
+    # Jobs enqueued with a key aren't enqueued again while one with the same key is queued
+    key = models.CharField(_('key'), max_length=200, blank=True)
+    status = models.CharField(_('status'), max_length=20, choices=JOB_STATUS, default=QUEUED)
+    attempts = models.PositiveIntegerField(_('attempts'), default=0)
+    max_attempts = models.PositiveIntegerField(_('max_attempts'), default=5)
+    run_at = models.DateTimeField(_('run_at'), default=now)
+    # The worker running the job; it refreshes locked_at while the job runs
+    locked_by = models.CharField(_('locked_by'), max_length=100, blank=True)
+    locked_at = models.DateTimeField(_('locked_at'), null=True, blank=True)
+    started_at = models.DateTimeField(_('started_at'), null=True, blank=True)
+    finished_at = models.DateTimeField(_('finished_at'), null=True, blank=True)
+    result = models.JSONField(_('result'), null=True, blank=True)
+    error = models.TextField(_('error'), blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'queue', 'run_at'], name='job_due_idx'),
+            models.Index(fields=['status', 'locked_at'], name='job_locked_idx'),
+            models.Index(fields=['key', 'status'], name='job_key_idx'),
+            models.Index(fields=['status', 'finished_at'], name='job_finished_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} {self.status}"
@@ -0,0 +1,270 @@
+import functools
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, F, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+from .models import FAILED, QUEUED, RUNNING, SUCCEEDED, JobModel
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    """
+    A function the workers can run. Calling it runs it in place; ``enqueue(**kwargs)`` stores a
+    job that a worker runs with those (JSON-serializable) keyword arguments.
+    """
+
+    def __init__(self, func, queue, max_attempts):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.name = f'{func.__module__}.{func.__qualname__}'
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, key='', delay=0, **kwargs):
+        return enqueue(self.name, kwargs, queue=self.queue, max_attempts=self.max_attempts, key=key, delay=delay)
+
+
+def task(queue='default', max_attempts=None):
+    """Decorator making a module-level function a Task of ``queue``."""
+    def decorator(func):
+        return Task(func, queue, max_attempts)
+    return decorator
+
+
+def enqueue(task_name, kwargs=None, queue='default', max_attempts=None, key='', delay=0):
+    """
+    Store a job; it's visible to workers once the current transaction commits. With ``key``,
+    the job already queued under that key is returned instead of a new one.
+    """
+    if key:
+        job = JobModel.objects.filter(key=key, status=QUEUED).first()
+        if job is not None:
+            return job
+    return JobModel.objects.create(
+        queue=queue, task=task_name, kwargs=kwargs or {}, key=key,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=now() + timedelta(seconds=delay),
+    )
+
+
+def retry_delay(attempts):
+    """Seconds before the next attempt: exponential in the attempts made, capped, with jitter."""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** max(attempts - 1, 0), settings.JOBS_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.5, 1)
+
+
+def fail(job, error):
+    """Record a failed attempt of ``job``: it's retried after a backoff, or fails once out of attempts."""
+    # Only if the job is still ours: a worker that stalled past the lock timeout lost it
+    ours = JobModel.objects.filter(pk=job.pk, status=RUNNING, locked_by=job.locked_by)
+    logger.warning('Job %s (%s) failed, attempt %s of %s', job.pk, job.task, job.attempts, job.max_attempts)
+    if job.attempts >= job.max_attempts:
+        ours.update(status=FAILED, error=error, finished_at=now(), locked_by='', locked_at=None)
+    else:
+        ours.update(status=QUEUED, error=error, locked_by='', locked_at=None,
+                    run_at=now() + timedelta(seconds=retry_delay(job.attempts)))
+
+
+def run_job(pk, worker):
+    """Run a job ``worker`` claimed and record its result, or its error and next attempt. Returns True on success."""
+    job = JobModel.objects.get(pk=pk)
+    if job.status != RUNNING or job.locked_by != worker:
+        return False
+    try:
+        result = import_string(job.task)(**job.kwargs)
+    except Exception:
+        fail(job, traceback.format_exc())
+        return False
+    JobModel.objects.filter(pk=pk, status=RUNNING, locked_by=job.locked_by).update(
+        status=SUCCEEDED, result=result, error='', finished_at=now(), locked_by='', locked_at=None,
+    )
+    return True
+
+
+def _run_job_in_thread(pk, worker):
+    try:
+        return run_job(pk, worker)
+    finally:
+        connections.close_all()
+
+
+def recover_stale_jobs():
+    """
+    Requeue the jobs whose worker stopped refreshing their lock, e.g. because it was killed;
+    those out of attempts fail. Returns the number of jobs recovered.
+    """
+    timestamp = now()
+    cutoff = timestamp - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT)
+    stale = JobModel.objects.filter(status=RUNNING, locked_at__lt=cutoff)
+    error = 'The worker running the job stopped'
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=FAILED, error=error, finished_at=timestamp, locked_by='', locked_at=None,
+    )
+    return failed + stale.update(status=QUEUED, error=error, run_at=timestamp, locked_by='', locked_at=None)
+
+
+def claim(queue, count, worker):
+    """
+    Claim up to ``count`` due jobs of ``queue`` for ``worker``, within the queue's concurrency
+    limit across all workers. Each job is taken with one conditional UPDATE that also counts
+    the queue's running jobs, so two workers never claim the same job, nor together more than
+    the limit: the database runs the count and the write as one statement. Returns their pks,
+    oldest first.
+    """
+    limit = settings.JOBS_QUEUES.get(queue, 1)
+    running = JobModel.objects.filter(queue=queue, status=RUNNING)
+    count = min(count, limit - running.count())
+    if count <= 0:
+        return []
+    timestamp = now()
+    due = (JobModel.objects.filter(status=QUEUED, queue=queue, run_at__lte=timestamp)
+           .order_by('run_at', 'id').values_list('pk', flat=True)[:count])
+    running_count = Subquery(running.order_by().values('queue').annotate(count=Count('pk')).values('count'))
+    within_limit = JobModel.objects.alias(running=Coalesce(running_count, 0)).filter(running__lt=limit)
+    claimed = []
+    for pk in due:
+        if within_limit.filter(pk=pk, status=QUEUED).update(
+            status=RUNNING, locked_by=worker, locked_at=timestamp, started_at=timestamp, attempts=F('attempts') + 1,
+        ):
+            claimed.append(pk)
+    return claimed
+
+
+def purge_finished_jobs():
+    """
+    Delete the jobs that finished more than JOBS_RETENTION seconds ago (JOBS_FAILED_RETENTION
+    for failed ones, which can still be retried). Returns the number of jobs deleted.
+    """
+    timestamp = now()
+    deleted, _ = JobModel.objects.filter(
+        Q(status=SUCCEEDED, finished_at__lt=timestamp - timedelta(seconds=settings.JOBS_RETENTION))
+        | Q(status=FAILED, finished_at__lt=timestamp - timedelta(seconds=settings.JOBS_FAILED_RETENTION)),
+    ).delete()
+    return deleted
+
+
+class Worker:
+    """
+    Runs the jobs of ``queues`` (default: all of JOBS_QUEUES) in a thread pool, or a process
+    pool with ``processes``, of ``concurrency`` workers; 0 runs them one at a time in the
+    calling thread. Claimed jobs keep their lock fresh while they run, and stale locks of
+    crashed workers are recovered, so jobs survive worker restarts.
+    """
+
+    def __init__(self, queues=None, concurrency=None, processes=False, poll_interval=None):
+        self.queues = list(queues or settings.JOBS_QUEUES)
+        self.concurrency = settings.JOBS_CONCURRENCY if concurrency is None else concurrency
+        self.processes = processes
+        self.poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.name = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.running = {}
+        self.stopping = False
+        self.processed = 0
+        self._last_beat = 0
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def beat(self):
+        if time.monotonic() - self._last_beat >= settings.JOBS_LOCK_TIMEOUT / 4:
+            JobModel.objects.filter(pk__in=self.running.values(), locked_by=self.name).update(locked_at=now())
+            recover_stale_jobs()
+            purge_finished_jobs()
+            self._last_beat = time.monotonic()
+
+    def run_inline(self, pk):
+        """Run a job in this thread, while a heartbeat thread keeps its lock fresh."""
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._keep_locked, args=(pk, done), name='jobs-heartbeat', daemon=True)
+        heartbeat.start()
+        try:
+            run_job(pk, self.name)
+        finally:
+            done.set()
+            heartbeat.join()
+        self.processed += 1
+
+    def _keep_locked(self, pk, done):
+        try:
+            while not done.wait(settings.JOBS_LOCK_TIMEOUT / 4):
+                JobModel.objects.filter(pk=pk, locked_by=self.name).update(locked_at=now())
+        finally:
+            connections.close_all()
+
+    def claim(self):
+        free = max(self.concurrency, 1) - len(self.running)
+        claimed = []
+        for queue in self.queues:
+            if len(claimed) >= free:
+                break
+            claimed += claim(queue, free - len(claimed), self.name)
+        return claimed
+
+    def get_executor(self):
+        if not self.concurrency:
+            return None
+        if self.processes:
+            # spawn: a forked child would share the parent's database connections
+            return ProcessPoolExecutor(max_workers=self.concurrency, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=django.setup)
+        return ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='jobs')
+
+    def collect(self, futures):
+        for future in futures:
+            pk = self.running.pop(future)
+            self.processed += 1
+            if future.exception() is not None:
+                # The job didn't get to record its outcome, e.g. its process died
+                logger.error('Job %s crashed its worker', pk, exc_info=future.exception())
+                fail(JobModel.objects.get(pk=pk), repr(future.exception()))
+
+    def run(self, burst=False):
+        """Process jobs until stop() is called or, with ``burst``, until no job is due. Returns the jobs run."""
+        executor = self.get_executor()
+        try:
+            while not self.stopping:
+                self.beat()
+                claimed = self.claim()
+                for pk in claimed:
+                    if executor is None:
+                        self.run_inline(pk)
+                    else:
+                        function = run_job if self.processes else _run_job_in_thread
+                        self.running[executor.submit(function, pk, self.name)] = pk
+                if self.running:
+                    done, _ = wait(self.running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+                    if any(isinstance(future.exception(), BrokenExecutor) for future in done):
+                        executor.shutdown(wait=True)
+                        self.collect(list(self.running))
+                        executor = self.get_executor()
+                elif not claimed:
+                    if burst:
+                        break
+                    time.sleep(self.poll_interval)
+        finally:
+            if executor is not None:
+                # Lets the running jobs finish; a killed worker's jobs are recovered by the next one
+                executor.shutdown(wait=True)
+                self.collect(list(self.running))
+        return self.processed
@@ -0,0 +1,146 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.timezone import now
+
+from .models import FAILED, QUEUED, RUNNING, SUCCEEDED, JobModel
+from .queue import Worker, claim, purge_finished_jobs, recover_stale_jobs, run_job, task
+
+calls = []
+
+
+@task()
+def add(a, b):
+    calls.append((a, b))
+    return a + b
+
+
+@task(max_attempts=2)
+def fail():
+    raise ValueError('broken')
+
+
+@task(queue='limited')
+def record(n):
+    calls.append(n)
+
+
+@task()
+def outlive_lock(seconds):
+    time.sleep(seconds)
+    return recover_stale_jobs()
+
+
+def run_jobs(*args):
+    out = StringIO()
+    call_command('run_jobs', '--burst', '--concurrency', '0', *args, stdout=out)
+    return out.getvalue()
+
+
+@override_settings(JOBS_QUEUES={'default': 2, 'limited': 1}, JOBS_RETRY_BACKOFF=10)
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_jobs_run_and_store_their_result(self):
+        job = add.enqueue(a=1, b=2)
+        self.assertEqual((job.task, job.status), ('jobs.tests.add', QUEUED))
+        self.assertIn('1 jobs processed', run_jobs())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.attempts), (SUCCEEDED, 3, 1))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(add(2, 2), 4)
+
+    def test_failed_jobs_are_retried_with_backoff_then_fail(self):
+        job = fail.enqueue()
+        run_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (QUEUED, 1))
+        self.assertIn('ValueError: broken', job.error)
+        self.assertGreater(job.run_at, now() + timedelta(seconds=4))
+        # Not due yet
+        self.assertIn('0 jobs processed', run_jobs())
+        JobModel.objects.filter(pk=job.pk).update(run_at=now())
+        run_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (FAILED, 2))
+
+    def test_queued_jobs_with_the_same_key_are_enqueued_once(self):
+        first = add.enqueue(key='sum', a=1, b=1)
+        self.assertEqual(add.enqueue(key='sum', a=1, b=1).pk, first.pk)
+        run_jobs()
+        self.assertNotEqual(add.enqueue(key='sum', a=1, b=1).pk, first.pk)
+
+    def test_claims_respect_the_queue_limit_across_workers(self):
+        jobs = [record.enqueue(n=n) for n in range(3)]
+        self.assertEqual(claim('limited', 5, 'worker-1'), [jobs[0].pk])
+        self.assertEqual(claim('limited', 5, 'worker-2'), [])
+        self.assertIn('0 jobs processed', run_jobs('--queues', 'limited'))
+        JobModel.objects.filter(pk=jobs[0].pk).update(status=SUCCEEDED)
+        self.assertIn('2 jobs processed', run_jobs('--queues', 'limited'))
+        self.assertEqual(calls, [1, 2])
+
+    def test_the_queue_limit_holds_when_workers_count_at_the_same_time(self):
+        jobs = [record.enqueue(n=n) for n in range(2)]
+        self.assertEqual(claim('limited', 1, 'worker-1'), [jobs[0].pk])
+        # worker-2 counted the running jobs before worker-1 claimed
+        with mock.patch('django.db.models.QuerySet.count', return_value=0):
+            self.assertEqual(claim('limited', 1, 'worker-2'), [])
+        self.assertEqual(JobModel.objects.get(pk=jobs[1].pk).status, QUEUED)
+
+    @override_settings(JOBS_RETENTION=60, JOBS_FAILED_RETENTION=600)
+    def test_finished_jobs_are_purged_after_their_retention(self):
+        timestamp = now()
+        old = [add.enqueue(a=n, b=n) for n in range(3)]
+        JobModel.objects.filter(pk=old[0].pk).update(status=SUCCEEDED, finished_at=timestamp - timedelta(minutes=2))
+        JobModel.objects.filter(pk=old[1].pk).update(status=FAILED, finished_at=timestamp - timedelta(minutes=2))
+        JobModel.objects.filter(pk=old[2].pk).update(status=SUCCEEDED, finished_at=timestamp)
+        self.assertEqual(purge_finished_jobs(), 1)
+        self.assertEqual(sorted(JobModel.objects.values_list('pk', flat=True)), [old[1].pk, old[2].pk])
+        JobModel.objects.filter(pk=old[1].pk).update(finished_at=timestamp - timedelta(minutes=20))
+        self.assertEqual(purge_finished_jobs(), 1)
+
+    @override_settings(JOBS_LOCK_TIMEOUT=60)
+    def test_jobs_of_a_lost_worker_are_recovered(self):
+        job, last = add.enqueue(a=1, b=1), fail.enqueue()
+        claim('default', 2, 'lost-worker')
+        JobModel.objects.filter(pk=last.pk).update(attempts=2)
+        self.assertEqual(recover_stale_jobs(), 0)
+        JobModel.objects.update(locked_at=now() - timedelta(minutes=2))
+        self.assertEqual(recover_stale_jobs(), 2)
+        self.assertEqual(JobModel.objects.get(pk=job.pk).status, QUEUED)
+        self.assertEqual(JobModel.objects.get(pk=last.pk).status, FAILED)
+        run_jobs()
+        self.assertEqual(JobModel.objects.get(pk=job.pk).status, SUCCEEDED)
+
+    def test_a_job_lost_by_its_worker_is_left_to_the_new_owner(self):
+        job = add.enqueue(a=1, b=1)
+        claim('default', 1, 'slow-worker')
+        JobModel.objects.filter(pk=job.pk).update(locked_by='new-worker')
+        self.assertFalse(run_job(job.pk, 'slow-worker'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (RUNNING, 'new-worker'))
+
+
+@override_settings(JOBS_QUEUES={'default': 2})
+class InlineWorkerTest(TransactionTestCase):
+    @override_settings(JOBS_LOCK_TIMEOUT=0.4)
+    def test_a_job_run_inline_keeps_its_lock_past_the_timeout(self):
+        job = outlive_lock.enqueue(seconds=1)
+        self.assertEqual(Worker(concurrency=0).run(burst=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.attempts), (SUCCEEDED, 0, 1))
+
+
+class ThreadPoolWorkerTest(TransactionTestCase):
+    def test_jobs_run_in_the_thread_pool(self):
+        calls.clear()
+        jobs = [add.enqueue(a=n, b=n) for n in range(5)]
+        self.assertEqual(Worker(concurrency=3, poll_interval=0.01).run(burst=True), 5)
+        self.assertEqual(sorted(JobModel.objects.values_list('result', flat=True)), [0, 2, 4, 6, 8])
+        self.assertFalse(JobModel.objects.exclude(status=SUCCEEDED).exists())
+        self.assertEqual(len(calls), len(jobs))
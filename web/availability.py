@@ -0,0 +1,79 @@
+import calendar
+from collections import defaultdict
+from datetime import date, datetime
+
+from dashboard.models import BookModel
+from .cache import get_cache
+
+MAX_MONTHS = 24
+
+
+def parse_month(value):
+    month = datetime.strptime(value, '%Y-%m').date()
+    # The month after it must exist too: it bounds the bookings query
+    if month.year == date.max.year and month.month == 12:
+        raise ValueError(value)
+    return month
+
+
+def next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def month_range(start, end):
+    month = start
+    while month <= end:
+        yield month
+        month = next_month(month)
+
+
+def _month_key(month):
+    return f'web:availability:{month:%Y-%m}'
+
+
+def _runs(days):
+    """Collapse sorted day numbers into [first, last] ranges: [1, 2, 3, 7] -> [[1, 3], [7, 7]]."""
+    runs = []
+    for day in days:
+        if runs and runs[-1][1] == day - 1:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def get_availability(start, end):
+    """
+    Return booked days of every month in [start, end] as run-length ranges. Months are
+    cached separately and the missing ones are loaded with one range query on book_date.
+    """
+    months = list(month_range(start, end))
+    keys = {month: _month_key(month) for month in months}
+    cache = get_cache()
+    booked = cache.get_many(keys.values())
+    missing = [month for month in months if keys[month] not in booked]
+    if missing:
+        days = defaultdict(set)
+        book_dates = (
+            BookModel.objects
+            .filter(book_date__gte=missing[0], book_date__lt=next_month(missing[-1]))
+            .values_list('book_date', flat=True)
+            .distinct()
+        )
+        for book_date in book_dates:
+            days[book_date.replace(day=1)].add(book_date.day)
+        loaded = {keys[month]: _runs(sorted(days[month])) for month in missing}
+        cache.set_many(loaded)
+        booked.update(loaded)
+    return [
+        {
+            'month': f'{month:%Y-%m}',
+            'days': calendar.monthrange(month.year, month.month)[1],
+            'booked': booked[keys[month]],
+        }
+        for month in months
+    ]
+
+
+def invalidate(*book_dates):
+    get_cache().delete_many({_month_key(book_date.replace(day=1)) for book_date in book_dates if book_date})
@@ -0,0 +1,106 @@
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+CACHE_ALIAS = 'web'
+HITS_KEY = 'web:stats:hits'
+MISSES_KEY = 'web:stats:misses'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f'web:version:{model._meta.label_lower}'
+
+
+def _new_version():
+    return f'{time.time()}:{uuid.uuid4().hex}'
+
+
+def get_versions(models):
+    """
+    Return the current cache version of every model. A version is a random token, prefixed
+    with the time it was made, that is replaced whenever the model changes, so entries built
+    from older data are never matched again. A missing (evicted) version gets a fresh token,
+    which only costs a miss.
+    """
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, '') for key in keys]
+
+
+def changed_at(version):
+    """Timestamp of the change that made ``version``; now for an unknown version."""
+    try:
+        return float(version.partition(':')[0])
+    except ValueError:
+        return time.time()
+
+
+def invalidate(*models):
+    get_cache().set_many({_version_key(model): _new_version() for model in models}, timeout=None)
+
+
+def _count(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_stats():
+    cache = get_cache()
+    counters = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits = counters.get(HITS_KEY, 0)
+    misses = counters.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'backend': settings.WEB_CACHE_BACKEND,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total * 100, 1) if total else 0,
+    }
+
+
+def reset_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+def cached_response(*models):
+    """
+    Cache the data of a successful GET response until one of ``models`` changes.
+    The key includes the absolute URL, so query parameters and the host used for
+    image URLs are part of it.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            cache = get_cache()
+            fingerprint = ':'.join([request.build_absolute_uri(), *get_versions(models)])
+            key = f'web:response:{view.__name__}:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+            data = cache.get(key)
+            if data is not None:
+                _count(HITS_KEY)
+                return Response(data=data, status=status.HTTP_200_OK)
+            _count(MISSES_KEY)
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,70 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.db.models import Count, Max
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from .cache import changed_at, get_cache, get_versions
+
+
+def _querysets(sources, request, args, kwargs):
+    for source in sources:
+        if isinstance(source, type):
+            yield source.objects.all()
+        else:
+            yield source(request, *args, **kwargs)
+
+
+def _aggregate(queryset):
+    aggregates = {'count': Count('pk'), 'last_id': Max('pk')}
+    if any(field.name == 'updated_at' for field in queryset.model._meta.fields):
+        aggregates['last_modified'] = Max('updated_at')
+    return queryset.aggregate(**aggregates)
+
+
+def conditional_get(*sources):
+    """
+    Send a weak ETag computed from MAX(updated_at), MAX(id) and COUNT(*) of the querysets
+    behind a view, and answer matching conditional requests with 304 before the view runs.
+    ``sources`` are models or callables taking the view arguments and returning a queryset.
+    Aggregates are cached until one of the models changes.
+
+    Last-Modified is the later of MAX(updated_at) and the time the models' cache versions
+    were last replaced, since a delete leaves MAX(updated_at) as it was. HTTP dates only
+    have whole seconds, so it isn't sent during the second of the last change: a client
+    holding it could otherwise miss a second change made in the same second.
+    """
+    def get_state(request, *args, **kwargs):
+        state = getattr(request, '_conditional_state', None)
+        if state is not None:
+            return state
+        querysets = list(_querysets(sources, request, args, kwargs))
+        versions = get_versions([queryset.model for queryset in querysets])
+        fingerprint = ':'.join([request.build_absolute_uri(), *versions])
+        key = f'web:validators:{hashlib.md5(fingerprint.encode()).hexdigest()}'
+        cache = get_cache()
+        state = cache.get(key)
+        if state is None:
+            stats = [_aggregate(queryset) for queryset in querysets]
+            modified = [stat['last_modified'] for stat in stats if stat.get('last_modified')]
+            changed = datetime.fromtimestamp(max(map(changed_at, versions), default=0), tz=timezone.utc)
+            state = {
+                'etag': 'W/"%s"' % hashlib.md5(repr(stats).encode()).hexdigest(),
+                'last_modified': max([*modified, changed]),
+            }
+            cache.set(key, state)
+        request._conditional_state = state
+        return state
+
+    def etag(request, *args, **kwargs):
+        return get_state(request, *args, **kwargs)['etag']
+
+    def last_modified(request, *args, **kwargs):
+        last_modified = get_state(request, *args, **kwargs)['last_modified']
+        if last_modified is None or last_modified.timestamp() >= int(time.time()):
+            return None
+        return last_modified
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
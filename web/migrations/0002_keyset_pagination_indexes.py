@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactusmodel',
+            index=models.Index(fields=['created_at', 'id'], name='contact_us_created_id_idx'),
+        ),
+    ]
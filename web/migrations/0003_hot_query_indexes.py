@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactusmodel',
+            index=models.Index(condition=models.Q(('answered', False)), fields=['created_at', 'id'], name='contact_us_unanswered_idx'),
+        ),
+    ]
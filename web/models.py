@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from core.base import BaseModel
 
 # 6
@@ -9,6 +10,13 @@ class ContactUsModel(BaseModel):
     message = models.TextField()
     answered = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='contact_us_created_id_idx'),
+            models.Index(fields=['created_at', 'id'], condition=Q(answered=False), name='contact_us_unanswered_idx'),
+            models.Index(fields=['created_at', 'id'], condition=Q(answered=True), name='contact_us_answered_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from core.serializers import EagerLoadingMixin, SrcsetField
 from dashboard.models import (
     WebSocialMedia,
     WebContactInfoModel,
@@ -18,9 +20,11 @@ from .models import ContactUsModel
 
 
 class MainPageSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = HomeModel
-        fields = ['id', 'title', 'description', 'image']
+        fields = ['id', 'title', 'description', 'image', 'image_srcset']
 
 
 class AboutUsHighlightSerializer(serializers.ModelSerializer):
@@ -29,23 +33,30 @@ class AboutUsHighlightSerializer(serializers.ModelSerializer):
         fields = ['title', 'description']
 
 
-class AboutUsSerializer(serializers.ModelSerializer):
+class AboutUsSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     highlight = AboutUsHighlightSerializer(many=True)
+    prefetch_related = ('highlight',)
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = AboutUsModel
-        fields = ['id', 'title', 'description', 'highlight', 'image']
+        fields = ['id', 'title', 'description', 'highlight', 'image', 'image_srcset']
 
 
 class AboutUsDetailsSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = AboutUsModel
-        fields = ['id', 'main_description', 'successful_events', 'work_experience', 'image']
+        fields = ['id', 'main_description', 'successful_events', 'work_experience', 'image', 'image_srcset']
 
 
 class WeddingCategorySerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = WeddingCategoryModel
-        fields = ['id', 'image', 'name', 'description']
+        fields = ['id', 'image', 'image_srcset', 'name', 'description']
 
 
 class GetCategorySerializer(serializers.ModelSerializer):
@@ -54,11 +65,14 @@ class GetCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
-class GallerySerializer(serializers.ModelSerializer):
+class GallerySerializer(EagerLoadingMixin, serializers.ModelSerializer):
     category = GetCategorySerializer()
+    select_related = ('category',)
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = GalleryModel
-        fields = ['id', 'image', 'category']
+        fields = ['id', 'image', 'image_srcset', 'category']
 
 
 class PriceHighlightSerializer(serializers.ModelSerializer):
@@ -67,15 +81,16 @@ class PriceHighlightSerializer(serializers.ModelSerializer):
         fields = ['id', 'description']
 
 
-class PriceSerializer(serializers.ModelSerializer):
+class PriceSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     highlights = serializers.SerializerMethodField(source='get_highlights')
+    prefetch_related = ('pricehighlightmodel_set',)
+
     class Meta:
         model = PriceModel
         fields = ['id', 'type', 'price', 'description', 'highlights']
 
     def get_highlights(self, data):
-        highlight = PriceHighLightModel.objects.filter(price=data)
-        return PriceHighlightSerializer(highlight, many=True).data
+        return PriceHighlightSerializer(data.pricehighlightmodel_set.all(), many=True).data
 
 
 class BookSerializer(serializers.ModelSerializer):
@@ -85,15 +100,20 @@ class BookSerializer(serializers.ModelSerializer):
 
 
 class NewsSerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = NewsModel
-        fields = ['id', 'image', 'created_at', 'title', 'description']
+        fields = ['id', 'image', 'image_srcset', 'created_at', 'title', 'description']
+
 
+class TeamMemberSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    select_related = ('position',)
+    image_srcset = SrcsetField(source='image_variants')
 
-class TeamMemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamMemberModel
-        fields = ['id', 'image', 'first_name', 'last_name', 'position']
+        fields = ['id', 'image', 'image_srcset', 'first_name', 'last_name', 'position']
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -108,9 +128,11 @@ class WebContactInfoSerializer(serializers.ModelSerializer):
 
 
 class WebSocialMediaSerializer(serializers.ModelSerializer):
+    social_media_image_srcset = SrcsetField(source='social_media_image_variants')
+
     class Meta:
         model = WebSocialMedia
-        fields = ['id', 'url', 'social_media_image']
+        fields = ['id', 'url', 'social_media_image', 'social_media_image_srcset']
 
 
 class ContactUsSerializer(serializers.ModelSerializer):
@@ -138,13 +160,17 @@ class CalendarDataSerializer(serializers.ModelSerializer):
 
 
 class CalendarCategorySerializer(serializers.ModelSerializer):
+    image_srcset = SrcsetField(source='image_variants')
+
     class Meta:
         model = WeddingCategoryModel
-        fields = ['name', 'image']
+        fields = ['name', 'image', 'image_srcset']
 
 
-class CalendarDataInfoSerializer(serializers.ModelSerializer):
+class CalendarDataInfoSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     category = CalendarCategorySerializer()
+    select_related = ('category',)
+
     class Meta:
         model = BookModel
         fields = ['id', 'book_date', 'additional_info', 'category']
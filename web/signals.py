@@ -0,0 +1,83 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.bulk import bulk_saved, bulk_deleted, in_bulk_operation
+from dashboard.models import (
+    HomeModel,
+    AboutUsHighlightModel,
+    AboutUsModel,
+    WeddingCategoryModel,
+    GalleryModel,
+    PriceModel,
+    PriceHighLightModel,
+    BookModel,
+    NewsModel,
+    PositionModel,
+    TeamMemberModel,
+    WebContactInfoModel,
+    WebSocialMedia,
+)
+from . import availability
+from .cache import invalidate
+
+# Models whose data is served by the public web endpoints
+CACHED_MODELS = (
+    HomeModel,
+    AboutUsHighlightModel,
+    AboutUsModel,
+    WeddingCategoryModel,
+    GalleryModel,
+    PriceModel,
+    PriceHighLightModel,
+    BookModel,
+    NewsModel,
+    PositionModel,
+    TeamMemberModel,
+    WebContactInfoModel,
+    WebSocialMedia,
+)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_web_cache(sender, **kwargs):
+    if sender in CACHED_MODELS and not in_bulk_operation(sender):
+        # Once committed: until then other requests read the old rows and would cache them under the new version
+        transaction.on_commit(partial(invalidate, sender))
+
+
+@receiver(bulk_saved)
+@receiver(bulk_deleted)
+def invalidate_web_cache_bulk(sender, **kwargs):
+    if sender in CACHED_MODELS:
+        transaction.on_commit(partial(invalidate, sender))
+
+
+@receiver(m2m_changed, sender=AboutUsModel.highlight.through)
+def invalidate_web_cache_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(partial(invalidate, sender, type(instance), model))
+
+
+def _book_date(value):
+    return BookModel._meta.get_field('book_date').to_python(value)
+
+
+@receiver(post_save, sender=BookModel)
+@receiver(post_delete, sender=BookModel)
+def invalidate_availability(sender, instance, **kwargs):
+    if in_bulk_operation(sender):
+        return
+    # _previous_state is recorded by dashboard.signals before the save
+    previous = getattr(instance, '_previous_state', None) or {}
+    transaction.on_commit(partial(availability.invalidate, _book_date(instance.book_date), previous.get('book_date')))
+
+
+@receiver(bulk_saved, sender=BookModel)
+@receiver(bulk_deleted, sender=BookModel)
+def invalidate_availability_bulk(sender, instances, previous=None, **kwargs):
+    transaction.on_commit(partial(availability.invalidate, *(_book_date(instance.book_date) for instance in instances),
+                                  *(state['book_date'] for state in previous or ())))
@@ -1,3 +1,426 @@
-from django.test import TestCase
+import base64
+import gzip
+import os
+import tempfile
+import time
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.utils.http import http_date
+from django.utils.timezone import now
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.models import (
+    PriceModel,
+    PriceHighLightModel,
+    WeddingCategoryModel,
+    GalleryModel,
+    PositionModel,
+    TeamMemberModel,
+    NewsModel,
+    BookModel,
+)
+from jobs.models import JobModel
+from .cache import get_cache, get_stats, reset_stats
+from .views import SITE_BUNDLE_SECTIONS
+
+
+def create_prices(count):
+    prices = PriceModel.objects.bulk_create(
+        PriceModel(type=f'type {i}', price=i, description='description') for i in range(count)
+    )
+    PriceHighLightModel.objects.bulk_create(
+        PriceHighLightModel(price=price, description=f'highlight {n}') for price in prices for n in range(2)
+    )
+
+
+class PricesTest(TestCase):
+    def get_prices(self):
+        # bulk_create sends no signals, so drop cached responses explicitly
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_prices'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_response_shape(self):
+        create_prices(1)
+        price = PriceModel.objects.get()
+        highlights = list(PriceHighLightModel.objects.order_by('id'))
+        _, data = self.get_prices()
+        self.assertEqual(data, [{
+            'id': price.id,
+            'type': 'type 0',
+            'price': 0.0,
+            'description': 'description',
+            'highlights': [{'id': highlight.id, 'description': highlight.description} for highlight in highlights],
+        }])
+
+    def test_query_count_does_not_depend_on_number_of_prices(self):
+        create_prices(3)
+        small_count, data = self.get_prices()
+        self.assertEqual(len(data), 3)
+        create_prices(2997)
+        large_count, data = self.get_prices()
+        self.assertEqual(len(data), 3000)
+        self.assertEqual(small_count, large_count)
+
+
+class SiteBundleTest(TestCase):
+    def get_bundle(self, query=''):
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('get_site_bundle') + query)
+        return len(queries), response
+
+    def test_sections_match_their_endpoints(self):
+        create_prices(2)
+        WeddingCategoryModel.objects.create(name='category', description='description')
+        _, response = self.get_bundle()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data), set(SITE_BUNDLE_SECTIONS))
+        for section, url in (('prices', 'get_prices'), ('our_services', 'get_our_services'),
+                             ('our_services_for_footer', 'get_our_services_for_footer'),
+                             ('categories', 'get_categories'), ('our_team', 'get_our_team')):
+            self.assertEqual(data[section], self.client.get(reverse(url)).json(), section)
+
+    def test_only_requested_sections_are_loaded(self):
+        one_count, _ = self.get_bundle('?sections=our_services')
+        count, response = self.get_bundle('?sections=our_services, our_services_for_footer')
+        self.assertEqual(set(response.json()), {'our_services', 'our_services_for_footer'})
+        # Both sections come from the same query
+        self.assertEqual(count, one_count)
+        _, response = self.get_bundle('?sections=prices,unknown')
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_does_not_depend_on_number_of_rows(self):
+        create_prices(2)
+        small_count, _ = self.get_bundle()
+        create_prices(50)
+        large_count, _ = self.get_bundle()
+        self.assertEqual(small_count, large_count)
+
+
+class WebCacheTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        reset_stats()
+        self.news = NewsModel.objects.create(title='first', description='description')
+
+    def get_titles(self):
+        return [news['title'] for news in self.client.get(reverse('get_news')).json()['results']]
+
+    def test_responses_are_cached_until_a_model_changes(self):
+        self.assertEqual(self.get_titles(), ['first'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_titles(), ['first'])
+        self.assertEqual(get_stats(), {'backend': settings.WEB_CACHE_BACKEND, 'hits': 1, 'misses': 1, 'hit_rate': 50.0})
+        self.news.title = 'changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.save()
+        self.assertEqual(self.get_titles(), ['changed'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.delete()
+        self.assertEqual(self.get_titles(), [])
+
+    def test_cache_is_invalidated_when_the_transaction_commits(self):
+        self.get_titles()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.news.title = 'changed'
+            self.news.save()
+            # Not committed yet: the old version still serves
+            self.assertEqual(self.get_titles(), ['first'])
+        self.assertTrue(callbacks)
+        self.assertEqual(self.get_titles(), ['changed'])
+
+    def test_other_models_keep_their_entries(self):
+        self.get_titles()
+        with self.captureOnCommitCallbacks(execute=True):
+            PositionModel.objects.create(name='position')
+        with self.assertNumQueries(0):
+            self.get_titles()
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.start = time.time()
+        with mock.patch('time.time', return_value=self.start), self.captureOnCommitCallbacks(execute=True):
+            self.news = NewsModel.objects.create(title='first', description='description')
+
+    def get_news(self, at=2, **headers):
+        # ``at`` seconds after setUp, since Last-Modified isn't sent in the second of a change
+        with mock.patch('time.time', return_value=self.start + at):
+            return self.client.get(reverse('get_news'), **headers)
+
+    def test_matching_etag_is_answered_with_304_without_queries(self):
+        etag = self.get_news()['ETag']
+        with self.assertNumQueries(0):
+            response = self.get_news(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_after_a_save_and_a_delete(self):
+        etag = self.get_news()['ETag']
+        self.news.title = 'changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.save()
+        response = self.get_news(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.news.delete()
+        response = self.get_news(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        last_modified = self.get_news()['Last-Modified']
+        self.assertEqual(last_modified, http_date(self.news.updated_at.timestamp()))
+        self.assertEqual(self.get_news(HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        earlier = http_date(self.news.updated_at.timestamp() - 60)
+        self.assertEqual(self.get_news(HTTP_IF_MODIFIED_SINCE=earlier).status_code, 200)
+
+    def test_if_modified_since_after_a_delete_in_the_same_second(self):
+        with mock.patch('time.time', return_value=self.start + 2), self.captureOnCommitCallbacks(execute=True):
+            other = NewsModel.objects.create(title='second', description='description')
+        last_modified = self.get_news(at=4)['Last-Modified']
+        with mock.patch('time.time', return_value=self.start + 4.5), self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        response = self.get_news(at=4.5, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual([news['title'] for news in response.json()['results']], ['first'])
+        response = self.get_news(at=6, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_news(at=6, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+
+
+class RelatedQueryCountTest(TestCase):
+    def create_rows(self, count):
+        categories = WeddingCategoryModel.objects.bulk_create(
+            WeddingCategoryModel(name=f'category {i}', description='description') for i in range(count)
+        )
+        GalleryModel.objects.bulk_create(GalleryModel(category=category) for category in categories)
+        positions = PositionModel.objects.bulk_create(PositionModel(name=f'position {i}') for i in range(count))
+        TeamMemberModel.objects.bulk_create(
+            TeamMemberModel(first_name='first', last_name='last', middle_name='middle', position=position,
+                            from_working_hours='09:00', to_working_hours='18:00', work_start_data='2024-01-01')
+            for position in positions
+        )
+        GalleryModel.objects.bulk_create(GalleryModel(category=categories[0]) for _ in range(count))
+
+    def count_queries(self, url):
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_depend_on_number_of_rows(self):
+        self.create_rows(2)
+        category = WeddingCategoryModel.objects.order_by('id').first()
+        urls = [reverse('get_our_team'), reverse('get_gallery'),
+                reverse('get_gallery_by_id', kwargs={'pk': category.id})]
+        small_counts = [self.count_queries(url) for url in urls]
+        self.create_rows(50)
+        self.assertEqual([self.count_queries(url) for url in urls], small_counts)
+
+
+class NewsPaginationTest(TestCase):
+    def test_pages_cover_all_rows_once_with_equal_created_at(self):
+        NewsModel.objects.bulk_create(NewsModel(title=f'news {i}', description='description') for i in range(7))
+        NewsModel.objects.filter(id__lte=4).update(created_at=now())
+        ids = []
+        url = reverse('get_news') + '?page_size=3'
+        while url:
+            get_cache().clear()
+            data = self.client.get(url).json()
+            self.assertLessEqual(len(data['results']), 3)
+            ids.extend(news['id'] for news in data['results'])
+            url = data['next']
+        expected = NewsModel.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(reverse('get_news') + '?cursor=invalid').status_code, 404)
+        cursor = base64.urlsafe_b64encode(b'[null, null]').decode()
+        self.assertEqual(self.client.get(reverse('get_news') + f'?cursor={cursor}').status_code, 404)
+
+
+class AvailabilityTest(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        self.category = WeddingCategoryModel.objects.create(name='category', description='description')
+
+    def book(self, book_date):
+        return BookModel.objects.create(category=self.category, book_date=book_date, booker_first_name='first',
+                                        booker_last_name='last', phone_number='+998901234567', additional_info='')
+
+    def get_availability(self, query):
+        return self.client.get(reverse('get_availability') + query)
+
+    def test_booked_days_are_grouped_into_ranges(self):
+        for day in ('2025-06-01', '2025-06-02', '2025-06-03', '2025-06-10', '2025-07-31'):
+            self.book(day)
+        response = self.get_availability('?from=2025-06&to=2025-08')
+        self.assertEqual(response.json(), [
+            {'month': '2025-06', 'days': 30, 'booked': [[1, 3], [10, 10]]},
+            {'month': '2025-07', 'days': 31, 'booked': [[31, 31]]},
+            {'month': '2025-08', 'days': 31, 'booked': []},
+        ])
+        with self.assertNumQueries(0):
+            self.get_availability('?from=2025-06&to=2025-08')
+
+    def test_moving_a_booking_invalidates_both_months(self):
+        event = self.book('2025-06-10')
+        self.get_availability('?from=2025-06&to=2025-07')
+        event.book_date = '2025-07-05'
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        self.assertEqual([month['booked'] for month in self.get_availability('?from=2025-06&to=2025-07').json()],
+                         [[], [[5, 5]]])
+
+    def test_invalid_range(self):
+        self.assertEqual(self.get_availability('?from=2025-13').status_code, 400)
+        self.assertEqual(self.get_availability('?from=2025-06&to=2025-05').status_code, 400)
+        self.assertEqual(self.get_availability('?from=2020-01&to=2025-01').status_code, 400)
+        self.assertEqual(self.get_availability('?from=9999-12').status_code, 400)
+        self.assertEqual(self.get_availability('?from=9999-11').status_code, 200)
+
+
+def run_jobs():
+    call_command('run_jobs', '--burst', '--concurrency', '0', stdout=StringIO())
+
+
+def jpeg(width, height):
+    output = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(output, 'JPEG')
+    return SimpleUploadedFile('photo.jpg', output.getvalue(), content_type='image/jpeg')
+
+
+class ImageVariantsTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, IMAGE_VARIANT_WIDTHS=(320, 640, 1024))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        get_cache().clear()
+
+    def run_jobs(self):
+        # The web cache is invalidated once the jobs' writes commit
+        with self.captureOnCommitCallbacks(execute=True):
+            run_jobs()
+
+    def test_variants_are_generated_after_upload_and_listed_as_srcset(self):
+        news = NewsModel.objects.create(title='title', description='description', image=jpeg(800, 400))
+        self.run_jobs()
+        news.refresh_from_db()
+        self.assertEqual(news.image_variants['source'], news.image.name)
+        self.assertEqual(sorted((variant['format'], variant['width'], variant['height'])
+                                for variant in news.image_variants['variants']),
+                         [('jpeg', 320, 160), ('jpeg', 640, 320), ('webp', 320, 160), ('webp', 640, 320)])
+        with Image.open(os.path.join(settings.MEDIA_ROOT, news.image_variants['variants'][0]['name'])) as variant:
+            self.assertEqual(variant.size, (640, 320))
+        srcset = self.client.get(reverse('get_news')).json()['results'][0]['image_srcset']
+        self.assertEqual((srcset['width'], srcset['height']), (800, 400))
+        self.assertEqual([source['type'] for source in srcset['sources']], ['image/webp', 'image/jpeg'])
+        self.assertRegex(srcset['sources'][0]['srcset'],
+                         r'^http://testserver/media/media/variants/\w\w/\w\w/[0-9a-f]{64}\.webp 320w, \S+\.webp 640w$')
+
+    def test_generated_variants_change_the_etag(self):
+        NewsModel.objects.create(title='title', description='description', image=jpeg(800, 400))
+        etag = self.client.get(reverse('get_news'))['ETag']
+        self.run_jobs()
+        response = self.client.get(reverse('get_news'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.json()['results'][0]['image_srcset'])
+
+    def test_backfill_command_generates_missing_and_outdated_variants(self):
+        news = NewsModel.objects.create(title='title', description='description', image=jpeg(200, 100))
+        JobModel.objects.all().delete()
+        NewsModel.objects.create(title='no image', description='description')
+        out = StringIO()
+        call_command('generate_image_variants', stdout=out)
+        self.assertIn('1 images queued', out.getvalue())
+        call_command('generate_image_variants', stdout=out)
+        self.assertEqual(JobModel.objects.count(), 1)
+        self.run_jobs()
+        news.refresh_from_db()
+        # Narrower than every width: one variant per format at the original size
+        self.assertEqual(sorted(variant['width'] for variant in news.image_variants['variants']), [200, 200])
+        call_command('generate_image_variants', '--inline', stdout=out)
+        self.assertIn('0 of 0 images updated', out.getvalue())
+
+
+class MediaServingTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.write('media/photo.jpg', b'0123456789')
+
+    def write(self, name, content):
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(content)
+
+    def get(self, path='/media/media/photo.jpg', **headers):
+        response = self.client.get(path, headers=headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, content
+
+    def test_file_is_served_with_cache_headers_and_no_cookie(self):
+        response, content = self.get()
+        self.assertEqual((response.status_code, content), (200, b'0123456789'))
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Cache-Control'], f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertNotIn(settings.LANGUAGE_COOKIE_NAME, response.cookies)
+        response, _ = self.get(If_None_Match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.get('/media/../db.sqlite3')[0].status_code, 400)
+        self.assertEqual(self.get('/uz/media/media/missing.jpg')[0].status_code, 404)
+
+    def test_range_requests(self):
+        response, content = self.get(Range='bytes=2-5')
+        self.assertEqual((response.status_code, content), (206, b'2345'))
+        self.assertEqual((response['Content-Range'], response['Content-Length']), ('bytes 2-5/10', '4'))
+        self.assertEqual(self.get(Range='bytes=-3')[1], b'789')
+        self.assertEqual(self.get(Range='bytes=8-100')[1], b'89')
+        response, _ = self.get(Range='bytes=10-')
+        self.assertEqual((response.status_code, response['Content-Range']), (416, 'bytes */10'))
+        # A stale If-Range gets the whole current file
+        response, content = self.get(Range='bytes=2-5', If_Range='"stale"')
+        self.assertEqual((response.status_code, content), (200, b'0123456789'))
+
+    def test_precompressed_sibling_is_preferred(self):
+        self.write('app.js', b'console.log(1)')
+        self.write('app.js.gz', gzip.compress(b'console.log(1)'))
+        response, content = self.get('/media/app.js', Accept_Encoding='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(content), b'console.log(1)')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response, content = self.get('/media/app.js')
+        self.assertEqual((content, response.has_header('Content-Encoding')), (b'console.log(1)', False))
+
+    def test_front_proxy_sends_the_file(self):
+        with override_settings(MEDIA_SENDFILE_BACKEND='nginx'):
+            response, content = self.get('/uz/media/media/photo.jpg')
+        self.assertEqual(response['X-Accel-Redirect'], '/internal/media/media/photo.jpg')
+        self.assertEqual(content, b'')
+        with override_settings(MEDIA_SENDFILE_BACKEND='apache'):
+            response, _ = self.get()
+        self.assertEqual(response['X-Sendfile'], os.path.join(settings.MEDIA_ROOT, 'media/photo.jpg'))
@@ -21,4 +21,6 @@ urlpatterns = [
     path('get_calendar_data_info/', WebViewSet.as_view({'get': 'calendar_data_info'}), name='get_calendar_data_info'),
     path('get_gallery_by_id/<int:pk>/', WebViewSet.as_view({'get': 'get_gallery_by_id'}), name='get_gallery_by_id'),
     path('get_categories/', WebViewSet.as_view({'get': 'get_categories'}), name='get_categories'),
+    path('get_availability/', WebViewSet.as_view({'get': 'availability'}), name='get_availability'),
+    path('get_site_bundle/', WebViewSet.as_view({'get': 'get_site_bundle'}), name='get_site_bundle'),
 ]
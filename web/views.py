@@ -14,7 +14,15 @@ from dashboard.models import (
     WeddingCategoryModel,
     AboutUsModel,
     HomeModel,
+    AboutUsHighlightModel,
+    PriceHighLightModel,
+    PositionModel,
 )
+from core.pagination import KeysetPagination, NEWEST_FIRST, PAGINATION_PARAMETERS
+from idempotency.keys import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from . import availability
+from .cache import cached_response
+from .conditional import conditional_get
 from .serializers import (
     MainPageSerializer,
     AboutUsSerializer,
@@ -33,6 +41,45 @@ from .serializers import (
     CalendarDataInfoSerializer, GetCategorySerializer,
 )
 
+# Each bundle section is rendered from a shared source so sections backed by the
+# same table (e.g. about_us / about_us_details) cost a single query per request.
+SITE_BUNDLE_SOURCES = {
+    'home': lambda: HomeModel.objects.all().first(),
+    'about_us': lambda: AboutUsSerializer.setup_eager_loading(AboutUsModel.objects.all()).first(),
+    'categories': lambda: list(WeddingCategoryModel.objects.all()),
+    'contact_info': lambda: WebContactInfoModel.objects.all().first(),
+    'social_media': lambda: list(WebSocialMedia.objects.all()),
+    'prices': lambda: list(PriceSerializer.setup_eager_loading(PriceModel.objects.all())),
+    'team': lambda: list(TeamMemberSerializer.setup_eager_loading(TeamMemberModel.objects.all())),
+}
+
+SITE_BUNDLE_MODELS = (
+    HomeModel,
+    AboutUsModel,
+    AboutUsHighlightModel,
+    WeddingCategoryModel,
+    WebContactInfoModel,
+    WebSocialMedia,
+    PriceModel,
+    PriceHighLightModel,
+    TeamMemberModel,
+    PositionModel,
+)
+
+SITE_BUNDLE_SECTIONS = {
+    'main_page': ('home', MainPageSerializer),
+    'about_us': ('about_us', AboutUsSerializer),
+    'about_us_details': ('about_us', AboutUsDetailsSerializer),
+    'our_services': ('categories', WeddingCategorySerializer),
+    'our_services_for_footer': ('categories', CategoriesForFooterSerializer),
+    'categories': ('categories', GetCategorySerializer),
+    'contact_us_info': ('contact_info', WebContactInfoSerializer),
+    'contact_us_info_for_footer': ('contact_info', WebContactInfoForFooterSerializer),
+    'web_social_media': ('social_media', WebSocialMediaSerializer),
+    'prices': ('prices', PriceSerializer),
+    'our_team': ('team', TeamMemberSerializer),
+}
+
 
 class WebViewSet(ViewSet):
     @swagger_auto_schema(
@@ -43,6 +90,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(HomeModel)
+    @cached_response(HomeModel)
     def get_main_page(self, request, *args, **kwargs):
         main_page = HomeModel.objects.all().first()
         serializer = MainPageSerializer(main_page, context={'request': request})
@@ -56,8 +105,10 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(AboutUsModel, AboutUsHighlightModel, AboutUsModel.highlight.through)
+    @cached_response(AboutUsModel, AboutUsHighlightModel)
     def about_us(self, request, *args, **kwargs):
-        main_page = AboutUsModel.objects.all().first()
+        main_page = AboutUsSerializer.setup_eager_loading(AboutUsModel.objects.all()).first()
         serializer = AboutUsSerializer(main_page, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -69,6 +120,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(AboutUsModel)
+    @cached_response(AboutUsModel)
     def about_us_details(self, request, *args, **kwargs):
         main_page = AboutUsModel.objects.all().first()
         serializer = AboutUsDetailsSerializer(main_page, context={'request': request})
@@ -82,6 +135,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WeddingCategoryModel)
+    @cached_response(WeddingCategoryModel)
     def our_services(self, request, *args, **kwargs):
         main_page = WeddingCategoryModel.objects.all()
         serializer = WeddingCategorySerializer(main_page, many=True, context={'request': request})
@@ -90,15 +145,20 @@ class WebViewSet(ViewSet):
     @swagger_auto_schema(
         operation_description="Get all Gallery",
         operation_summary="Get all Gallery",
+        manual_parameters=PAGINATION_PARAMETERS,
         responses={
             200: GallerySerializer(),
         },
         tags=['web']
     )
+    @conditional_get(GalleryModel, WeddingCategoryModel)
+    @cached_response(GalleryModel, WeddingCategoryModel)
     def gallery(self, request, *args, **kwargs):
-        main_page = GalleryModel.objects.all()
+        paginator = KeysetPagination(ordering=NEWEST_FIRST)
+        main_page = paginator.paginate_queryset(
+            GallerySerializer.setup_eager_loading(GalleryModel.objects.all()), request)
         serializer = GallerySerializer(main_page, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get all Prices",
@@ -108,23 +168,29 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(PriceModel, PriceHighLightModel)
+    @cached_response(PriceModel, PriceHighLightModel)
     def prices(self, request, *args, **kwargs):
-        main_page = PriceModel.objects.all()
+        main_page = PriceSerializer.setup_eager_loading(PriceModel.objects.all())
         serializer = PriceSerializer(main_page, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_description="Get all News",
         operation_summary="Get all News",
+        manual_parameters=PAGINATION_PARAMETERS,
         responses={
             200: NewsSerializer(),
         },
         tags=['web']
     )
+    @conditional_get(NewsModel)
+    @cached_response(NewsModel)
     def news(self, request, *args, **kwargs):
-        main_page = NewsModel.objects.all()
+        paginator = KeysetPagination(ordering=NEWEST_FIRST)
+        main_page = paginator.paginate_queryset(NewsModel.objects.all(), request)
         serializer = NewsSerializer(main_page, many=True, context={'request': request})
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Get all Team Members",
@@ -134,14 +200,17 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(TeamMemberModel, PositionModel)
+    @cached_response(TeamMemberModel, PositionModel)
     def our_team(self, request, *args, **kwargs):
-        main_page = TeamMemberModel.objects.all()
+        main_page = TeamMemberSerializer.setup_eager_loading(TeamMemberModel.objects.all())
         serializer = TeamMemberSerializer(main_page, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_description="Create Category",
         operation_summary="Create Category",
+        manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             properties={
@@ -155,6 +224,7 @@ class WebViewSet(ViewSet):
         responses={201: ContactUsSerializer()},
         tags=['web'],
     )
+    @idempotent
     def contact_us(self, request, *args, **kwargs):
         serializer = ContactUsSerializer(data=request.data)
         if not serializer.is_valid():
@@ -170,6 +240,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WeddingCategoryModel)
+    @cached_response(WeddingCategoryModel)
     def our_services_for_footer(self, request, *args, **kwargs):
         main_page = WeddingCategoryModel.objects.all()
         serializer = CategoriesForFooterSerializer(main_page, many=True, context={'request': request})
@@ -183,6 +255,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WebContactInfoModel)
+    @cached_response(WebContactInfoModel)
     def contact_us_info(self, request, *args, **kwargs):
         main_page = WebContactInfoModel.objects.all().first()
         serializer = WebContactInfoSerializer(main_page, context={'request': request})
@@ -196,6 +270,8 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WebContactInfoModel)
+    @cached_response(WebContactInfoModel)
     def contact_us_info_for_footer(self, request, *args, **kwargs):
         main_page = WebContactInfoModel.objects.all().first()
         serializer = WebContactInfoForFooterSerializer(main_page, context={'request': request})
@@ -209,19 +285,23 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WebSocialMedia)
+    @cached_response(WebSocialMedia)
     def web_social_media(self, request, *args, **kwargs):
         main_page = WebSocialMedia.objects.all()
         serializer = WebSocialMediaSerializer(main_page, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
-        operation_description="Get all Calendar Datas",
+        operation_description="Get all Calendar Datas. Deprecated: use get_availability",
         operation_summary="Get all Calendar Datas",
         responses={
             200: CalendarDataSerializer(),
         },
         tags=['web']
     )
+    @conditional_get(BookModel)
+    @cached_response(BookModel)
     def calendar_datas(self, request, *args, **kwargs):
         datas = BookModel.objects.all()
         serializer = CalendarDataSerializer(datas, many=True, context={'request': request})
@@ -243,9 +323,12 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(lambda request: BookModel.objects.filter(book_date=request.GET.get('date')), WeddingCategoryModel)
+    @cached_response(BookModel, WeddingCategoryModel)
     def calendar_data_info(self, request, *args, **kwargs):
         data = request.GET
-        data_info = BookModel.objects.filter(book_date=data.get('date')).first()
+        data_info = BookModel.objects.filter(book_date=data.get('date'))
+        data_info = CalendarDataInfoSerializer.setup_eager_loading(data_info).first()
         serializer = CalendarDataInfoSerializer(data_info, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -257,8 +340,10 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(lambda request, pk: GalleryModel.objects.filter(category__id=pk), WeddingCategoryModel)
+    @cached_response(GalleryModel, WeddingCategoryModel)
     def get_gallery_by_id(self, request, *args, **kwargs):
-        galleries = GalleryModel.objects.filter(category__id=kwargs['pk'])
+        galleries = GallerySerializer.setup_eager_loading(GalleryModel.objects.filter(category__id=kwargs['pk']))
         serializer = GallerySerializer(galleries, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -270,7 +355,84 @@ class WebViewSet(ViewSet):
         },
         tags=['web']
     )
+    @conditional_get(WeddingCategoryModel)
+    @cached_response(WeddingCategoryModel)
     def get_categories(self, request, *args, **kwargs):
         categories = WeddingCategoryModel.objects.all()
         serializer = GetCategorySerializer(categories, many=True, context={'request': request})
         return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Get several web sections in a single response. "
+                              "Available sections: " + ', '.join(SITE_BUNDLE_SECTIONS),
+        operation_summary="Get Site Bundle",
+        manual_parameters=[
+            openapi.Parameter(
+                'sections',
+                openapi.IN_QUERY,
+                description="Comma separated section names (default: all sections)",
+                type=openapi.TYPE_STRING,
+                required=False
+            )
+        ],
+        responses={200: 'ok'},
+        tags=['web']
+    )
+    @conditional_get(*SITE_BUNDLE_MODELS, AboutUsModel.highlight.through)
+    @cached_response(*SITE_BUNDLE_MODELS)
+    def get_site_bundle(self, request, *args, **kwargs):
+        sections = request.GET.get('sections')
+        if sections:
+            sections = [section.strip() for section in sections.split(',') if section.strip()]
+        else:
+            sections = list(SITE_BUNDLE_SECTIONS)
+        unknown = [section for section in sections if section not in SITE_BUNDLE_SECTIONS]
+        if unknown:
+            return Response(data={'error': f"Unknown sections: {', '.join(unknown)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        sources = {}
+        data = {}
+        for section in sections:
+            source, serializer_class = SITE_BUNDLE_SECTIONS[section]
+            if source not in sources:
+                sources[source] = SITE_BUNDLE_SOURCES[source]()
+            instance = sources[source]
+            serializer = serializer_class(instance, many=isinstance(instance, list), context={'request': request})
+            data[section] = serializer.data
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_description="Get booked days of every month in a range as [first_day, last_day] ranges",
+        operation_summary="Get Availability",
+        manual_parameters=[
+            openapi.Parameter(
+                'from',
+                openapi.IN_QUERY,
+                description="First month (format: YYYY-MM)",
+                type=openapi.TYPE_STRING,
+                required=True
+            ),
+            openapi.Parameter(
+                'to',
+                openapi.IN_QUERY,
+                description="Last month (format: YYYY-MM, default: same as from)",
+                type=openapi.TYPE_STRING,
+                required=False
+            ),
+        ],
+        responses={200: 'ok'},
+        tags=['web']
+    )
+    def availability(self, request, *args, **kwargs):
+        data = request.GET
+        try:
+            start = availability.parse_month(data.get('from', ''))
+            end = availability.parse_month(data.get('to') or data.get('from'))
+        except ValueError:
+            return Response(data={'error': 'from and to must be in YYYY-MM format'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        months = (end.year - start.year) * 12 + end.month - start.month + 1
+        if months < 1 or months > availability.MAX_MONTHS:
+            return Response(data={'error': f'Range must cover 1 to {availability.MAX_MONTHS} months'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(data=availability.get_availability(start, end), status=status.HTTP_200_OK)